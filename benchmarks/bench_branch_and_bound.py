@@ -0,0 +1,65 @@
+"""
+Benchmark: branch and bound over soft constraints, cost found against time budget
+Run with: python benchmarks/bench_branch_and_bound.py
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.timetable import TimetableProblem, SoftConstraints
+from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.branch_and_bound import BranchAndBoundSolver
+from src.utils.generator import TimetableGenerator
+
+# (label, restarts)
+CONFIGS = [
+    ('branch-and-bound', None),
+    ('branch-and-bound, luby', 'luby'),
+]
+
+# (num_courses, num_instructors); half the courses have preferred times
+CASES = [
+    (30, 6),
+    (80, 16),
+]
+SEEDS = range(3)
+TIMEOUT = 5.0
+
+def soft_problem(problem: TimetableProblem) -> TimetableProblem:
+    """problem with preferences, instructor days and room fit as penalties"""
+    enrollment = {c.id: 10 + (i * 7) % 50 for i, c in enumerate(problem.courses)}
+    soft = SoftConstraints(preference=1.0, day_spread=0.5, capacity_fit=0.02, enrollment=enrollment)
+    return TimetableProblem(problem.courses, problem.timeslots, problem.rooms, problem.instructor_constraints,
+                            problem.preferred_times, soft_constraints=soft)
+
+def main():
+    for num_courses, num_instructors in CASES:
+        hard = [TimetableGenerator.generate_scaled_problem(num_courses, tightness=0.8,
+                                                           num_instructors=num_instructors,
+                                                           preference_density=0.5, seed=seed)
+                for seed in SEEDS]
+        feasible = sum(BacktrackingWithForwardChecking(problem).solve(timeout=TIMEOUT)[0] is not None
+                       for problem in hard)
+        print(f"courses={num_courses} instructors={num_instructors} instances={len(hard)} "
+              f"feasible with hard preferences={feasible}")
+        for label, restarts in CONFIGS:
+            first = final = 0.0
+            optimal = solved = 0
+            start = time.perf_counter()
+            for problem in hard:
+                solver = BranchAndBoundSolver(soft_problem(problem), restarts=restarts)
+                solution, metrics = solver.solve(timeout=TIMEOUT)
+                if solution is None:
+                    continue
+                solved += 1
+                optimal += metrics['optimal']
+                first += metrics['improvements'][0][1]
+                final += metrics['cost']
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<24} solved={solved:<2} optimal={optimal:<2} first cost={first:<8.2f} "
+                  f"final cost={final:<8.2f} time={elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
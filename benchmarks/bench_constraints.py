@@ -0,0 +1,62 @@
+"""
+Benchmark: ConstraintChecker linear scan vs OccupancyIndex lookups
+Run with: python benchmarks/bench_constraints.py [num_courses]
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.timetable import TimetableProblem
+from src.models.constraints import ConstraintChecker
+from src.models.occupancy import OccupancyIndex
+from benchmarks.instances import build_problem
+
+def build_assignment(problem: TimetableProblem, seed: int = 0):
+    """Greedy random assignment of as many courses as fit"""
+    rng = random.Random(seed)
+    assignment = {}
+    occupancy = OccupancyIndex()
+    for course in problem.variables:
+        values = list(problem.get_domain(course))
+        rng.shuffle(values)
+        for timeslot, room in values:
+            if ConstraintChecker.check_all_constraints(problem, assignment, course,
+                                                       timeslot, room, occupancy):
+                assignment[course] = (timeslot, room)
+                occupancy.assign(course, timeslot, room)
+                break
+    return assignment, occupancy
+
+def time_checks(problem, assignment, occupancy, candidates) -> float:
+    start = time.perf_counter()
+    for course, timeslot, room in candidates:
+        ConstraintChecker.check_all_constraints(problem, assignment, course,
+                                                timeslot, room, occupancy)
+    return time.perf_counter() - start
+
+def main():
+    num_courses = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    problem = build_problem(num_courses)
+    assignment, occupancy = build_assignment(problem)
+    
+    rng = random.Random(1)
+    candidates = []
+    for _ in range(20000):
+        course = rng.choice(problem.variables)
+        timeslot, room = rng.choice(problem.get_domain(course))
+        candidates.append((course, timeslot, room))
+    
+    scan = time_checks(problem, assignment, None, candidates)
+    indexed = time_checks(problem, assignment, occupancy, candidates)
+    
+    print(f"Courses assigned: {len(assignment)} / {num_courses}")
+    print(f"Checks:           {len(candidates)}")
+    print(f"Linear scan:      {scan:.4f}s ({len(candidates) / scan:,.0f} checks/s)")
+    print(f"OccupancyIndex:   {indexed:.4f}s ({len(candidates) / indexed:,.0f} checks/s)")
+    print(f"Speedup:          {scan / indexed:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: streaming CSV/JSONL problem loading, JSONL solution writing and the bit-packed binary format
+Run with: python benchmarks/bench_io.py
+"""
+
+import csv
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.binary import save_binary, load_binary
+from src.models.compiled import CompiledProblem
+from src.utils.generator import TimetableGenerator
+from src.utils.problem_io import load_problem
+from src.utils.visualizer import TimetableVisualizer
+
+# (num_courses, num_rooms); 5 days x 8 periods = 40 slots throughout
+CASES = [
+    (1000, 50),
+    (5000, 200),
+]
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def write_jsonl(path, header, rows):
+    with open(path, 'w') as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(header, row))) + '\n')
+
+def write_inputs(problem, directory, suffix):
+    """The problem as course, room, timeslot, unavailability and preference files"""
+    write = write_csv if suffix == '.csv' else write_jsonl
+    paths = {name: os.path.join(directory, name + suffix)
+             for name in ('courses', 'rooms', 'timeslots', 'unavailable', 'preferences')}
+    write(paths['courses'], ['id', 'name', 'instructor', 'duration'],
+          ([c.id, c.name, c.instructor, c.duration] for c in problem.courses))
+    write(paths['rooms'], ['id', 'capacity', 'type'],
+          ([r.id, r.capacity, r.type] for r in problem.rooms))
+    write(paths['timeslots'], ['day', 'period'], ([ts.day, ts.period] for ts in problem.timeslots))
+    write(paths['unavailable'], ['instructor', 'day'],
+          ([name, day] for name, days in problem.instructor_constraints.items() for day in days))
+    write(paths['preferences'], ['course_id', 'day', 'period'],
+          ([cid, day, period] for cid, prefs in problem.preferred_times.items() for day, period in prefs))
+    return paths
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    for num_courses, num_rooms in CASES:
+        problem = TimetableGenerator.generate_scaled_problem(num_courses, num_rooms=num_rooms,
+                                                             lab_fraction=0.2, seed=0)
+        print(f"courses={num_courses} rooms={num_rooms} mask={problem.domain_mask.nbytes / 2**20:.0f} MiB")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for suffix in ('.csv', '.jsonl'):
+                paths = write_inputs(problem, directory, suffix)
+                loaded, seconds = timed(load_problem, paths['courses'], paths['rooms'], paths['timeslots'],
+                                        paths['unavailable'], paths['preferences'])
+                assert loaded.fingerprint() == problem.fingerprint()
+                print(f"  load {suffix:<7} {seconds:.3f}s")
+            
+            # Any placement per course: only the writing is timed
+            placements = {c: (problem.timeslots[0], problem.rooms[0]) for c in problem.courses}
+            for name in ('solution.json', 'solution.jsonl'):
+                path = os.path.join(directory, name)
+                _, seconds = timed(TimetableVisualizer.save_timetable_to_file, placements, path)
+                print(f"  write {name:<15} {seconds:.3f}s")
+            
+            binary = os.path.join(directory, 'problem.bin')
+            _, save_seconds = timed(save_binary, problem, binary)
+            opened, open_seconds = timed(load_binary, binary)
+            _, compile_seconds = timed(CompiledProblem, opened)
+            # A second open, traced: tracemalloc overhead would distort the timing
+            tracemalloc.start()
+            load_binary(binary)
+            _, traced = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            copied, pickled_seconds = timed(pickle.dumps, problem)
+            reference, _ = timed(pickle.dumps, opened)
+            _, unpickle_seconds = timed(pickle.loads, reference)
+            size = sum(os.path.getsize(os.path.join(binary, name)) for name in os.listdir(binary))
+            # Compiling reads the mapped rows: the bool mask is never unpacked
+            assert opened._domain_mask is None
+            print(f"  binary {size / 2**20:.1f} MiB save={save_seconds:.3f}s open={open_seconds:.3f}s "
+                  f"compile={compile_seconds:.3f}s; open allocates {traced / 2**20:.1f} MiB")
+            print(f"  pickle in-memory problem: {len(copied) / 2**20:.1f} MiB in {pickled_seconds:.3f}s; "
+                  f"binary-backed problem: {len(reference)} bytes, reopened in {unpickle_seconds:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark: local search vs budgeted backtracking on large generated instances
+Run with: python benchmarks/bench_local_search.py [num_courses] [timeout]
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.local_search import LocalSearchSolver
+from src.utils.generator import TimetableGenerator
+
+def main():
+    num_courses = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    
+    start = time.perf_counter()
+    problem = TimetableGenerator.generate_scaled_problem(
+        num_courses, tightness=0.95, num_instructors=num_courses // 8,
+        availability=0.6, preference_density=0.2, seed=0)
+    print(f"Instance: {num_courses} courses, {len(problem.rooms)} rooms "
+          f"(built in {time.perf_counter() - start:.2f}s)")
+    
+    for name, solver in [('forward-checking', BacktrackingWithForwardChecking(problem)),
+                         ('local-search', LocalSearchSolver(problem))]:
+        start = time.perf_counter()
+        solution, metrics = solver.solve(timeout=timeout)
+        elapsed = time.perf_counter() - start
+        placed = len(solution) if solution else 0
+        print(f"{name:<18} placed={placed}/{num_courses} time={elapsed:.2f}s "
+              f"steps/nodes={metrics['nodes_explored']} success={metrics['success']}")
+
+if __name__ == "__main__":
+    main()
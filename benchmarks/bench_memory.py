@@ -0,0 +1,86 @@
+"""
+Benchmark: peak memory of materialized domains, shared placement tuples vs a tuple per entry
+Run with: python benchmarks/bench_memory.py [num_courses ...]
+"""
+
+import sys
+import os
+import subprocess
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from src.models.timetable import Course
+from src.utils.generator import TimetableGenerator
+
+CASES = [1000, 3000]
+
+def per_entry_domains(problem):
+    """Every domain with its own (timeslot, room) tuple per entry, as built before placements were shared"""
+    num_rooms = len(problem.rooms)
+    return {course: [(problem.timeslots[v // num_rooms], problem.rooms[v % num_rooms])
+                     for v in np.flatnonzero(row).tolist()]
+            for course, row in zip(problem.courses, problem.unary_mask)}
+
+LAYOUTS = {
+    'shared placements': lambda problem: problem.domains,
+    'tuple per entry': per_entry_domains,
+}
+
+class DictCourse:
+    """Course with a per-instance __dict__, for comparison"""
+    def __init__(self, id, name, instructor, duration):
+        self.id = id
+        self.name = name
+        self.instructor = instructor
+        self.duration = duration
+
+def peak_memory() -> float:
+    """Peak RSS of this process in MiB (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def child(layout: str, num_courses: int):
+    """Materialize one layout's domains and print entries, seconds and peak RSS"""
+    problem = TimetableGenerator.generate_scaled_problem(num_courses, seed=0)
+    start = time.perf_counter()
+    domains = LAYOUTS[layout](problem)
+    elapsed = time.perf_counter() - start
+    print(sum(len(domain) for domain in domains.values()), elapsed, peak_memory())
+
+def object_bytes(cls, count: int) -> int:
+    tracemalloc.start()
+    objects = [cls(f"C{i:05d}", f"Course {i}", f"Instructor {i % 100}", 3) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+def main():
+    try:
+        import resource
+    except ImportError:
+        print("peak RSS needs the resource module (not available on Windows)")
+        return
+    
+    count = 10000
+    slotted, plain = object_bytes(Course, count), object_bytes(DictCourse, count)
+    print(f"{count} courses: slotted {slotted / 2**20:.2f} MiB, with __dict__ {plain / 2**20:.2f} MiB")
+    
+    for num_courses in [int(arg) for arg in sys.argv[1:]] or CASES:
+        print(f"courses={num_courses}")
+        for layout in LAYOUTS:
+            # A fresh process per layout, so each peak is its own
+            output = subprocess.run([sys.executable, __file__, '--child', layout, str(num_courses)],
+                                    capture_output=True, text=True, check=True).stdout
+            entries, elapsed, peak = output.split()
+            print(f"  {layout:<18} entries={int(entries):<10} time={float(elapsed):.2f}s "
+                  f"peak RSS={float(peak):.0f} MiB")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,44 @@
+"""
+Benchmark: plain search vs randomized restarts under a node budget
+Run with: python benchmarks/bench_restarts.py [num_seeds]
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.maintaining_arc_consistency import MaintainingArcConsistency
+from benchmarks.instances import build_random_problem
+
+MAX_NODES = 20000
+
+SOLVERS = [
+    ('forward-checking', lambda p: BacktrackingWithForwardChecking(p)),
+    ('forward-checking-luby', lambda p: BacktrackingWithForwardChecking(p, restarts='luby')),
+    ('forward-checking-geom', lambda p: BacktrackingWithForwardChecking(p, restarts='geometric')),
+    ('mac', lambda p: MaintainingArcConsistency(p)),
+    ('mac-luby', lambda p: MaintainingArcConsistency(p, restarts='luby')),
+]
+
+def main():
+    num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    problems = [build_random_problem(seed) for seed in range(num_seeds)]
+    
+    for name, make_solver in SOLVERS:
+        solved = 0
+        nodes = 0
+        progress = []
+        start = time.perf_counter()
+        for problem in problems:
+            solution, metrics = make_solver(problem).solve(max_nodes=MAX_NODES)
+            solved += solution is not None
+            nodes += metrics['nodes_explored']
+            progress.append(metrics['progress'])
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} solved={solved}/{num_seeds} nodes={nodes:<8} "
+              f"min_progress={min(progress):.2f} time={elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
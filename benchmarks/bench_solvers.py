@@ -0,0 +1,55 @@
+"""
+Benchmark: end-to-end solver runs on instances larger than the samples
+Run with: python benchmarks/bench_solvers.py
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.solvers.backtracking_heuristics import BacktrackingWithHeuristics
+from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from benchmarks.instances import build_problem
+
+# (solver, num_courses, num_rooms)
+CASES = [
+    (BacktrackingWithHeuristics, 20, 4),
+    (BacktrackingWithForwardChecking, 300, 20),
+]
+
+def run_case(solver_class, num_courses: int, num_rooms: int) -> dict:
+    problem = build_problem(num_courses, num_rooms=num_rooms)
+    
+    start = time.perf_counter()
+    solution, metrics = solver_class(problem).solve()
+    elapsed = time.perf_counter() - start
+    
+    # Separate traced run: tracemalloc overhead would distort the timing
+    tracemalloc.start()
+    solver_class(problem).solve()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'solver': solver_class.__name__,
+        'courses': num_courses,
+        'rooms': num_rooms,
+        'nodes': metrics['nodes_explored'],
+        'time': elapsed,
+        'nodes_per_sec': metrics['nodes_explored'] / elapsed if elapsed else 0.0,
+        'peak_kib': peak / 1024,
+        'success': solution is not None,
+    }
+
+def main():
+    for solver_class, num_courses, num_rooms in CASES:
+        r = run_case(solver_class, num_courses, num_rooms)
+        print(f"{r['solver']:<34} courses={r['courses']:<5} rooms={r['rooms']:<3} "
+              f"nodes={r['nodes']:<6} time={r['time']:.3f}s "
+              f"nodes/s={r['nodes_per_sec']:,.0f} peak={r['peak_kib']:,.0f}KiB "
+              f"success={r['success']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Shared benchmark instances"""
+
+import random
+from src.models.timetable import Course, TimeSlot, Room, TimetableProblem
+
+def build_problem(num_courses: int, num_rooms: int = 20, num_days: int = 5,
+                  periods_per_day: int = 8, num_instructors: int = 60) -> TimetableProblem:
+    """Build an instance larger than TimetableGenerator supports"""
+    courses = [Course(id=f"C{i}", name=f"Course {i}",
+                      instructor=f"Instructor {i % num_instructors}", duration=3)
+               for i in range(num_courses)]
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"][:num_days]
+    timeslots = [TimeSlot(day=day, period=p) for day in days for p in range(1, periods_per_day + 1)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(num_rooms)]
+    return TimetableProblem(courses, timeslots, rooms, {})
+
+def build_random_problem(seed: int, num_courses: int = 68, num_rooms: int = 3,
+                         num_days: int = 5, periods_per_day: int = 5,
+                         num_instructors: int = 12) -> TimetableProblem:
+    """Tight random instance: random instructors, each unavailable on up to two days"""
+    rng = random.Random(seed)
+    courses = [Course(id=f"C{i}", name=f"Course {i}",
+                      instructor=f"Instructor {rng.randrange(num_instructors)}", duration=3)
+               for i in range(num_courses)]
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"][:num_days]
+    timeslots = [TimeSlot(day=day, period=p) for day in days for p in range(1, periods_per_day + 1)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(num_rooms)]
+    unavailable = {f"Instructor {i}": rng.sample(days, rng.randrange(3))
+                   for i in range(num_instructors)}
+    return TimetableProblem(courses, timeslots, rooms, unavailable)
+
+def build_department_problem(num_departments: int, courses_per_department: int,
+                             rooms_per_department: int = 4, num_days: int = 5,
+                             periods_per_day: int = 8, instructors_per_department: int = 8,
+                             seed: int = 0) -> TimetableProblem:
+    """Block-diagonal instance: each department has its own instructors and rooms"""
+    rng = random.Random(seed)
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"][:num_days]
+    timeslots = [TimeSlot(day=day, period=p) for day in days for p in range(1, periods_per_day + 1)]
+    courses, rooms, domains, unavailable = [], [], {}, {}
+    for d in range(num_departments):
+        department_rooms = [Room(id=f"D{d}R{i}", capacity=40, type='classroom')
+                            for i in range(rooms_per_department)]
+        rooms.extend(department_rooms)
+        for i in range(instructors_per_department):
+            unavailable[f"D{d} Instructor {i}"] = rng.sample(days, rng.randrange(2))
+        for i in range(courses_per_department):
+            course = Course(id=f"D{d}C{i}", name=f"Course {i}",
+                            instructor=f"D{d} Instructor {rng.randrange(instructors_per_department)}",
+                            duration=3)
+            courses.append(course)
+            # Departments teach only in their own rooms
+            domains[course] = [(ts, room) for ts in timeslots if ts.day not in unavailable[course.instructor]
+                               for room in department_rooms]
+    return TimetableProblem(courses, timeslots, rooms, unavailable, domains=domains)
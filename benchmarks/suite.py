@@ -0,0 +1,168 @@
+"""
+Benchmark suite: size/tightness sweeps with repeated runs and regression tracking
+Run with: python benchmarks/suite.py [--quick] [--repeats N] [--output results.json]
+                                     [--compare benchmarks/baseline.json] [--threshold 0.3]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.solvers.backtracking_heuristics import BacktrackingWithHeuristics
+from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.maintaining_arc_consistency import MaintainingArcConsistency
+from src.utils.generator import TimetableGenerator
+
+# Exact LCV costs O(domain x courses) per node, so the sweep uses approx LCV
+SOLVERS = {
+    'heuristics-approx': lambda p: BacktrackingWithHeuristics(p, lcv='approx'),
+    'forward-checking': BacktrackingWithForwardChecking,
+    'mac': MaintainingArcConsistency,
+}
+
+SIZES = [50, 100, 200, 400]
+TIGHTNESS = [0.5, 0.7, 0.9]
+QUICK_SIZES = [50, 100]
+QUICK_TIGHTNESS = [0.5, 0.9]
+
+# Shared by every case. Rooms alone rarely force backtracking, so
+# instructors carry 8 courses each over fewer available days, with more
+# fixed preferences than the generator defaults: some cases need real search
+INSTANCE = {'availability': 0.6, 'preference_density': 0.2, 'seed': 0}
+COURSES_PER_INSTRUCTOR = 8
+
+# Caps each run so a thrashing case cannot stall the suite
+MAX_NODES = 1000
+
+# Slowdowns smaller than this are timer noise on millisecond cases
+MIN_DELTA_S = 0.005
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile, q in (0, 100]"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def run_case(name: str, num_courses: int, tightness: float, repeats: int) -> dict:
+    problem = TimetableGenerator.generate_scaled_problem(
+        num_courses, tightness=tightness,
+        num_instructors=max(1, num_courses // COURSES_PER_INSTRUCTOR), **INSTANCE)
+    make_solver = SOLVERS[name]
+    
+    # Warm-up run, untimed
+    make_solver(problem).solve(max_nodes=MAX_NODES)
+    
+    wall, cpu = [], []
+    for _ in range(repeats):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        solution, metrics = make_solver(problem).solve(max_nodes=MAX_NODES)
+        wall.append(time.perf_counter() - start_wall)
+        cpu.append(time.process_time() - start_cpu)
+    
+    # Separate traced run: tracemalloc overhead would distort the timing
+    tracemalloc.start()
+    make_solver(problem).solve(max_nodes=MAX_NODES)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    median = statistics.median(wall)
+    return {
+        'solver': name,
+        'courses': num_courses,
+        'tightness': tightness,
+        'rooms': len(problem.rooms),
+        'repeats': repeats,
+        'median_s': median,
+        'p95_s': percentile(wall, 95),
+        'cpu_median_s': statistics.median(cpu),
+        'nodes': metrics['nodes_explored'],
+        'nodes_per_sec': metrics['nodes_explored'] / median if median else 0.0,
+        'peak_kib': peak / 1024,
+        'success': solution is not None,
+        'budget_exhausted': metrics['budget_exhausted'],
+    }
+
+def case_key(result: dict):
+    return result['solver'], result['courses'], result['tightness']
+
+def compare(results, baseline, threshold: float):
+    """Flag cases slower than baseline by more than threshold, or searching differently"""
+    previous = {case_key(r): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        old = previous.get(case_key(r))
+        if old is None:
+            continue
+        ratio = r['median_s'] / old['median_s'] if old['median_s'] else 1.0
+        flags = []
+        if ratio > 1 + threshold and r['median_s'] - old['median_s'] > MIN_DELTA_S:
+            flags.append(f"slower x{ratio:.2f}")
+        if r['nodes'] != old['nodes'] or r['success'] != old['success']:
+            flags.append(f"nodes {old['nodes']} -> {r['nodes']}")
+        if flags:
+            regressions.append((r, flags))
+        print(f"{r['solver']:<18} n={r['courses']:<4} t={r['tightness']:<4} "
+              f"{old['median_s']:.4f}s -> {r['median_s']:.4f}s (x{ratio:.2f})"
+              f"{'  REGRESSION: ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='small sweep for a fast check')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--solvers', nargs='+', choices=sorted(SOLVERS), default=list(SOLVERS))
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--compare', help='baseline JSON from an earlier --output run')
+    parser.add_argument('--threshold', type=float, default=0.3,
+                        help='allowed slowdown of the median before flagging (0.3 = 30%%)')
+    args = parser.parse_args()
+    
+    sizes = QUICK_SIZES if args.quick else SIZES
+    tightness_levels = QUICK_TIGHTNESS if args.quick else TIGHTNESS
+    
+    results = []
+    for num_courses in sizes:
+        for tightness in tightness_levels:
+            for name in args.solvers:
+                r = run_case(name, num_courses, tightness, args.repeats)
+                results.append(r)
+                print(f"{r['solver']:<18} n={r['courses']:<4} t={r['tightness']:<4} "
+                      f"rooms={r['rooms']:<3} median={r['median_s']:.4f}s p95={r['p95_s']:.4f}s "
+                      f"nodes={r['nodes']:<6} nodes/s={r['nodes_per_sec']:,.0f} "
+                      f"peak={r['peak_kib']:,.0f}KiB success={r['success']}")
+    
+    if args.output:
+        report = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'repeats': args.repeats,
+                'max_nodes': MAX_NODES,
+                'instance': INSTANCE,
+                'courses_per_instructor': COURSES_PER_INSTRUCTOR,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparison against {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) found")
+            sys.exit(1)
+        print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
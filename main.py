@@ -6,10 +6,13 @@ Compares two backtracking approaches:
 2. Backtracking with Forward Checking
 """
 
+import argparse
 import os
+from typing import Optional
 from src.models.timetable import TimetableProblem
 from src.solvers.backtracking_heuristics import BacktrackingWithHeuristics
 from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.cache import SolutionCache
 from src.utils.generator import TimetableGenerator
 from src.utils.visualizer import TimetableVisualizer
 
@@ -18,8 +21,14 @@ def ensure_output_dirs():
     os.makedirs('output/results', exist_ok=True)
     os.makedirs('output/graphs', exist_ok=True)
 
-def run_experiment(problem: TimetableProblem, experiment_name: str):
-    """Run both solvers and compare performance"""
+def report_cache_hit(metrics):
+    """Note runs answered from the solution cache"""
+    if metrics.get('cache_hit'):
+        print("  (answered from the solution cache)")
+
+def run_experiment(problem: TimetableProblem, experiment_name: str,
+                   cache: Optional[SolutionCache] = None):
+    """Run both solvers and compare performance; with a cache, known problems skip search"""
     
     print("\n" + "="*100)
     print(f"EXPERIMENT: {experiment_name}".center(100))
@@ -35,7 +44,8 @@ def run_experiment(problem: TimetableProblem, experiment_name: str):
     # Solver 1: Backtracking with Heuristics
     print("Running Solver 1: Backtracking with MRV + LCV Heuristics...")
     solver1 = BacktrackingWithHeuristics(problem)
-    solution1, metrics1 = solver1.solve()
+    solution1, metrics1 = solver1.solve(cache=cache)
+    report_cache_hit(metrics1)
     
     if solution1:
         print("✓ Solution found!")
@@ -52,7 +62,8 @@ def run_experiment(problem: TimetableProblem, experiment_name: str):
     # Solver 2: Backtracking with Forward Checking
     print("Running Solver 2: Backtracking with Forward Checking...")
     solver2 = BacktrackingWithForwardChecking(problem)
-    solution2, metrics2 = solver2.solve()
+    solution2, metrics2 = solver2.solve(cache=cache)
+    report_cache_hit(metrics2)
     
     if solution2:
         print("✓ Solution found!")
@@ -82,6 +93,11 @@ def run_experiment(problem: TimetableProblem, experiment_name: str):
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Timetable generation as a CSP")
+    parser.add_argument('--cache', metavar='DIR',
+                        help='reuse timetables of problems already solved, stored in DIR')
+    args = parser.parse_args()
+    cache = SolutionCache(args.cache) if args.cache else None
     
     print("\n" + "="*100)
     print("TIMETABLE GENERATION - CONSTRAINT SATISFACTION PROBLEM".center(100))
@@ -97,7 +113,7 @@ def main():
         num_days=5,
         periods_per_day=6
     )
-    run_experiment(small_problem, "small_problem")
+    run_experiment(small_problem, "small_problem", cache)
     
     # Experiment 2: Medium Problem
     print("\n--- GENERATING MEDIUM PROBLEM ---")
@@ -107,12 +123,12 @@ def main():
         num_days=5,
         periods_per_day=6
     )
-    run_experiment(medium_problem, "medium_problem")
+    run_experiment(medium_problem, "medium_problem", cache)
     
     # Experiment 3: Complex Problem
     print("\n--- GENERATING COMPLEX PROBLEM ---")
     complex_problem = TimetableGenerator.generate_complex_problem()
-    run_experiment(complex_problem, "complex_problem")
+    run_experiment(complex_problem, "complex_problem", cache)
     
     print("\n" + "="*100)
     print("ALL EXPERIMENTS COMPLETED".center(100))
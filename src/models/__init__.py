@@ -1,6 +1,11 @@
 # src/models/__init__.py
 """Data models for timetable CSP"""
-from .timetable import Course, TimeSlot, Room, TimetableProblem, TimetableAssignment
+from .timetable import Course, TimeSlot, Room, TimetableProblem, TimetableAssignment, ChangeSet, SoftConstraints
 from .constraints import ConstraintChecker
+from .occupancy import OccupancyIndex
+from .binary import save_binary, load_binary
+from .blocks import CompiledBlocks, block_patterns
 
-__all__ = ['Course', 'TimeSlot', 'Room', 'TimetableProblem', 'TimetableAssignment', 'ConstraintChecker']
+__all__ = ['Course', 'TimeSlot', 'Room', 'TimetableProblem', 'TimetableAssignment', 'ConstraintChecker',
+           'OccupancyIndex', 'ChangeSet', 'save_binary', 'load_binary', 'CompiledBlocks', 'block_patterns',
+           'SoftConstraints']
@@ -0,0 +1,86 @@
+import json
+import os
+import numpy as np
+from dataclasses import asdict
+from .timetable import Course, TimeSlot, Room, TimetableProblem, SoftConstraints, _pack_rows, _unpack_rows
+
+FORMAT_VERSION = 2
+META_FILE = 'problem.json'
+DOMAIN_FILE = 'domain_bits.npy'
+OVERRIDE_FILES = ('override_courses.npy', 'override_bits.npy')
+
+def save_binary(problem: TimetableProblem, directory: str):
+    """Write problem as a directory loadable by load_binary.
+    
+    Only the compiled domain mask is stored, bit-packed one row per course
+    (an eighth of the bool array); explicit domains are stored the same
+    way. unary_mask is recomputed from the instructor and room constraints
+    when needed. Courses, slots, rooms, instructor unavailability,
+    preferred times, soft constraints and the fingerprint go to a small
+    JSON file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    course_index = {course: i for i, course in enumerate(problem.courses)}
+    meta = {
+        'version': FORMAT_VERSION,
+        'courses': [[c.id, c.name, c.instructor, c.duration] for c in problem.courses],
+        'timeslots': [[ts.day, ts.period] for ts in problem.timeslots],
+        'rooms': [[r.id, r.capacity, r.type] for r in problem.rooms],
+        'instructor_constraints': problem.instructor_constraints,
+        'preferred_times': problem.preferred_times,
+        'soft_constraints': (asdict(problem.soft_constraints)
+                             if problem.soft_constraints is not None else None),
+        # Saves reopened problems the sort and hash, e.g. on a SolutionCache lookup
+        'fingerprint': problem.fingerprint()
+    }
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump(meta, f)
+    np.save(os.path.join(directory, DOMAIN_FILE), problem.domain_rows)
+    
+    overrides = list(problem._overrides.items())
+    override_mask = np.zeros((len(overrides), len(problem.timeslots), len(problem.rooms)), dtype=bool)
+    if overrides:
+        slot_index = {ts: i for i, ts in enumerate(problem.timeslots)}
+        room_index = {room: i for i, room in enumerate(problem.rooms)}
+        for row, (_, domain) in zip(override_mask, overrides):
+            for ts, room in domain:
+                row[slot_index[ts], room_index[room]] = True
+    courses = np.array([course_index[course] for course, _ in overrides], dtype=np.int32)
+    for name, array in zip(OVERRIDE_FILES, (courses, _pack_rows(override_mask))):
+        np.save(os.path.join(directory, name), array)
+
+def load_binary(directory: str) -> TimetableProblem:
+    """Open a problem written by save_binary.
+    
+    The packed rows are a read-only memory map kept as domain_rows:
+    opening costs the same whatever their size, pages are read on first
+    touch, and processes opening the same directory share them through
+    the page cache. CompiledProblem reads its bitsets straight from them;
+    domain_mask is only unpacked if something asks for it. The problem
+    pickles as its directory, so worker processes reopen it instead of
+    receiving a copy of the masks.
+    """
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"unsupported problem format version {meta.get('version')!r} in {directory}")
+    
+    courses = [Course(cid, name, instructor, duration) for cid, name, instructor, duration in meta['courses']]
+    timeslots = [TimeSlot(day, period) for day, period in meta['timeslots']]
+    rooms = [Room(rid, capacity, rtype) for rid, capacity, rtype in meta['rooms']]
+    placements = [(ts, room) for ts in timeslots for room in rooms]
+    override_courses, override_bits = (np.load(os.path.join(directory, name)) for name in OVERRIDE_FILES)
+    override_mask = _unpack_rows(override_bits, len(timeslots), len(rooms))
+    domains = {courses[c]: [placements[v] for v in np.flatnonzero(row).tolist()]
+               for c, row in zip(override_courses.tolist(), override_mask)}
+    preferred_times = {cid: [tuple(p) for p in prefs] for cid, prefs in meta['preferred_times'].items()}
+    
+    soft = meta.get('soft_constraints')
+    problem = TimetableProblem(courses, timeslots, rooms, meta['instructor_constraints'],
+                               preferred_times, domains=domains,
+                               soft_constraints=SoftConstraints(**soft) if soft is not None else None)
+    problem._domain_rows = np.load(os.path.join(directory, DOMAIN_FILE), mmap_mode='r')
+    problem._placements = placements
+    problem._fingerprint = meta.get('fingerprint')
+    problem._binary_path = os.path.abspath(directory)
+    return problem
@@ -0,0 +1,137 @@
+from itertools import combinations
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .timetable import Course, TimeSlot, Room, TimetableProblem
+from .compiled import CompiledProblem
+
+# A block: the slot indices of every period a course meets in one week
+Pattern = Tuple[int, ...]
+
+def block_patterns(timeslots: List[TimeSlot], sessions: int, length: int) -> List[Pattern]:
+    """Every way to meet sessions times a week for length consecutive periods each.
+    
+    Sessions fall on distinct days and start at the same period, so one
+    session of length periods is a contiguous run and length 1 sessions
+    are a weekly pattern like Monday/Wednesday/Friday at period 2.
+    Patterns are sorted by their slot indices.
+    """
+    slot_of = {(ts.day, ts.period): i for i, ts in enumerate(timeslots)}
+    days = list(dict.fromkeys(ts.day for ts in timeslots))
+    starts = sorted({ts.period for ts in timeslots})
+    patterns = []
+    for chosen in combinations(days, sessions):
+        for start in starts:
+            slots = [slot_of.get((day, start + offset)) for day in chosen for offset in range(length)]
+            if None not in slots:
+                patterns.append(tuple(sorted(slots)))
+    return sorted(patterns)
+
+def course_shape(course: Course, session_length: Optional[int]) -> Tuple[int, int]:
+    """(sessions, periods per session) for course's weekly hours.
+    
+    session_length None puts the whole duration in one contiguous run.
+    """
+    length = session_length or course.duration
+    if length < 1 or course.duration % length:
+        raise ValueError(f"{course.id}: duration {course.duration} is not a whole number "
+                         f"of {length}-period sessions")
+    return course.duration // length, length
+
+class CompiledBlocks:
+    """Integer encoding of a problem whose courses each take one multi-period block.
+    
+    Like CompiledProblem, but a domain value is ``pattern * num_rooms +
+    room``: the course meets in that room at every slot of the pattern,
+    so a course stays one variable however many periods it needs. A
+    value is allowed iff every slot of its pattern is, per domain_mask.
+    
+    Conflicts are precomputed per pattern as value bitsets: overlap[p]
+    holds every value whose pattern shares a slot with pattern p, and
+    room_values[r] every value in room r, so the values a placement rules
+    out for another course are ``overlap[p]`` (same instructor) or
+    ``overlap[p] & room_values[r]``, without expanding blocks into slots.
+    """
+    
+    def __init__(self, problem: TimetableProblem, session_length: Optional[int] = 1,
+                 session_lengths: Optional[Dict[str, Optional[int]]] = None):
+        """
+        session_length: periods per session, sessions on distinct days; None
+        means one contiguous block of the course's whole duration
+        session_lengths: course id -> session_length, overriding the default
+        """
+        self.problem = problem
+        base = CompiledProblem(problem)
+        self.courses: List[Course] = base.courses
+        self.timeslots: List[TimeSlot] = base.timeslots
+        self.rooms: List[Room] = base.rooms
+        self.instructors: List[str] = base.instructors
+        self.course_index = base.course_index
+        self.course_instructor = base.course_instructor
+        self.instructor_courses = base.instructor_courses
+        self.course_degree = base.course_degree
+        self.room_class = base.room_class
+        
+        self.num_courses = base.num_courses
+        self.num_rooms = base.num_rooms
+        self.num_instructors = base.num_instructors
+        
+        overrides = session_lengths or {}
+        self.course_shape: List[Tuple[int, int]] = [
+            course_shape(c, overrides.get(c.id, session_length)) for c in self.courses]
+        
+        # Patterns of every shape in use, numbered in shape order
+        self.patterns: List[Pattern] = []
+        shape_patterns: Dict[Tuple[int, int], range] = {}
+        for shape in sorted(set(self.course_shape)):
+            found = block_patterns(self.timeslots, *shape)
+            shape_patterns[shape] = range(len(self.patterns), len(self.patterns) + len(found))
+            self.patterns.extend(found)
+        self.num_patterns = len(self.patterns)
+        self.num_values = self.num_patterns * self.num_rooms
+        
+        # allowed[c, p, r]: course c may meet in room r at every slot of pattern p
+        mask = problem.domain_mask
+        allowed = np.zeros((self.num_courses, self.num_patterns, self.num_rooms), dtype=bool)
+        for shape, numbers in shape_patterns.items():
+            rows = np.array([c for c, s in enumerate(self.course_shape) if s == shape], dtype=np.intp)
+            if len(numbers):
+                slots = np.array(self.patterns[numbers.start:numbers.stop], dtype=np.intp)
+                allowed[rows, numbers.start:numbers.stop] = mask[rows][:, slots, :].all(axis=2)
+        flat = allowed.reshape(self.num_courses, self.num_values)
+        self.domains = [CompiledProblem._to_array(np.flatnonzero(row)) for row in flat]
+        self.domain_bits: List[int] = [self._bits(row) for row in flat]
+        
+        # Pattern x slot incidence; two patterns overlap iff they share a slot
+        incidence = np.zeros((self.num_patterns, len(self.timeslots)), dtype=bool)
+        for p, pattern in enumerate(self.patterns):
+            incidence[p, list(pattern)] = True
+        overlaps = (incidence.astype(np.intc) @ incidence.T.astype(np.intc)) > 0
+        self.overlap: List[int] = [self._bits(np.repeat(row, self.num_rooms)) for row in overlaps]
+        every_pattern = self._bits(np.arange(self.num_values) % self.num_rooms == 0)
+        self.room_values: List[int] = [every_pattern << r for r in range(self.num_rooms)]
+        
+        # Pattern and room bitsets per course, and pattern overlaps as pattern bitsets
+        has_pattern = allowed.any(axis=2)
+        self.course_patterns: List[int] = [self._bits(row) for row in has_pattern]
+        self.course_rooms: List[int] = [self._bits(row) for row in allowed.any(axis=1)]
+        self.pattern_overlap: List[int] = [self._bits(row) for row in overlaps]
+        
+        # Per pattern, the courses with a value overlapping it: the only ones a placement there can prune
+        touches = (has_pattern.astype(np.intc) @ overlaps.astype(np.intc)) > 0
+        self.pattern_courses: List[List[int]] = [np.flatnonzero(touches[:, p]).tolist()
+                                                 for p in range(self.num_patterns)]
+    
+    @staticmethod
+    def _bits(row: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+    
+    def decode_value(self, value: int) -> List[Tuple[TimeSlot, Room]]:
+        """The (timeslot, room) of every period of a block value, in slot order"""
+        pattern, room = divmod(value, self.num_rooms)
+        return [(self.timeslots[slot], self.rooms[room]) for slot in self.patterns[pattern]]
+    
+    def decode(self, assignment: Optional[Dict[int, int]]) -> Optional[Dict[Course, List[Tuple[TimeSlot, Room]]]]:
+        """Map a course index -> block value assignment back to model objects"""
+        if assignment is None:
+            return None
+        return {self.courses[c]: self.decode_value(v) for c, v in assignment.items()}
@@ -0,0 +1,129 @@
+from array import array
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .timetable import Course, TimeSlot, Room, TimetableProblem
+
+class CompiledProblem:
+    """Dense integer encoding of a TimetableProblem for the solver hot paths.
+    
+    Courses, instructors, timeslots and rooms are numbered 0..n-1 in problem
+    order. A domain value is the single int ``slot * num_rooms + room``, so
+    values sort in the same (timeslot, room) order as ``problem.domains``.
+    Unary constraints (instructor availability, room type and preferred
+    times) come from the problem's vectorized domain_mask, leaving only the
+    binary room and instructor conflicts for search.
+    """
+    
+    def __init__(self, problem: TimetableProblem):
+        self.problem = problem
+        self.courses: List[Course] = list(problem.variables)
+        self.timeslots: List[TimeSlot] = list(problem.timeslots)
+        self.rooms: List[Room] = list(problem.rooms)
+        self.instructors: List[str] = list(dict.fromkeys(c.instructor for c in self.courses))
+        
+        self.num_courses = len(self.courses)
+        self.num_slots = len(self.timeslots)
+        self.num_rooms = len(self.rooms)
+        self.num_instructors = len(self.instructors)
+        self.num_values = self.num_slots * self.num_rooms
+        
+        self.course_index: Dict[Course, int] = {c: i for i, c in enumerate(self.courses)}
+        self.slot_index: Dict[TimeSlot, int] = {ts: i for i, ts in enumerate(self.timeslots)}
+        self.room_index: Dict[Room, int] = {r: i for i, r in enumerate(self.rooms)}
+        instructor_index = {name: i for i, name in enumerate(self.instructors)}
+        
+        self.course_instructor = array('i', (instructor_index[c.instructor] for c in self.courses))
+        self.instructor_courses: List[List[int]] = [[] for _ in range(self.num_instructors)]
+        for course, instructor in enumerate(self.course_instructor):
+            self.instructor_courses[instructor].append(course)
+        
+        # Degree: number of other courses sharing the instructor
+        self.course_degree = array('i', (len(self.instructor_courses[i]) - 1
+                                         for i in self.course_instructor))
+        # Bitset views: bit v of domain_bits[c] is set iff value v is in the domain.
+        # Read straight off the packed rows, which a binary-backed problem maps from disk
+        self.domain_bits: List[int] = [int.from_bytes(row.tobytes(), 'little') for row in problem.domain_rows]
+        room_mask = (1 << self.num_rooms) - 1
+        self.slot_masks: List[int] = [room_mask << (s * self.num_rooms)
+                                      for s in range(self.num_slots)]
+        
+        # One pass over the mask in blocks of courses, so it is never unpacked whole.
+        # Flattened, a course's mask row is indexed by value
+        self.domains: List[array] = []
+        has_slot = []
+        # Per room (slot), its mask column packed block by block
+        room_keys = [[] for _ in range(self.num_rooms)]
+        slot_keys = [[] for _ in range(self.num_slots)]
+        for block in problem.domain_blocks():
+            flat = block.reshape(len(block), self.num_values)
+            self.domains.extend(self._to_array(np.flatnonzero(row)) for row in flat)
+            has_slot.append(block.any(axis=2))
+            for keys, columns in ((room_keys, block.transpose(2, 0, 1)), (slot_keys, block.transpose(1, 0, 2))):
+                for key, column in zip(keys, columns):
+                    key.append(np.packbits(column).tobytes())
+        
+        # Per slot, the courses with a value there: the only ones a prune at that slot can touch
+        has_slot = np.concatenate(has_slot) if has_slot else np.zeros((0, self.num_slots), dtype=bool)
+        self.slot_courses: List[List[int]] = [np.flatnonzero(has_slot[:, slot]).tolist()
+                                              for slot in range(self.num_slots)]
+        
+        # Symmetry classes: rooms (slots) whose mask columns are identical are
+        # interchangeable for every course. Each maps to the first of its class
+        self.room_class = self._classes(room_keys)
+        self.slot_class = self._classes(slot_keys)
+    
+    @staticmethod
+    def _classes(keys: List[List[bytes]]) -> array:
+        first = {}
+        return array('i', (first.setdefault(b''.join(parts), i) for i, parts in enumerate(keys)))
+    
+    @staticmethod
+    def _to_array(values: np.ndarray) -> array:
+        # np.intc is C int, the item type of array('i'): a buffer copy, no per-item boxing
+        result = array('i')
+        result.frombytes(values.astype(np.intc).tobytes())
+        return result
+    
+    def value_slot(self, value: int) -> int:
+        return value // self.num_rooms
+    
+    def value_room(self, value: int) -> int:
+        return value % self.num_rooms
+    
+    def decode_value(self, value: int) -> Tuple[TimeSlot, Room]:
+        return self.problem.placements[value]
+    
+    def decode(self, assignment: Optional[Dict[int, int]]) -> Optional[Dict[Course, Tuple[TimeSlot, Room]]]:
+        """Map a course index -> value assignment back to model objects"""
+        if assignment is None:
+            return None
+        return {self.courses[c]: self.decode_value(v) for c, v in assignment.items()}
+
+class CompiledOccupancy:
+    """OccupancyIndex counterpart for CompiledProblem values.
+    
+    Room usage is a flat bytearray indexed directly by value; instructor
+    usage is indexed by ``instructor * num_slots + slot``.
+    """
+    
+    def __init__(self, compiled: CompiledProblem):
+        self.compiled = compiled
+        self.room_busy = bytearray(compiled.num_values)
+        self.instructor_busy = bytearray(compiled.num_instructors * compiled.num_slots)
+    
+    def _instructor_key(self, course: int, value: int) -> int:
+        compiled = self.compiled
+        return (compiled.course_instructor[course] * compiled.num_slots
+                + value // compiled.num_rooms)
+    
+    def assign(self, course: int, value: int):
+        self.room_busy[value] = 1
+        self.instructor_busy[self._instructor_key(course, value)] = 1
+    
+    def unassign(self, course: int, value: int):
+        self.room_busy[value] = 0
+        self.instructor_busy[self._instructor_key(course, value)] = 0
+    
+    def is_free(self, course: int, value: int) -> bool:
+        return not (self.room_busy[value] or
+                    self.instructor_busy[self._instructor_key(course, value)])
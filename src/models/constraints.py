@@ -1,5 +1,6 @@
-from typing import Dict, Tuple
-from .timetable import Course, TimeSlot, Room, TimetableProblem
+from typing import Dict, List, Set, Tuple, Optional
+from .timetable import Course, TimeSlot, Room, TimetableProblem, SoftConstraints
+from .occupancy import OccupancyIndex
 
 class ConstraintChecker:
     @staticmethod
@@ -7,36 +8,74 @@ class ConstraintChecker:
                              assignment: Dict[Course, Tuple[TimeSlot, Room]],
                              course: Course, 
                              timeslot: TimeSlot, 
-                             room: Room) -> bool:
-        """Check if assigning (timeslot, room) to course violates any constraint"""
+                             room: Room,
+                             occupancy: Optional[OccupancyIndex] = None) -> bool:
+        """Check if assigning (timeslot, room) to course violates any constraint
         
-        # 1. No two courses can occupy the same room at the same time
-        if not ConstraintChecker._check_room_conflict(assignment, timeslot, room):
-            return False
+        If an OccupancyIndex mirroring the assignment is given, room and
+        instructor conflicts are answered from it in O(1).
+        """
         
-        # 2. Instructor cannot teach two courses at the same time
-        if not ConstraintChecker._check_instructor_conflict(assignment, course, timeslot):
-            return False
+        if occupancy is not None:
+            # 1 + 2. Indexed room and instructor conflict checks
+            if not occupancy.is_room_free(timeslot, room):
+                return False
+            if not occupancy.is_instructor_free(course.instructor, timeslot):
+                return False
+        else:
+            # 1. No two courses can occupy the same room at the same time
+            if not ConstraintChecker._check_room_conflict(assignment, timeslot, room):
+                return False
+            
+            # 2. Instructor cannot teach two courses at the same time
+            if not ConstraintChecker._check_instructor_conflict(assignment, course, timeslot):
+                return False
         
         # 3. Instructor availability constraint
         unavailable = problem.instructor_constraints.get(course.instructor, [])
         if timeslot.day in unavailable:
             return False
         
-        # Preference constraint
-        if course.id in problem.preferred_times:
+        # Preference constraint, unless preferences are soft
+        if course.id in problem.preferred_times and problem.soft_constraints is None:
             prefs = problem.preferred_times[course.id]
             if not any((timeslot.day == day and timeslot.period == period) for day, period in prefs):
                 return False
         
         return True
     
+    @staticmethod
+    def check_block_constraints(problem: TimetableProblem,
+                                assignment: Dict[Course, List[Tuple[TimeSlot, Room]]],
+                                course: Course,
+                                sessions: List[Tuple[TimeSlot, Room]],
+                                occupancy: Optional[OccupancyIndex] = None) -> bool:
+        """Check if giving course every (timeslot, room) in sessions violates any constraint
+        
+        assignment maps courses to their own session lists. Sessions must
+        be at distinct timeslots and each must pass check_all_constraints
+        against every period already assigned; an OccupancyIndex mirroring
+        all of those periods may be given to skip building one.
+        """
+        slots = [timeslot for timeslot, _ in sessions]
+        if len(set(slots)) < len(slots):
+            return False
+        
+        if occupancy is None:
+            occupancy = OccupancyIndex()
+            for other, placed in assignment.items():
+                for timeslot, room in placed:
+                    occupancy.assign(other, timeslot, room)
+        return all(ConstraintChecker.check_all_constraints(problem, assignment, course, timeslot, room, occupancy)
+                   for timeslot, room in sessions)
+    
     @staticmethod
     def _check_room_conflict(assignment: Dict[Course, Tuple[TimeSlot, Room]], 
                             timeslot: TimeSlot, room: Room) -> bool:
         """Check if room is already occupied at this timeslot"""
+        # Timeslots and rooms are interned, so identity is equality
         for assigned_course, (assigned_slot, assigned_room) in assignment.items():
-            if assigned_slot == timeslot and assigned_room == room:
+            if assigned_slot is timeslot and assigned_room is room:
                 return False
         return True
     
@@ -46,10 +85,34 @@ class ConstraintChecker:
         """Check if instructor is already teaching at this timeslot"""
         for assigned_course, (assigned_slot, _) in assignment.items():
             if (assigned_course.instructor == course.instructor and 
-                assigned_slot == timeslot):
+                assigned_slot is timeslot):
                 return False
         return True
     
+    @staticmethod
+    def soft_penalties(problem: TimetableProblem,
+                       assignment: Dict[Course, Tuple[TimeSlot, Room]]) -> Dict[str, float]:
+        """Weighted penalty of each soft constraint in problem.soft_constraints for assignment
+        
+        Problems without soft constraints use SoftConstraints() defaults.
+        Returns preference, day_spread and capacity_fit totals.
+        """
+        soft = problem.soft_constraints or SoftConstraints()
+        preference = day_spread = capacity_fit = 0.0
+        days: Dict[str, Set[str]] = {}
+        for course, (timeslot, room) in assignment.items():
+            prefs = problem.preferred_times.get(course.id)
+            if prefs is not None and not any(timeslot.day == day and timeslot.period == period
+                                             for day, period in prefs):
+                preference += soft.preference
+            days.setdefault(course.instructor, set()).add(timeslot.day)
+            enrollment = soft.enrollment.get(course.id)
+            if enrollment is not None:
+                capacity_fit += soft.capacity_fit * abs(room.capacity - enrollment)
+        for taught in days.values():
+            day_spread += soft.day_spread * (len(taught) - 1)
+        return {'preference': preference, 'day_spread': day_spread, 'capacity_fit': capacity_fit}
+    
     @staticmethod
     def is_complete(problem: TimetableProblem, 
                    assignment: Dict[Course, Tuple[TimeSlot, Room]]) -> bool:
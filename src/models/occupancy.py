@@ -0,0 +1,32 @@
+from typing import Dict, Set, Tuple
+from .timetable import Course, TimeSlot, Room
+
+class OccupancyIndex:
+    """Incremental room x slot and instructor x slot occupancy tables.
+    
+    Mirrors an assignment dict so that room and instructor conflict checks
+    are O(1) set lookups instead of scans over every assigned course.
+    """
+    
+    def __init__(self, assignment: Dict[Course, Tuple[TimeSlot, Room]] = None):
+        self.room_slots: Set[Tuple[TimeSlot, Room]] = set()
+        self.instructor_slots: Set[Tuple[str, TimeSlot]] = set()
+        
+        for course, (timeslot, room) in (assignment or {}).items():
+            self.assign(course, timeslot, room)
+    
+    def assign(self, course: Course, timeslot: TimeSlot, room: Room):
+        """Mark room and instructor as busy at timeslot"""
+        self.room_slots.add((timeslot, room))
+        self.instructor_slots.add((course.instructor, timeslot))
+    
+    def unassign(self, course: Course, timeslot: TimeSlot, room: Room):
+        """Release room and instructor at timeslot"""
+        self.room_slots.discard((timeslot, room))
+        self.instructor_slots.discard((course.instructor, timeslot))
+    
+    def is_room_free(self, timeslot: TimeSlot, room: Room) -> bool:
+        return (timeslot, room) not in self.room_slots
+    
+    def is_instructor_free(self, instructor: str, timeslot: TimeSlot) -> bool:
+        return (instructor, timeslot) not in self.instructor_slots
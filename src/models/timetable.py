@@ -1,8 +1,15 @@
-from typing import List, Dict, Set, Tuple
-from dataclasses import dataclass
+import hashlib
+import numpy as np
+from typing import ClassVar, Iterator, List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+# Model classes declare __slots__ (no per-instance __dict__) and are frozen.
+# Frozen dataclasses cannot restore slots by setattr, so each one pickles
+# through its constructor with __reduce__.
 
 @dataclass(frozen=True)
 class Course:
+    __slots__ = ('id', 'name', 'instructor', 'duration')
     id: str
     name: str
     instructor: str
@@ -10,66 +17,305 @@ class Course:
     
     def __repr__(self):
         return f"{self.id}-{self.name}"
+    
+    def __reduce__(self):
+        return Course, (self.id, self.name, self.instructor, self.duration)
 
-@dataclass
+@dataclass(frozen=True, eq=False, init=False)
 class TimeSlot:
+    """A teaching period, interned: equal timeslots are the same object.
+    
+    Construction returns the existing instance for (day, period), so
+    identity comparison and hashing are exact, and unpickling interns
+    again in the receiving process.
+    """
+    __slots__ = ('day', 'period')
     day: str
     period: int  # 1-8 (assuming 8 periods per day)
     
+    _interned: ClassVar[Dict[Tuple[str, int], 'TimeSlot']] = {}
+    
+    def __new__(cls, day: str, period: int):
+        timeslot = cls._interned.get((day, period))
+        if timeslot is None:
+            timeslot = object.__new__(cls)
+            object.__setattr__(timeslot, 'day', day)
+            object.__setattr__(timeslot, 'period', period)
+            timeslot = cls._interned.setdefault((day, period), timeslot)
+        return timeslot
+    
     def __repr__(self):
         return f"{self.day}-P{self.period}"
     
-    def __hash__(self):
-        return hash((self.day, self.period))
-    
-    def __eq__(self, other):
-        return self.day == other.day and self.period == other.period
+    def __reduce__(self):
+        return TimeSlot, (self.day, self.period)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False, init=False)
 class Room:
+    """A room, interned like TimeSlot on (id, capacity, type)"""
+    __slots__ = ('id', 'capacity', 'type')
     id: str
     capacity: int
     type: str  # 'lab' or 'classroom'
     
+    _interned: ClassVar[Dict[Tuple[str, int, str], 'Room']] = {}
+    
+    def __new__(cls, id: str, capacity: int, type: str):
+        room = cls._interned.get((id, capacity, type))
+        if room is None:
+            room = object.__new__(cls)
+            object.__setattr__(room, 'id', id)
+            object.__setattr__(room, 'capacity', capacity)
+            object.__setattr__(room, 'type', type)
+            room = cls._interned.setdefault((id, capacity, type), room)
+        return room
+    
     def __repr__(self):
         return f"{self.id}"
+    
+    def __reduce__(self):
+        return Room, (self.id, self.capacity, self.type)
 
+@dataclass(frozen=True)
 class TimetableAssignment:
-    def __init__(self, course: Course, timeslot: TimeSlot, room: Room):
-        self.course = course
-        self.timeslot = timeslot
-        self.room = room
+    __slots__ = ('course', 'timeslot', 'room')
+    course: Course
+    timeslot: TimeSlot
+    room: Room
     
     def __repr__(self):
         return f"{self.course.id} | {self.timeslot} | {self.room.id}"
+    
+    def __reduce__(self):
+        return TimetableAssignment, (self.course, self.timeslot, self.room)
+
+@dataclass
+class ChangeSet:
+    """A batch of edits to a published problem, applied by TimetableProblem.apply_changes"""
+    add_courses: List[Course] = field(default_factory=list)
+    remove_courses: List[str] = field(default_factory=list)  # course ids
+    unavailable: Dict[str, List[str]] = field(default_factory=dict)  # instructor -> days newly unavailable
+    available: Dict[str, List[str]] = field(default_factory=dict)  # instructor -> days available again
+    remove_rooms: List[str] = field(default_factory=list)  # room ids
+    preferred_times: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)  # course id -> new preferences
+
+@dataclass(frozen=True)
+class SoftConstraints:
+    """Penalty weights that make a problem an optimization problem.
+    
+    Given to a TimetableProblem, preferred times stop being hard: each
+    course placed outside its preferred times costs preference. Each day
+    an instructor teaches beyond their first costs day_spread, and each
+    seat of difference between a course's enrollment (if listed) and its
+    room's capacity costs capacity_fit.
+    """
+    preference: float = 1.0
+    day_spread: float = 0.0
+    capacity_fit: float = 0.0
+    enrollment: Dict[str, int] = field(default_factory=dict)  # course id -> expected students
+    
+    def __hash__(self):
+        return hash((self.preference, self.day_spread, self.capacity_fit, tuple(sorted(self.enrollment.items()))))
+
+# Courses per block when a packed mask is unpacked block by block
+DOMAIN_BLOCK = 1024
+
+def _pack_rows(mask: np.ndarray) -> np.ndarray:
+    """Bit-pack a courses x slots x rooms mask into one row of bytes per course.
+    
+    Bit v of a row (little-endian within each byte) is value v, the layout
+    of CompiledProblem.domain_bits.
+    """
+    num_values = mask.shape[1] * mask.shape[2]
+    return np.packbits(mask.reshape(len(mask), num_values), axis=1, bitorder='little')
+
+def _unpack_rows(rows: np.ndarray, num_slots: int, num_rooms: int) -> np.ndarray:
+    """Inverse of _pack_rows"""
+    values = np.unpackbits(rows, axis=1, count=num_slots * num_rooms, bitorder='little')
+    return values.view(bool).reshape(len(rows), num_slots, num_rooms)
 
 class TimetableProblem:
     def __init__(self, courses: List[Course], timeslots: List[TimeSlot], 
                 rooms: List[Room], instructor_constraints: Dict[str, List[str]],
-                preferred_times: Dict[str, List[Tuple[str, int]]] = None):
+                preferred_times: Dict[str, List[Tuple[str, int]]] = None,
+                domains: Dict[Course, List[Tuple[TimeSlot, Room]]] = None,
+                soft_constraints: Optional[SoftConstraints] = None):
         self.courses = courses
         self.timeslots = timeslots
         self.rooms = rooms
         self.instructor_constraints = instructor_constraints
         self.preferred_times = preferred_times or {}
+        # With soft constraints, preferred times are penalties rather than domain filters
+        self.soft_constraints = soft_constraints
         
         # Variables: each course needs to be assigned
         self.variables = courses
         
-        # Domain: each course can be assigned to (timeslot, room) pairs
-        self.domains = self._initialize_domains()
+        # Domain: each course can be assigned to (timeslot, room) pairs.
+        # Domains are read off the vectorized unary mask course by course, on
+        # first use; explicitly given ones (e.g. residual sub-problems) override it
+        self._overrides = dict(domains) if domains else {}
+        self._domains = dict(self._overrides)
+        self._unary_mask = None
+        self._domain_mask = None
+        self._domain_rows = None
+        self._course_index = {course: i for i, course in enumerate(courses)}
+        self._placements = None
+        self._fingerprint = None
+        self._binary_path = None
+    
+    def __reduce_ex__(self, protocol):
+        # Opened with load_binary: pickle the directory, not the masks
+        if self._binary_path is not None:
+            from .binary import load_binary
+            return load_binary, (self._binary_path,)
+        return super().__reduce_ex__(protocol)
+    
+    def fingerprint(self) -> str:
+        """Canonical SHA-256 of the problem, the same under any reordering of its inputs.
+        
+        Covers every course, timeslot and room field, instructor
+        unavailability, preferred times, explicitly given domains and soft
+        constraints; rooms in domains are named by id. Computed once, like
+        the masks: the problem must not be mutated afterwards.
+        """
+        if self._fingerprint is None:
+            course_ids = {c.id for c in self.courses}
+            canonical = (
+                sorted((c.id, c.name, c.instructor, c.duration) for c in self.courses),
+                sorted({(ts.day, ts.period) for ts in self.timeslots}),
+                sorted((r.id, r.capacity, r.type) for r in self.rooms),
+                sorted((name, sorted(set(days))) for name, days in self.instructor_constraints.items() if days),
+                sorted((cid, sorted({tuple(p) for p in prefs}))
+                       for cid, prefs in self.preferred_times.items() if cid in course_ids),
+                sorted((c.id, sorted({(ts.day, ts.period, room.id) for ts, room in domain}))
+                       for c, domain in self._overrides.items())
+            )
+            soft = self.soft_constraints
+            if soft is not None:
+                canonical += ((soft.preference, soft.day_spread, soft.capacity_fit,
+                               sorted((cid, n) for cid, n in soft.enrollment.items() if cid in course_ids)),)
+            self._fingerprint = hashlib.sha256(repr(canonical).encode()).hexdigest()
+        return self._fingerprint
+    
+    @property
+    def domains(self) -> Dict[Course, List[Tuple[TimeSlot, Room]]]:
+        """Every course's domain; materializing them all is O(courses x slots x rooms)"""
+        if len(self._domains) < len(self.courses):
+            self._domains = self._initialize_domains()
+        return self._domains
     
     def _initialize_domains(self) -> Dict[Course, List[Tuple[TimeSlot, Room]]]:
-        domains = {}
-        for course in self.courses:
-            valid_assignments = []
-            for timeslot in self.timeslots:
-                for room in self.rooms:
-                    # Basic domain filtering
-                    if self._is_valid_domain(course, timeslot, room):
-                        valid_assignments.append((timeslot, room))
-            domains[course] = valid_assignments
-        return domains
+        return {course: self.get_domain(course) for course in self.courses}
+    
+    def _course_domain(self, course: Course) -> List[Tuple[TimeSlot, Room]]:
+        placements = self.placements
+        values = np.flatnonzero(self.unary_mask[self._course_index[course]])
+        return [placements[v] for v in values.tolist()]
+    
+    @property
+    def placements(self) -> List[Tuple[TimeSlot, Room]]:
+        """Every (timeslot, room) pair, indexed by value ``slot * len(rooms) + room``.
+        
+        Domains and decoded solutions hold references to these tuples
+        instead of building their own, so a domain costs one pointer per
+        value.
+        """
+        if self._placements is None:
+            self._placements = [(ts, room) for ts in self.timeslots for room in self.rooms]
+        return self._placements
+    
+    @property
+    def unary_mask(self) -> np.ndarray:
+        """Boolean courses x slots x rooms tensor of instructor availability and room type.
+        
+        The broadcast of an instructor x day availability matrix (per
+        course, per slot) with a course x room-type matrix; the same filter
+        as _is_valid_domain without a Python call per triple.
+        """
+        if self._unary_mask is None:
+            instructors = {}
+            course_instructor = np.array([instructors.setdefault(c.instructor, len(instructors))
+                                          for c in self.courses], dtype=np.intp)
+            days = {}
+            slot_day = np.array([days.setdefault(ts.day, len(days)) for ts in self.timeslots],
+                                dtype=np.intp)
+            
+            available = np.ones((len(instructors), len(days)), dtype=bool)
+            for name, i in instructors.items():
+                for day in self.instructor_constraints.get(name, []):
+                    if day in days:
+                        available[i, days[day]] = False
+            
+            # Assume courses with 'Lab' in name need lab rooms
+            needs_lab = np.array(['Lab' in c.name for c in self.courses], dtype=bool)
+            is_lab = np.array([room.type == 'lab' for room in self.rooms], dtype=bool)
+            
+            course_slot = available[course_instructor[:, None], slot_day[None, :]]
+            course_room = ~needs_lab[:, None] | is_lab[None, :]
+            self._unary_mask = course_slot[:, :, None] & course_room[:, None, :]
+        return self._unary_mask
+    
+    @property
+    def domain_mask(self) -> np.ndarray:
+        """Boolean courses x slots x rooms tensor of every course's compiled domain.
+        
+        unary_mask restricted to preferred times (unless they are soft
+        constraints), with explicitly given domains in place of their
+        courses' rows. A problem opened with load_binary unpacks it from
+        domain_rows on first use; paths that only scan it read
+        domain_blocks instead.
+        """
+        if self._domain_mask is None and self._domain_rows is not None:
+            self._domain_mask = _unpack_rows(self._domain_rows, len(self.timeslots), len(self.rooms))
+        if self._domain_mask is None:
+            mask = self.unary_mask.copy()
+            if self._overrides:
+                slot_of = {ts: i for i, ts in enumerate(self.timeslots)}
+                room_of = {room: i for i, room in enumerate(self.rooms)}
+                for course, domain in self._overrides.items():
+                    row = mask[self._course_index[course]]
+                    row[:] = False
+                    for timeslot, room in domain:
+                        row[slot_of[timeslot], room_of[room]] = True
+            if self.preferred_times and self.soft_constraints is None:
+                slot_index = {(ts.day, ts.period): i for i, ts in enumerate(self.timeslots)}
+                for course, i in self._course_index.items():
+                    prefs = self.preferred_times.get(course.id)
+                    if prefs is not None:
+                        preferred = np.zeros(len(self.timeslots), dtype=bool)
+                        preferred[[slot_index[p] for p in prefs if p in slot_index]] = True
+                        mask[i] &= preferred[:, None]
+            self._domain_mask = mask
+        return self._domain_mask
+    
+    @property
+    def domain_rows(self) -> np.ndarray:
+        """domain_mask bit-packed, one row of bytes per course (bit v is value v).
+        
+        A problem opened with load_binary maps these rows read-only from
+        disk: they cost nothing until read, and every process opening the
+        same directory shares them through the page cache.
+        """
+        if self._domain_rows is None:
+            self._domain_rows = _pack_rows(self.domain_mask)
+        return self._domain_rows
+    
+    def domain_blocks(self, size: int = DOMAIN_BLOCK) -> Iterator[np.ndarray]:
+        """domain_mask in consecutive blocks of up to size courses.
+        
+        Without a domain_mask yet, blocks are unpacked from domain_rows one
+        at a time, so scanning a binary-backed problem never holds the whole
+        bool tensor.
+        """
+        if self._domain_mask is None and self._domain_rows is not None:
+            rows = self._domain_rows
+            for start in range(0, len(rows), size):
+                yield _unpack_rows(rows[start:start + size], len(self.timeslots), len(self.rooms))
+            return
+        mask = self.domain_mask
+        for start in range(0, len(mask), size):
+            yield mask[start:start + size]
     
     def _is_valid_domain(self, course: Course, timeslot: TimeSlot, room: Room) -> bool:
         # Check if instructor is available
@@ -85,4 +331,83 @@ class TimetableProblem:
         return True
     
     def get_domain(self, course: Course) -> List[Tuple[TimeSlot, Room]]:
-        return self.domains[course]
\ No newline at end of file
+        domain = self._domains.get(course)
+        if domain is None:
+            domain = self._domains[course] = self._course_domain(course)
+        return domain
+    
+    def subproblem(self, courses: List[Course]) -> 'TimetableProblem':
+        """The problem restricted to courses, sharing slots, rooms, domains and mask rows"""
+        sub = TimetableProblem(courses, self.timeslots, self.rooms, self.instructor_constraints,
+                               self.preferred_times,
+                               domains={c: self._overrides[c] for c in courses if c in self._overrides},
+                               soft_constraints=self.soft_constraints)
+        sub._domains.update((c, self._domains[c]) for c in courses if c in self._domains)
+        sub._placements = self._placements
+        rows = [self._course_index[c] for c in courses]
+        if self._unary_mask is not None:
+            sub._unary_mask = self._unary_mask[rows]
+        if self._domain_mask is not None:
+            sub._domain_mask = self._domain_mask[rows]
+        if self._domain_rows is not None:
+            sub._domain_rows = self._domain_rows[rows]
+        return sub
+    
+    def allows(self, course: Course, timeslot: TimeSlot, room: Room) -> bool:
+        """Unary check of one placement: room exists, domain filter and hard preferred times"""
+        if room not in self.rooms or not self._is_valid_domain(course, timeslot, room):
+            return False
+        prefs = self.preferred_times.get(course.id)
+        return prefs is None or self.soft_constraints is not None or (timeslot.day, timeslot.period) in prefs
+    
+    def apply_changes(self, changes: ChangeSet) -> 'TimetableProblem':
+        """New problem with changes applied, recomputing only the domains they affect.
+        
+        Domains of untouched courses are shared with this problem, so neither
+        problem's domain lists may be mutated afterwards. Explicitly given
+        domains stay explicit: they lose removed rooms and days their
+        instructor becomes unavailable, but never gain values.
+        """
+        removed_courses = set(changes.remove_courses)
+        removed_rooms = set(changes.remove_rooms)
+        courses = [c for c in self.courses if c.id not in removed_courses] + list(changes.add_courses)
+        rooms = [r for r in self.rooms if r.id not in removed_rooms]
+        
+        instructor_constraints = {name: list(days) for name, days in self.instructor_constraints.items()}
+        for name, days in changes.unavailable.items():
+            current = instructor_constraints.setdefault(name, [])
+            current.extend(day for day in days if day not in current)
+        for name, days in changes.available.items():
+            instructor_constraints[name] = [day for day in instructor_constraints.get(name, [])
+                                            if day not in days]
+        
+        preferred_times = {cid: prefs for cid, prefs in self.preferred_times.items()
+                           if cid not in removed_courses}
+        preferred_times.update(changes.preferred_times)
+        
+        # Only the overrides and domains already materialized carry over:
+        # everything else is read off the new problem's vectorized mask
+        changed_instructors = set(changes.unavailable) | set(changes.available)
+        
+        def carried(domains):
+            return {course: ([placement for placement in domain if placement[1].id not in removed_rooms]
+                             if removed_rooms else domain)
+                    for course, domain in domains.items()
+                    if course.id not in removed_courses and course.instructor not in changed_instructors}
+        
+        # Overrides of changed instructors' courses are restrictions the mask
+        # cannot rebuild: filter them by the new availability instead
+        overrides = carried(self._overrides)
+        for course, domain in self._overrides.items():
+            if course.id not in removed_courses and course.instructor in changed_instructors:
+                unavailable = instructor_constraints.get(course.instructor, [])
+                overrides[course] = [placement for placement in domain
+                                     if placement[0].day not in unavailable and placement[1].id not in removed_rooms]
+        
+        updated = TimetableProblem(courses, self.timeslots, rooms, instructor_constraints,
+                                   preferred_times, domains=overrides,
+                                   soft_constraints=self.soft_constraints)
+        if not removed_rooms:
+            # Filtering every cached list would cost more than re-reading the mask
+            updated._domains.update(carried(self._domains))
+        return updated
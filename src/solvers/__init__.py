@@ -2,5 +2,20 @@
 """CSP Solvers"""
 from .backtracking_heuristics import BacktrackingWithHeuristics
 from .backtracking_forward_checking import BacktrackingWithForwardChecking
+from .maintaining_arc_consistency import MaintainingArcConsistency
+from .slot_matching import SlotMatchingSolver
+from .block_forward_checking import BlockForwardChecking
+from .branch_and_bound import BranchAndBoundSolver
+from .portfolio import PortfolioSolver, SolverConfig
+from .local_search import LocalSearchSolver
+from .incremental import IncrementalSolver
+from .decomposition import DecomposedSolver, find_components
+from .instrumentation import Instrumentation
+from .cache import SolutionCache, CachedResult
+from .capacity import CapacityPropagator, capacity_conflict, block_capacity_conflict
 
-__all__ = ['BacktrackingWithHeuristics', 'BacktrackingWithForwardChecking']
+__all__ = ['BacktrackingWithHeuristics', 'BacktrackingWithForwardChecking', 'MaintainingArcConsistency',
+           'SlotMatchingSolver', 'BlockForwardChecking', 'PortfolioSolver', 'SolverConfig', 'LocalSearchSolver',
+           'IncrementalSolver', 'DecomposedSolver', 'find_components', 'Instrumentation',
+           'SolutionCache', 'CachedResult', 'CapacityPropagator', 'capacity_conflict',
+           'block_capacity_conflict', 'BranchAndBoundSolver']
@@ -1,120 +1,169 @@
 from typing import Dict, Tuple, List, Optional
 from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
-from ..models.constraints import ConstraintChecker
+from .domains import popcount
+from .lcv import ContentionCounters
+from .search import BacktrackingSearch
+from .instrumentation import Instrumentation
+from .cache import SolutionCache
 import time
 
-class BacktrackingWithHeuristics:
-    def __init__(self, problem: TimetableProblem):
+LCV_MODES = ('exact', 'approx')
+
+class BacktrackingWithHeuristics(BacktrackingSearch):
+    def __init__(self, problem: TimetableProblem, lcv: str = 'exact',
+                 seed: Optional[int] = None, restarts: Optional[str] = None,
+                 restart_base: int = 100, backjumping: bool = False,
+                 symmetry_breaking: bool = True, capacity_pruning: bool = True):
+        """
+        lcv: 'exact' counts the values each candidate removes from other
+        courses; 'approx' scores it in O(1) from incremental contention counters
+        seed: if given, MRV and LCV ties are broken randomly (reproducibly)
+        restarts: 'luby' or 'geometric' restarts the search after a node
+        limit of restart_base times the next term of that schedule
+        backjumping: on dead ends, jump back to the latest assignment that
+        caused the conflict and remember the culprits as a nogood
+        symmetry_breaking: try one value per class of interchangeable rooms
+        (and of still-empty interchangeable slots) at each decision
+        capacity_pruning: reject pigeonhole-infeasible problems before search
+        and count rooms and instructor slots left at every node
+        """
+        if lcv not in LCV_MODES:
+            raise ValueError(f"lcv must be one of {LCV_MODES}, got {lcv!r}")
+        self._set_restarts(restarts, restart_base)
         self.problem = problem
+        self.lcv = lcv
+        self.seed = seed
+        self.symmetry_breaking = symmetry_breaking
+        self.capacity_pruning = capacity_pruning
+        self.backjumping = backjumping
+        self.instrumentation = None
+        self.compiled = None
+        self.domains = None
+        self.queue = None
+        self.counters = None
         self.nodes_explored = 0
         self.backtracks = 0
         self.start_time = 0
         self.end_time = 0
     
-    def solve(self) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+    def solve(self, stop_event=None, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None,
+              instrumentation: Optional[Instrumentation] = None,
+              cache: Optional[SolutionCache] = None) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
         """Solve using backtracking with MRV and LCV heuristics"""
         self.nodes_explored = 0
         self.backtracks = 0
+        self.instrumentation = instrumentation
         self.start_time = time.time()
+        cached = self._cached(cache)
+        if cached is not None:
+            return cached
         
-        assignment = {}
-        result = self._backtrack(assignment)
+        # Search runs on integer ids; results are decoded once at the end.
+        # Remaining-value counts: live domains pruned on every assignment,
+        # with sizes fed into the MRV priority queue as they change
+        result = self._run(self._compile(), stop_event, timeout, max_nodes)
         
         self.end_time = time.time()
         
-        metrics = {
-            'nodes_explored': self.nodes_explored,
-            'backtracks': self.backtracks,
-            'time_taken': self.end_time - self.start_time,
-            'success': result is not None
-        }
+        metrics = self._metrics(result is not None)
         
-        return result, metrics
+        solution = self.compiled.decode(result)
+        self._store(cache, solution, metrics)
+        return solution, metrics
     
-    def _backtrack(self, assignment: Dict[Course, Tuple[TimeSlot, Room]]) -> Optional[Dict]:
-        """Recursive backtracking with heuristics"""
-        
-        if ConstraintChecker.is_complete(self.problem, assignment):
-            return assignment
-        
+    def _prepare(self) -> bool:
+        # Reset every run: instrumentation may wrap it for the run
+        self.count_constraints = self._count_constraints
+        self.counters = None
+        if self.lcv == 'approx':
+            self.counters = ContentionCounters(self.compiled, self.domains.bits)
+            self.domains.on_remove = self.counters.discard
+            self.domains.on_restore = self.counters.add
+        return True
+    
+    def _instrument(self, instrumentation):
+        super()._instrument(instrumentation)
+        if self.counters is not None:
+            self.counters.score = instrumentation.counted('contention_score', self.counters.score)
+        else:
+            self.count_constraints = instrumentation.counted('count_constraints', self.count_constraints)
+    
+    def _select_variable(self, assignment: Dict[int, int]) -> int:
         # Variable ordering: Minimum Remaining Values (MRV)
-        course = self._select_unassigned_variable_mrv(assignment)
-        self.nodes_explored += 1
-        
+        return self._select_unassigned_variable_mrv(assignment)
+    
+    def _order_values(self, course: int, assignment: Dict[int, int]) -> List[int]:
         # Value ordering: Least Constraining Value (LCV)
-        ordered_values = self._order_domain_values_lcv(course, assignment)
-        
-        for timeslot, room in ordered_values:
-            if ConstraintChecker.check_all_constraints(self.problem, assignment, 
-                                                      course, timeslot, room):
-                assignment[course] = (timeslot, room)
-                
-                result = self._backtrack(assignment)
-                if result is not None:
-                    return result
-                
-                # Backtrack
-                del assignment[course]
-                self.backtracks += 1
-        
-        return None
+        return self._order_domain_values_lcv(course, assignment)
     
-    def _select_unassigned_variable_mrv(self, assignment: Dict) -> Course:
-        """Select variable with Minimum Remaining Values"""
-        unassigned = [c for c in self.problem.variables if c not in assignment]
-        
-        # Count valid values for each unassigned course
-        min_values = float('inf')
-        selected_course = None
-        
-        for course in unassigned:
-            valid_count = 0
-            for timeslot, room in self.problem.get_domain(course):
-                if ConstraintChecker.check_all_constraints(self.problem, assignment,
-                                                          course, timeslot, room):
-                    valid_count += 1
-            
-            if valid_count < min_values:
-                min_values = valid_count
-                selected_course = course
-        
-        return selected_course if selected_course else unassigned[0]
+    def _enter(self, course: int):
+        super()._enter(course)
+        if self.counters is not None:
+            self.counters.discard(course, self.domains.bits[course])
+    
+    def _leave(self, course: int):
+        if self.counters is not None:
+            self.counters.add(course, self.domains.bits[course])
+        super()._leave(course)
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Keep remaining-value counts current after course := value.
+        
+        Never fails here: a course left with no values is selected next by
+        MRV and fails immediately.
+        """
+        self.domains.prune_conflicts(course, value, assignment, stop_on_wipeout=False)
+        return True
+    
+    def _select_unassigned_variable_mrv(self, assignment: Dict[int, int]) -> int:
+        """Select variable with Minimum Remaining Values (ties: highest degree)"""
+        return self.queue.select()
     
-    def _order_domain_values_lcv(self, course: Course, 
-                                 assignment: Dict) -> List[Tuple[TimeSlot, Room]]:
+    def _order_domain_values_lcv(self, course: int,
+                                 assignment: Dict[int, int]) -> List[int]:
         """Order domain values by Least Constraining Value"""
-        domain = self.problem.get_domain(course)
-        
-        # Filter valid values
-        valid_values = [(ts, r) for ts, r in domain 
-                       if ConstraintChecker.check_all_constraints(self.problem, assignment,
-                                                                 course, ts, r)]
+        # Live values are exactly those consistent with the assignment
+        valid_values = list(self.domains.values(course))
         
         # Count constraints imposed by each value
         value_constraints = []
-        for timeslot, room in valid_values:
-            constraints_count = self._count_constraints(course, timeslot, room, assignment)
-            value_constraints.append(((timeslot, room), constraints_count))
-        
-        # Sort by least constraining (lowest count)
-        value_constraints.sort(key=lambda x: x[1])
+        if self.counters is not None:
+            for value in valid_values:
+                value_constraints.append((value, self.counters.score(course, value)))
+        else:
+            for value in valid_values:
+                constraints_count = self.count_constraints(course, value, assignment)
+                value_constraints.append((value, constraints_count))
+        
+        # Sort by least constraining (lowest count), ties at random if seeded
+        if self.rng is not None:
+            rng = self.rng
+            value_constraints.sort(key=lambda x: (x[1], rng.random()))
+        else:
+            value_constraints.sort(key=lambda x: x[1])
         
         return [val for val, _ in value_constraints]
     
-    def _count_constraints(self, course: Course, timeslot: TimeSlot, 
-                          room: Room, assignment: Dict) -> int:
+    def _count_constraints(self, course: int, value: int,
+                           assignment: Dict[int, int]) -> int:
         """Count how many future assignments this value would constrain"""
+        compiled = self.compiled
+        slot = value // compiled.num_rooms
+        room_bit = 1 << value
+        slot_mask = compiled.slot_masks[slot]
+        instructor = compiled.course_instructor[course]
+        bits = self.domains.bits
         count = 0
-        unassigned = [c for c in self.problem.variables if c not in assignment and c != course]
-        
-        # Temporarily assign
-        temp_assignment = assignment.copy()
-        temp_assignment[course] = (timeslot, room)
-        
-        for other_course in unassigned:
-            for other_ts, other_room in self.problem.get_domain(other_course):
-                if not ConstraintChecker.check_all_constraints(self.problem, temp_assignment,
-                                                              other_course, other_ts, other_room):
-                    count += 1
         
-        return count
\ No newline at end of file
+        # Values already ruled out add the same amount to every candidate,
+        # so only live values this assignment would remove are counted
+        for other in compiled.slot_courses[slot]:
+            if other == course or other in assignment:
+                continue
+            if compiled.course_instructor[other] == instructor:
+                count += popcount(bits[other] & slot_mask)
+            elif bits[other] & room_bit:
+                count += 1
+        
+        return count
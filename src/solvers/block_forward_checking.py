@@ -0,0 +1,144 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from ..models.blocks import CompiledBlocks
+from .search import BacktrackingSearch
+from .capacity import block_capacity_conflict, capacity_conflict
+from .instrumentation import Instrumentation
+import time
+
+class BlockForwardChecking(BacktrackingSearch):
+    """Forward checking where each course takes a whole week's block of periods at once.
+    
+    A course with duration hours meets duration / session_length times a
+    week on distinct days, in one room, session_length consecutive periods
+    each; every such block is a single value of the course's variable (see
+    CompiledBlocks). After a placement, the courses whose blocks overlap it
+    lose the overlapping blocks in that room, or every overlapping block
+    if they share the instructor: two bitset operations per course.
+    
+    Solutions map each course to its list of (timeslot, room) periods.
+    Before search, capacity pruning checks the one-period relaxation (any
+    one period per course of a block timetable is a one-period
+    timetable) and then block_capacity_conflict(); the counts during
+    search are per slot, so they are off.
+    """
+    
+    CAPACITY_PROPAGATION = False
+    
+    def __init__(self, problem: TimetableProblem, session_length: Optional[int] = 1,
+                 session_lengths: Optional[Dict[str, Optional[int]]] = None,
+                 seed: Optional[int] = None, restarts: Optional[str] = None, restart_base: int = 100,
+                 backjumping: bool = False, symmetry_breaking: bool = True,
+                 capacity_pruning: bool = True):
+        """
+        session_length: periods per session, sessions on distinct days at the
+        same period; None schedules each course as one contiguous block
+        session_lengths: course id -> session_length, overriding the default
+        seed: if given, values and MRV ties are tried in a random (reproducible) order
+        restarts: 'luby' or 'geometric' restarts the search after a node
+        limit of restart_base times the next term of that schedule
+        backjumping: on dead ends, jump back to the latest assignment that
+        caused the conflict and remember the culprits as a nogood
+        symmetry_breaking: try one value per class of interchangeable rooms
+        that nothing uses yet at each decision
+        capacity_pruning: reject problems whose periods or blocks are
+        pigeonhole-infeasible before search
+        """
+        self._set_restarts(restarts, restart_base)
+        self.problem = problem
+        self.session_length = session_length
+        self.session_lengths = session_lengths
+        self.seed = seed
+        self.symmetry_breaking = symmetry_breaking
+        self.capacity_pruning = capacity_pruning
+        self.backjumping = backjumping
+        self.instrumentation = None
+        self.compiled = None
+        self.domains = None
+        self.queue = None
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, stop_event=None, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None,
+              instrumentation: Optional[Instrumentation] = None) -> Tuple[Optional[Dict[Course, List[Tuple[TimeSlot, Room]]]], Dict]:
+        """Solve using forward checking over block values"""
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.instrumentation = instrumentation
+        self.start_time = time.time()
+        
+        result = self._run(self._compile(), stop_event, timeout, max_nodes)
+        
+        self.end_time = time.time()
+        
+        metrics = {
+            'nodes_explored': self.nodes_explored,
+            'backtracks': self.backtracks,
+            'pruned_values': self.pruned_values,
+            'time_taken': self.end_time - self.start_time,
+            'success': result is not None,
+            'block_patterns': self.compiled.num_patterns
+        }
+        metrics.update(self._search_stats())
+        
+        return self.compiled.decode(result), metrics
+    
+    def _compile(self) -> CompiledBlocks:
+        """CompiledBlocks for self.problem, timed as the compile phase if instrumented"""
+        if self.instrumentation is None:
+            return CompiledBlocks(self.problem, self.session_length, self.session_lengths)
+        with self.instrumentation.phase('compile'):
+            return CompiledBlocks(self.problem, self.session_length, self.session_lengths)
+    
+    def _capacity_conflict(self, compiled: CompiledBlocks) -> Optional[str]:
+        return capacity_conflict(compiled.problem) or block_capacity_conflict(compiled)
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Forward checking after course := value; False on domain wipeout"""
+        compiled = self.compiled
+        domains = self.domains
+        sizes = domains.sizes
+        course_instructor = compiled.course_instructor
+        pattern, room = divmod(value, compiled.num_rooms)
+        overlap = compiled.overlap[pattern]
+        room_overlap = overlap & compiled.room_values[room]
+        instructor = course_instructor[course]
+        
+        # Only courses with a block overlapping this one can lose anything
+        for other in compiled.pattern_courses[pattern]:
+            if other in assignment:
+                continue
+            removed = domains.remove(other, overlap if course_instructor[other] == instructor else room_overlap)
+            if removed:
+                self.pruned_values += removed
+                if sizes[other] == 0:
+                    return False
+        return True
+    
+    def _distinct_values(self, values: Iterable[int], assignment: Dict[int, int]) -> Iterable[int]:
+        """values with only the first block per room class among rooms nothing uses yet.
+        
+        Rooms of one class that are empty all week can be swapped
+        everywhere without changing the assignment. A room in use can
+        not: part of a block could clash there while the rest is free.
+        """
+        num_rooms = self.compiled.num_rooms
+        room_class = self.compiled.room_class
+        used_rooms = {value % num_rooms for value in assignment.values()}
+        tried = set()
+        for value in values:
+            pattern, room = divmod(value, num_rooms)
+            if room in used_rooms:
+                yield value
+                continue
+            key = (pattern, room_class[room])
+            if key in tried:
+                self.symmetric_skips += 1
+                continue
+            tried.add(key)
+            yield value
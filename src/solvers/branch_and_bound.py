@@ -0,0 +1,288 @@
+import time
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem, SoftConstraints
+from ..models.constraints import ConstraintChecker
+from .domains import iter_bits
+from .search import BacktrackingSearch
+from .instrumentation import Instrumentation
+
+# Slack for float rounding when comparing a bound with the incumbent's cost
+EPSILON = 1e-9
+
+Solution = Dict[Course, Tuple[TimeSlot, Room]]
+
+class BranchAndBoundSolver(BacktrackingSearch):
+    """Depth-first branch and bound over problem.soft_constraints.
+    
+    Hard constraints are forward checked as usual, and preferred times are
+    penalties, so instances that are infeasible with hard preferences get a
+    timetable. Each complete assignment cheaper than the best so far becomes
+    the new incumbent, and search goes on for a cheaper one. It ends when the
+    tree is exhausted (the incumbent is optimal) or a budget runs out (the
+    incumbent is the best found).
+    
+    The cost of the partial assignment is kept incrementally, per
+    placement. Each unassigned course adds the cheapest preference and
+    capacity-fit cost among its live values, which is admissible: pruning
+    only removes values, and day spread never shrinks as courses are
+    added. A branch whose cost plus that bound reaches the incumbent's is
+    cut. Values are tried cheapest first, counting the extra day their
+    instructor would need.
+    
+    Objective-specific pruning has no conflict set to jump back on, and
+    interchangeable rooms or slots may differ in cost, so this solver
+    backtracks chronologically without symmetry breaking.
+    """
+    
+    def __init__(self, problem: TimetableProblem, seed: Optional[int] = None,
+                 restarts: Optional[str] = None, restart_base: int = 100,
+                 capacity_pruning: bool = True):
+        """
+        seed: if given, equal-cost values and MRV ties are tried in a random (reproducible) order
+        restarts: 'luby' or 'geometric' restarts the search after a node
+        limit of restart_base times the next term of that schedule; the
+        incumbent carries over between runs
+        capacity_pruning: reject pigeonhole-infeasible problems before search
+        and count rooms and instructor slots left at every node
+        """
+        self._set_restarts(restarts, restart_base)
+        self.problem = problem
+        self.seed = seed
+        self.symmetry_breaking = False
+        self.capacity_pruning = capacity_pruning
+        self.backjumping = False
+        self.instrumentation = None
+        self.compiled = None
+        self.domains = None
+        self.queue = None
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.bound_prunes = 0
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, stop_event=None, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None,
+              instrumentation: Optional[Instrumentation] = None,
+              on_solution: Optional[Callable[[Solution, float], None]] = None) -> Tuple[Optional[Solution], Dict]:
+        """Search for the cheapest timetable; returns the best one found.
+        
+        on_solution is called with each improving timetable and its cost
+        as soon as it is found, so a caller can use good timetables before
+        search ends.
+        """
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.bound_prunes = 0
+        self.instrumentation = instrumentation
+        self.on_solution = on_solution
+        self.start_time = time.time()
+        
+        self.best = None
+        self.best_cost = float('inf')
+        self.improvements: List[Tuple[float, float]] = []
+        compiled = self._compile()
+        self._costs(compiled)
+        self._run(compiled, stop_event, timeout, max_nodes)
+        
+        self.end_time = time.time()
+        
+        solution = compiled.decode(self.best)
+        finished = not (self.budget_exhausted or self.stopped)
+        metrics = {
+            'nodes_explored': self.nodes_explored,
+            'backtracks': self.backtracks,
+            'pruned_values': self.pruned_values,
+            'time_taken': self.end_time - self.start_time,
+            'success': solution is not None,
+            'cost': self.best_cost if solution is not None else None,
+            'optimal': solution is not None and finished,
+            'penalties': ConstraintChecker.soft_penalties(self.problem, solution) if solution is not None else None,
+            'solutions_found': len(self.improvements),
+            'improvements': self.improvements,
+            'bound_prunes': self.bound_prunes
+        }
+        metrics.update(self._search_stats())
+        return solution, metrics
+    
+    def _costs(self, compiled):
+        """Per-value penalties from the soft constraints, fixed for the whole solve"""
+        problem = self.problem
+        soft = problem.soft_constraints or SoftConstraints()
+        num_rooms = compiled.num_rooms
+        
+        days = {}
+        self.slot_day = [days.setdefault(ts.day, len(days)) for ts in compiled.timeslots]
+        self.num_days = len(days)
+        self.day_masks = [0] * self.num_days
+        for slot, day in enumerate(self.slot_day):
+            self.day_masks[day] |= compiled.slot_masks[slot]
+        self.spread = soft.day_spread
+        
+        # slot_cost[c][s]: preference penalty; room_cost[c][r]: capacity-fit penalty
+        slot_of = {(ts.day, ts.period): s for s, ts in enumerate(compiled.timeslots)}
+        slot_cost = np.zeros((compiled.num_courses, compiled.num_slots))
+        room_cost = np.zeros((compiled.num_courses, num_rooms))
+        capacities = np.array([room.capacity for room in compiled.rooms], dtype=float)
+        for c, course in enumerate(compiled.courses):
+            prefs = problem.preferred_times.get(course.id)
+            if prefs is not None and soft.preference:
+                slot_cost[c] = soft.preference
+                slot_cost[c, [slot_of[tuple(p)] for p in prefs if tuple(p) in slot_of]] = 0
+            enrollment = soft.enrollment.get(course.id)
+            if enrollment is not None and soft.capacity_fit:
+                room_cost[c] = soft.capacity_fit * np.abs(capacities - enrollment)
+        self.slot_cost = slot_cost.tolist()
+        self.room_cost = room_cost.tolist()
+        
+        # levels[c]: (cost, live-value mask) pairs by ascending cost, partitioning c's domain
+        self.levels: List[List[Tuple[float, int]]] = []
+        for c in range(compiled.num_courses):
+            domain = compiled.domain_bits[c]
+            if not slot_cost[c].any() and not room_cost[c].any():
+                self.levels.append([(0.0, domain)])
+                continue
+            costs = (slot_cost[c][:, None] + room_cost[c][None, :]).ravel()
+            values = np.asarray(compiled.domains[c], dtype=np.intp)
+            levels = []
+            for cost in np.unique(costs[values]).tolist():
+                chosen = np.zeros(compiled.num_values, dtype=bool)
+                chosen[values[costs[values] == cost]] = True
+                packed = np.packbits(chosen, bitorder='little')
+                levels.append((cost, int.from_bytes(packed.tobytes(), 'little')))
+            self.levels.append(levels)
+    
+    def _prepare(self) -> bool:
+        # The partial assignment's cost, as (course, value, cost added) per placement in order
+        compiled = self.compiled
+        self.placed: List[Tuple[int, int, float]] = []
+        self.is_placed = bytearray(compiled.num_courses)
+        self.cost = 0.0
+        self.day_count = [0] * (compiled.num_instructors * self.num_days)
+        self.days_used = [0] * compiled.num_instructors
+        self.used_day_values = [0] * compiled.num_instructors
+        
+        # Cheapest live value per course; remaining sums it over courses not placed
+        bits = self.domains.bits
+        self.min_live = [self._min_cost(c, bits[c]) for c in range(compiled.num_courses)]
+        self.remaining = sum(self.min_live)
+        self.domains.on_remove = self._domain_changed
+        self.domains.on_restore = self._domain_changed
+        return True
+    
+    def _min_cost(self, course: int, bits: int) -> float:
+        for cost, mask in self.levels[course]:
+            if bits & mask:
+                return cost
+        return 0.0
+    
+    def _domain_changed(self, course: int, changed: int):
+        """Keep course's cheapest live value, and the bound, current"""
+        cost = self._min_cost(course, self.domains.bits[course])
+        if not self.is_placed[course]:
+            self.remaining += cost - self.min_live[course]
+        self.min_live[course] = cost
+    
+    def _place(self, course: int, value: int):
+        slot, room = divmod(value, self.compiled.num_rooms)
+        instructor = self.compiled.course_instructor[course]
+        day = self.slot_day[slot]
+        key = instructor * self.num_days + day
+        cost = self.slot_cost[course][slot] + self.room_cost[course][room]
+        if not self.day_count[key]:
+            if self.days_used[instructor]:
+                cost += self.spread
+            self.days_used[instructor] += 1
+            self.used_day_values[instructor] |= self.day_masks[day]
+        self.day_count[key] += 1
+        self.cost += cost
+        self.placed.append((course, value, cost))
+        self.is_placed[course] = 1
+        self.remaining -= self.min_live[course]
+    
+    def _retract(self):
+        course, value, cost = self.placed.pop()
+        instructor = self.compiled.course_instructor[course]
+        day = self.slot_day[value // self.compiled.num_rooms]
+        key = instructor * self.num_days + day
+        self.day_count[key] -= 1
+        if not self.day_count[key]:
+            self.days_used[instructor] -= 1
+            self.used_day_values[instructor] &= ~self.day_masks[day]
+        self.cost -= cost
+        self.is_placed[course] = 0
+        self.remaining += self.min_live[course]
+    
+    def _sync(self, course: int, assignment: Dict[int, int]):
+        """Retract placements search has undone since the last call.
+        
+        Search unassigns in reverse order of assignment, so those are
+        exactly the top of the placement stack, down to the first entry
+        still assigned the same value (course itself is being reassigned).
+        """
+        placed = self.placed
+        while placed:
+            other, value, _ = placed[-1]
+            if other != course and assignment.get(other) == value:
+                break
+            self._retract()
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Forward check course := value, then cut the branch if it cannot beat the incumbent"""
+        self._sync(course, assignment)
+        self._place(course, value)
+        removed, wipeout = self.domains.prune_conflicts(course, value, assignment)
+        self.pruned_values += removed
+        if wipeout:
+            return False
+        if self.cost + self.remaining >= self.best_cost - EPSILON:
+            self.bound_prunes += 1
+            return False
+        if len(assignment) == self.compiled.num_courses:
+            self._improve(assignment)
+            # Keep searching for a cheaper one
+            return False
+        return True
+    
+    def _improve(self, assignment: Dict[int, int]):
+        """Record a complete assignment cheaper than the incumbent"""
+        self.best = dict(assignment)
+        self.best_cost = sum(cost for _, _, cost in self.placed)
+        self.improvements.append((time.time() - self.start_time, self.best_cost))
+        if self.on_solution is not None:
+            self.on_solution(self.compiled.decode(self.best), self.best_cost)
+    
+    def _order_values(self, course: int, assignment: Dict[int, int]) -> Iterator[int]:
+        """Live values by ascending added cost, stopping where the bound reaches the incumbent"""
+        live = self.domains.bits[course]
+        instructor = self.compiled.course_instructor[course]
+        extra = self.spread if self.days_used[instructor] else 0.0
+        near = self.used_day_values[instructor]
+        groups = []
+        for cost, mask in self.levels[course]:
+            part = live & mask
+            if not part:
+                continue
+            if extra and part & ~near:
+                groups.append((cost, part & near))
+                groups.append((cost + extra, part & ~near))
+            else:
+                groups.append((cost, part))
+        groups.sort(key=itemgetter(0))
+        return self._expand(groups, self.cost + self.remaining - self.min_live[course])
+    
+    def _expand(self, groups: List[Tuple[float, int]], base: float) -> Iterator[int]:
+        for cost, bits in groups:
+            values = list(iter_bits(bits))
+            if self.rng is not None:
+                self.rng.shuffle(values)
+            for value in values:
+                # Re-read: the incumbent improves while this node's values are tried
+                if base + cost >= self.best_cost - EPSILON:
+                    self.bound_prunes += 1
+                    return
+                yield value
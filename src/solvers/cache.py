@@ -0,0 +1,142 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+
+Solution = Dict[Course, Tuple[TimeSlot, Room]]
+
+class CachedResult(NamedTuple):
+    """A cache hit: the stored timetable, or None if the problem was proved infeasible"""
+    solution: Optional[Solution]
+    
+    @property
+    def feasible(self) -> bool:
+        return self.solution is not None
+
+class SolutionCache:
+    """On-disk LRU cache of timetables and infeasibility proofs.
+    
+    Entries are keyed by TimetableProblem.fingerprint(), so a problem
+    that only reorders the courses, slots or rooms of a cached one hits
+    too. Each entry is one JSON file naming courses, slots and rooms by
+    id and (day, period), decoded onto the asking problem's own objects.
+    Entries read in this process stay in memory, so repeated hits cost a
+    dict lookup and the decode. The first lookup of a problem object also
+    computes its fingerprint, a sort and SHA-256 of the whole problem
+    (milliseconds at thousands of courses); it is cached on the problem
+    afterwards, and problems opened with load_binary read it from disk.
+    
+    When the files exceed max_bytes, the least recently used entries are
+    deleted. Recency is the file's modification time, so it carries over
+    between processes sharing the directory.
+    """
+    
+    SUFFIX = '.json'
+    
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        
+        # key -> file size, least recently used first
+        self.sizes: OrderedDict = OrderedDict()
+        self.total_bytes = 0
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(self.SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.sizes[key] = size
+            self.total_bytes += size
+        self.memory: Dict[str, Optional[List]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.sizes)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+    
+    def get(self, problem: TimetableProblem) -> Optional[CachedResult]:
+        """The cached result for problem, or None on a miss"""
+        key = problem.fingerprint()
+        if key in self.memory:
+            placements = self.memory[key]
+        else:
+            try:
+                with open(self._path(key)) as f:
+                    placements = json.load(f)['solution']
+            except (OSError, ValueError, KeyError):
+                # Missing, or cut short by a crash mid-write elsewhere
+                self._forget(key)
+                self.misses += 1
+                return None
+            self.memory[key] = placements
+            if key not in self.sizes:
+                # Written by another process since this cache was opened
+                self.sizes[key] = os.path.getsize(self._path(key))
+                self.total_bytes += self.sizes[key]
+        
+        self.sizes.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        self.hits += 1
+        if placements is None:
+            return CachedResult(None)
+        
+        courses = {c.id: c for c in problem.courses}
+        timeslots = {(ts.day, ts.period): ts for ts in problem.timeslots}
+        rooms = {room.id: room for room in problem.rooms}
+        return CachedResult({courses[cid]: (timeslots[(day, period)], rooms[rid])
+                             for cid, day, period, rid in placements})
+    
+    def put(self, problem: TimetableProblem, solution: Optional[Solution]):
+        """Store problem's timetable, or None once search has proved it infeasible"""
+        key = problem.fingerprint()
+        placements = None
+        if solution is not None:
+            placements = sorted([course.id, ts.day, ts.period, room.id]
+                                for course, (ts, room) in solution.items())
+        
+        # Write then rename, so readers never see a partial file
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'fingerprint': key, 'solution': placements}, f)
+        os.replace(temporary, path)
+        
+        self.total_bytes -= self.sizes.pop(key, 0)
+        self.sizes[key] = os.path.getsize(path)
+        self.total_bytes += self.sizes[key]
+        self.memory[key] = placements
+        self._evict()
+    
+    def _evict(self):
+        """Delete least recently used entries until the files fit in max_bytes"""
+        while self.total_bytes > self.max_bytes and len(self.sizes) > 1:
+            key = next(iter(self.sizes))
+            self._forget(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+    
+    def _forget(self, key: str):
+        self.total_bytes -= self.sizes.pop(key, 0)
+        self.memory.pop(key, None)
+    
+    def clear(self):
+        """Delete every entry"""
+        for key in list(self.sizes):
+            self._forget(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
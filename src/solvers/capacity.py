@@ -0,0 +1,256 @@
+from typing import Dict, List, Optional, Set
+import numpy as np
+from ..models.timetable import TimetableProblem
+from ..models.compiled import CompiledProblem
+from ..models.blocks import CompiledBlocks
+from .domains import BitsetDomains, iter_bits, popcount
+
+def capacity_conflict(problem: TimetableProblem) -> Optional[str]:
+    """Static pigeonhole check of problem's domains; why it is infeasible, or None.
+    
+    Catches a course with no possible value, more courses than distinct
+    (slot, room) values, more courses that can only meet in one slot than
+    rooms they fit in there, and an instructor whose courses cannot all
+    get different slots (checked exactly, by matching courses to slots).
+    Vectorized over problem.domain_blocks, so it runs before compiling and
+    never unpacks a binary-backed mask whole.
+    """
+    courses = problem.courses
+    if not courses:
+        return None
+    num_slots, num_rooms = len(problem.timeslots), len(problem.rooms)
+    has_slot = np.zeros((len(courses), num_slots), dtype=bool)
+    usable = np.zeros((num_slots, num_rooms), dtype=bool)
+    # confined_rooms[s]: rooms open to courses that can only meet in slot s
+    confined_rooms = np.zeros((num_slots, num_rooms), dtype=bool)
+    start = 0
+    for block in problem.domain_blocks():
+        block_slots = block.any(axis=2)
+        has_slot[start:start + len(block)] = block_slots
+        usable |= block.any(axis=0)
+        for i in np.flatnonzero(block_slots.sum(axis=1) == 1).tolist():
+            slot = int(block_slots[i].argmax())
+            confined_rooms[slot] |= block[i, slot]
+        start += len(block)
+    slot_counts = has_slot.sum(axis=1)
+    
+    empty = np.flatnonzero(slot_counts == 0)
+    if len(empty):
+        return f"{courses[empty[0]].id} has no possible (timeslot, room)"
+    
+    values = int(usable.sum())
+    if len(courses) > values:
+        return f"{len(courses)} courses for {values} usable (timeslot, room) pairs"
+    
+    only_slot = has_slot.argmax(axis=1)
+    confined = slot_counts == 1
+    for slot in np.unique(only_slot[confined]).tolist():
+        count = int((confined & (only_slot == slot)).sum())
+        rooms = int(confined_rooms[slot].sum())
+        if count > rooms:
+            return (f"{count} courses can only be held at {problem.timeslots[slot]}, "
+                    f"which has {rooms} suitable rooms")
+    
+    by_instructor: Dict[str, List[int]] = {}
+    for i, course in enumerate(courses):
+        by_instructor.setdefault(course.instructor, []).append(i)
+    for instructor, members in by_instructor.items():
+        if len(members) < 2:
+            continue
+        slots = [np.flatnonzero(has_slot[i]).tolist() for i in members]
+        matched = _max_matching(slots)
+        if matched < len(members):
+            return (f"{instructor} teaches {len(members)} courses but at most {matched} "
+                    f"of them can get different timeslots")
+    return None
+
+def _max_matching(options: List[List[int]]) -> int:
+    """Size of a maximum matching of items to their options (augmenting paths)"""
+    owner: Dict[int, int] = {}
+    
+    def augment(item: int, seen: Set[int]) -> bool:
+        for option in options[item]:
+            if option not in seen:
+                seen.add(option)
+                if option not in owner or augment(owner[option], seen):
+                    owner[option] = item
+                    return True
+        return False
+    
+    return sum(1 for item in range(len(options)) if augment(item, set()))
+
+class CapacityPropagator:
+    """Pigeonhole propagation on live bitset domains, after each assignment's own propagation.
+    
+    Two counting rules, re-checked only where domains changed:
+    
+    - slot: unassigned courses whose values all lie in one slot need that
+      many distinct rooms there. Fewer is a dead end; exactly as many
+      means no other course can have those rooms at that slot.
+    - instructor: an instructor's unassigned courses need distinct slots.
+      More courses than slots in their union is a dead end, and a course
+      left with one slot takes it from the instructor's other courses.
+    
+    Assumes domains lose each room (and, for its instructor, each slot) as
+    soon as it is used, as forward checking and MAC do.
+    """
+    
+    def __init__(self, compiled: CompiledProblem, domains: BitsetDomains):
+        self.compiled = compiled
+        self.domains = domains
+        self.failures = 0
+        self.pruned = 0
+    
+    def _slot_count(self, bits: int) -> int:
+        """Number of slots with a live value in bits"""
+        slot_masks = self.compiled.slot_masks
+        num_rooms = self.compiled.num_rooms
+        count = 0
+        while bits:
+            count += 1
+            bits &= ~slot_masks[((bits & -bits).bit_length() - 1) // num_rooms]
+        return count
+    
+    def _only_slot(self, course: int) -> Optional[int]:
+        """The slot course's live values all lie in, if there is exactly one"""
+        bits = self.domains.bits[course]
+        if not bits:
+            return None
+        slot = ((bits & -bits).bit_length() - 1) // self.compiled.num_rooms
+        return slot if not bits & ~self.compiled.slot_masks[slot] else None
+    
+    def propagate(self, mark: int, assignment: Dict[int, int]) -> bool:
+        """Apply both rules to the courses changed since trail position mark; False on a dead end"""
+        compiled = self.compiled
+        domains = self.domains
+        bits = domains.bits
+        slot_masks = compiled.slot_masks
+        course_instructor = compiled.course_instructor
+        num_rooms = compiled.num_rooms
+        trail = domains.trail
+        
+        slots: Set[int] = set()
+        instructors: Set[int] = set()
+        
+        def note(course: int, removed: int):
+            """Queue the rules a removal can have tightened"""
+            only = self._only_slot(course)
+            if only is not None:
+                slots.add(only)
+            # The instructor rule only sees slots, so it cares when one empties
+            slot_mask = slot_masks[((removed & -removed).bit_length() - 1) // num_rooms]
+            if removed & ~slot_mask or not bits[course] & slot_mask:
+                instructors.add(course_instructor[course])
+        
+        for i in range(mark, len(trail)):
+            course, removed, _ = trail[i]
+            if course not in assignment:
+                note(course, removed)
+        
+        while slots or instructors:
+            if slots:
+                slot = slots.pop()
+                slot_mask = slot_masks[slot]
+                held = []
+                rooms = 0
+                for course in compiled.slot_courses[slot]:
+                    if course not in assignment and bits[course] and not bits[course] & ~slot_mask:
+                        held.append(course)
+                        rooms |= bits[course]
+                free = popcount(rooms)
+                if len(held) > free:
+                    self.failures += 1
+                    return False
+                if len(held) < free:
+                    continue
+                # Tight: those rooms at this slot all go to the held courses
+                for course in compiled.slot_courses[slot]:
+                    if course in assignment or not bits[course] & rooms or not bits[course] & ~slot_mask:
+                        continue
+                    before = bits[course]
+                    removed = domains.remove(course, rooms)
+                    self.pruned += removed
+                    if not bits[course]:
+                        self.failures += 1
+                        return False
+                    note(course, before & rooms)
+            else:
+                instructor = instructors.pop()
+                members = [c for c in compiled.instructor_courses[instructor] if c not in assignment]
+                union = 0
+                taken: Dict[int, int] = {}
+                for course in members:
+                    union |= bits[course]
+                    only = self._only_slot(course)
+                    if only is not None:
+                        if only in taken:
+                            self.failures += 1
+                            return False
+                        taken[only] = course
+                if len(members) > self._slot_count(union):
+                    self.failures += 1
+                    return False
+                for slot, owner in taken.items():
+                    slot_mask = slot_masks[slot]
+                    for course in members:
+                        if course != owner and bits[course] & slot_mask:
+                            before = bits[course]
+                            self.pruned += domains.remove(course, slot_mask)
+                            if not bits[course]:
+                                self.failures += 1
+                                return False
+                            note(course, before & slot_mask)
+        return True
+
+def _clique_cover(patterns: int, pattern_overlap: List[int]) -> int:
+    """Size of a greedy cover of patterns (a bitset) by groups that pairwise overlap.
+    
+    At most one of any such group can be used by courses that must not
+    overlap, so this bounds how many of them fit.
+    """
+    groups: List[int] = []
+    for pattern in iter_bits(patterns):
+        for i, common in enumerate(groups):
+            if common >> pattern & 1:
+                groups[i] = common & pattern_overlap[pattern]
+                break
+        else:
+            groups.append(pattern_overlap[pattern])
+    return len(groups)
+
+def block_capacity_conflict(compiled: CompiledBlocks) -> Optional[str]:
+    """Static pigeonhole check of block domains; why they are infeasible, or None.
+    
+    An instructor's courses need pairwise non-overlapping blocks, and the
+    courses confined to a set of rooms need non-overlapping blocks in each
+    room. A greedy cover of their patterns by groups that pairwise overlap
+    (e.g. every 3-of-5-day pattern at one period) bounds how many fit.
+    """
+    courses = compiled.courses
+    patterns = compiled.course_patterns
+    for course, bits in enumerate(patterns):
+        if not bits:
+            return f"{courses[course].id} has no possible block"
+    
+    for instructor, members in enumerate(compiled.instructor_courses):
+        if len(members) < 2:
+            continue
+        union = 0
+        for course in members:
+            union |= patterns[course]
+        fit = _clique_cover(union, compiled.pattern_overlap)
+        if len(members) > fit:
+            return (f"{compiled.instructors[instructor]} teaches {len(members)} courses but at most "
+                    f"{fit} non-overlapping blocks are possible")
+    
+    course_rooms = compiled.course_rooms
+    for rooms in set(course_rooms):
+        confined = [c for c, other in enumerate(course_rooms) if not other & ~rooms]
+        union = 0
+        for course in confined:
+            union |= patterns[course]
+        fit = popcount(rooms) * _clique_cover(union, compiled.pattern_overlap)
+        if len(confined) > fit:
+            return (f"{len(confined)} courses can only use {popcount(rooms)} rooms, "
+                    f"which fit at most {fit} of their blocks")
+    return None
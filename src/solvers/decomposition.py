@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from .backtracking_forward_checking import BacktrackingWithForwardChecking
+
+def find_components(problem: TimetableProblem) -> List[List[Course]]:
+    """Split the courses into groups that cannot constrain each other, largest first.
+    
+    Two courses are linked if they share an instructor or a candidate
+    (slot, room) value in problem.domain_mask. Components are found by
+    min-label propagation over those links, vectorized one slot at a time,
+    with pointer jumping so long chains settle in few sweeps.
+    """
+    num_courses = len(problem.courses)
+    if num_courses == 0:
+        return []
+    mask = problem.domain_mask
+    instructors = {}
+    course_instructor = np.array([instructors.setdefault(c.instructor, len(instructors))
+                                  for c in problem.courses], dtype=np.intp)
+    
+    # labels[c] is always a course in c's component with index <= c
+    labels = np.arange(num_courses)
+    unset = num_courses
+    while True:
+        previous = labels
+        instructor_label = np.full(len(instructors), unset)
+        np.minimum.at(instructor_label, course_instructor, labels)
+        labels = np.minimum(labels, instructor_label[course_instructor])
+        for slot in range(mask.shape[1]):
+            usable = mask[:, slot, :]
+            value_label = np.where(usable, labels[:, None], unset).min(axis=0)
+            labels = np.minimum(labels, np.where(usable, value_label[None, :], unset).min(axis=1))
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+    
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    components = [[problem.courses[i] for i in group.tolist()] for group in np.split(order, bounds)]
+    components.sort(key=len, reverse=True)
+    return components
+
+def _solve_component(problem: TimetableProblem, solver_class, options: Dict, timeout: Optional[float],
+                     max_nodes: Optional[int], stop_event) -> Tuple[Optional[List[Tuple[int, int, int]]], Dict]:
+    """Solve one component in a worker process.
+    
+    The solution goes back as (course, timeslot, room) indices into the
+    component's lists, so the parent can map it onto its own objects.
+    """
+    solver = solver_class(problem, **options)
+    solution, metrics = solver.solve(stop_event=stop_event, timeout=timeout, max_nodes=max_nodes)
+    if solution is None:
+        return None, metrics
+    course_index = {course: i for i, course in enumerate(problem.courses)}
+    slot_index = {ts: i for i, ts in enumerate(problem.timeslots)}
+    room_index = {room: i for i, room in enumerate(problem.rooms)}
+    return [(course_index[c], slot_index[ts], room_index[room])
+            for c, (ts, room) in solution.items()], metrics
+
+class DecomposedSolver:
+    """Solve independent components of a problem separately and merge the timetables.
+    
+    Search cost grows with the product of independent parts solved
+    together; solved apart it grows with their sum. Components of at
+    least parallel_min_courses courses run in worker processes when there
+    are two or more of them; the rest are solved in this process while
+    the workers run. An infeasible component stops the others.
+    """
+    
+    def __init__(self, problem: TimetableProblem, solver_class=BacktrackingWithForwardChecking,
+                 max_workers: Optional[int] = None, parallel_min_courses: int = 200,
+                 **solver_options):
+        """
+        solver_class, solver_options: the solver run on each component
+        """
+        self.problem = problem
+        self.solver_class = solver_class
+        self.solver_options = solver_options
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_min_courses = parallel_min_courses
+        self.components: List[List[Course]] = []
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+        """Solve every component; timeout and max_nodes apply to each one"""
+        self.start_time = time.time()
+        self.components = find_components(self.problem)
+        subproblems = [self.problem.subproblem(courses) for courses in self.components]
+        
+        large = [sub for sub in subproblems if len(sub.courses) >= self.parallel_min_courses]
+        if len(large) < 2 or self.max_workers < 2:
+            large = []
+        small = [sub for sub in subproblems if len(sub.courses) < self.parallel_min_courses or not large]
+        
+        result: Dict[Course, Tuple[TimeSlot, Room]] = {}
+        component_metrics = []
+        failed = False
+        
+        if large:
+            with multiprocessing.Manager() as manager:
+                stop_event = manager.Event()
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(large))) as executor:
+                    futures = {executor.submit(_solve_component, sub, self.solver_class, self.solver_options,
+                                               timeout, max_nodes, stop_event): sub
+                               for sub in large}
+                    
+                    # Small components are solved here while the workers run
+                    failed = not self._solve_inline(small, timeout, max_nodes, result, component_metrics)
+                    if failed:
+                        stop_event.set()
+                    
+                    pending = set(futures)
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            if future.cancelled():
+                                continue
+                            encoded, metrics = future.result()
+                            component_metrics.append(metrics)
+                            if encoded is None:
+                                failed = True
+                                continue
+                            sub = futures[future]
+                            result.update((sub.courses[c], (sub.timeslots[s], sub.rooms[r]))
+                                          for c, s, r in encoded)
+                        if failed and not stop_event.is_set():
+                            # One component without a timetable means none for the whole problem
+                            stop_event.set()
+                            for future in pending:
+                                future.cancel()
+        else:
+            failed = not self._solve_inline(small, timeout, max_nodes, result, component_metrics)
+        
+        self.end_time = time.time()
+        
+        solution = None if failed else result
+        metrics = {
+            'nodes_explored': sum(m.get('nodes_explored', 0) for m in component_metrics),
+            'backtracks': sum(m.get('backtracks', 0) for m in component_metrics),
+            'pruned_values': sum(m.get('pruned_values', 0) for m in component_metrics),
+            'time_taken': self.end_time - self.start_time,
+            'success': solution is not None,
+            'components': len(self.components),
+            'largest_component': len(self.components[0]) if self.components else 0,
+            'parallel_components': len(large),
+            'budget_exhausted': any(m.get('budget_exhausted', False) for m in component_metrics)
+        }
+        
+        return solution, metrics
+    
+    def _solve_inline(self, subproblems: List[TimetableProblem], timeout: Optional[float],
+                      max_nodes: Optional[int], result: Dict, component_metrics: List[Dict]) -> bool:
+        """Solve components in this process, smallest first; False as soon as one fails"""
+        for sub in reversed(subproblems):
+            solution, metrics = self.solver_class(sub, **self.solver_options).solve(
+                timeout=timeout, max_nodes=max_nodes)
+            component_metrics.append(metrics)
+            if solution is None:
+                return False
+            result.update(solution)
+        return True
@@ -0,0 +1,112 @@
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from ..models.compiled import CompiledProblem
+
+def popcount(bits: int) -> int:
+    """Number of set bits (int.bit_count needs Python 3.10+)"""
+    return bin(bits).count('1')
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the indices of set bits in ascending order"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+class BitsetDomains:
+    """Live per-course domains as int bitsets with an undo trail.
+    
+    Every removal pushes (course, removed_bits, count) onto the trail, so a
+    prune or a restore costs O(changed bits) and restored domains are
+    bit-for-bit identical to before. Values always come out in ascending
+    (timeslot, room) order, independent of the prune/restore history.
+    """
+    
+    def __init__(self, compiled: CompiledProblem,
+                 on_change: Optional[Callable[[int], None]] = None):
+        self.compiled = compiled
+        self.bits: List[int] = list(compiled.domain_bits)
+        self.sizes: List[int] = [len(domain) for domain in compiled.domains]
+        self.trail: List[Tuple[int, int, int]] = []
+        
+        # Called with the course whenever its domain size changes
+        self.on_change = on_change
+        
+        # Called with (course, bits) for every removal and restore
+        self.on_remove: Optional[Callable[[int, int], None]] = None
+        self.on_restore: Optional[Callable[[int, int], None]] = None
+    
+    def mark(self) -> int:
+        """Current trail position, to pass to undo()"""
+        return len(self.trail)
+    
+    def remove(self, course: int, mask: int) -> int:
+        """Remove mask's bits from course's domain, returning how many were live"""
+        removed = self.bits[course] & mask
+        if not removed:
+            return 0
+        count = popcount(removed)
+        self.bits[course] ^= removed
+        self.sizes[course] -= count
+        self.trail.append((course, removed, count))
+        if self.on_remove is not None:
+            self.on_remove(course, removed)
+        if self.on_change is not None:
+            self.on_change(course)
+        return count
+    
+    def undo(self, mark: int):
+        """Restore every removal made since mark"""
+        trail = self.trail
+        bits = self.bits
+        sizes = self.sizes
+        on_change = self.on_change
+        on_restore = self.on_restore
+        while len(trail) > mark:
+            course, removed, count = trail.pop()
+            bits[course] |= removed
+            sizes[course] += count
+            if on_restore is not None:
+                on_restore(course, removed)
+            if on_change is not None:
+                on_change(course)
+    
+    def values(self, course: int) -> Iterator[int]:
+        """Course's live values in ascending order, lazily from a snapshot.
+        
+        Ints are immutable, so later prunes do not affect the iteration.
+        """
+        return iter_bits(self.bits[course])
+    
+    def prune_conflicts(self, course: int, value: int, assignment: Dict[int, int],
+                        stop_on_wipeout: bool = True) -> Tuple[int, bool]:
+        """Remove values that conflict with course := value from unassigned courses.
+        
+        Same-instructor courses lose the whole slot, every other course just
+        this room. Returns (values removed, wipeout occurred); the caller
+        undoes the trail on backtrack either way.
+        """
+        compiled = self.compiled
+        slot = value // compiled.num_rooms
+        room_bit = 1 << value
+        slot_mask = compiled.slot_masks[slot]
+        instructor = compiled.course_instructor[course]
+        course_instructor = compiled.course_instructor
+        sizes = self.sizes
+        total = 0
+        wipeout = False
+        
+        # Only courses with a value in this slot can lose anything
+        for other in compiled.slot_courses[slot]:
+            if other in assignment:
+                continue
+            
+            mask = slot_mask if course_instructor[other] == instructor else room_bit
+            removed = self.remove(other, mask)
+            if removed:
+                total += removed
+                if sizes[other] == 0:
+                    wipeout = True
+                    if stop_on_wipeout:
+                        break
+        
+        return total, wipeout
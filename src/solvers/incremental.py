@@ -0,0 +1,164 @@
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem, ChangeSet
+from ..models.occupancy import OccupancyIndex
+from .backtracking_forward_checking import BacktrackingWithForwardChecking
+
+Solution = Dict[Course, Tuple[TimeSlot, Room]]
+
+class IncrementalSolver:
+    """Re-solve a published timetable after small changes, moving as few courses as possible.
+    
+    resolve() applies a ChangeSet to the problem, recomputing only the
+    domains it affects, and keeps every assignment that is still valid.
+    Only the displaced courses (invalidated or newly added) are searched,
+    over a sub-problem whose domains exclude the rooms and instructor
+    slots the kept courses hold.
+    
+    If that sub-problem has no solution, the neighbourhood grows by one
+    ring: for each free course, the kept courses blocking its
+    ring_width least-blocked values are freed too. After max_rings rings
+    the whole updated problem is solved from scratch.
+    """
+    
+    def __init__(self, problem: TimetableProblem, solution: Solution,
+                 solver_class=BacktrackingWithForwardChecking, max_rings: int = 3,
+                 ring_width: int = 2, **solver_options):
+        """
+        solution: the published timetable for problem
+        solver_class, solver_options: the solver run on each neighbourhood
+        """
+        self.problem = problem
+        self.solution = dict(solution)
+        self.solver_class = solver_class
+        self.solver_options = solver_options
+        self.max_rings = max_rings
+        self.ring_width = ring_width
+        self.start_time = 0
+        self.end_time = 0
+    
+    def resolve(self, changes: ChangeSet, timeout: Optional[float] = None,
+                max_nodes: Optional[int] = None) -> Tuple[Optional[Solution], Dict]:
+        """Apply changes and repair the timetable.
+        
+        The updated problem, and on success the new timetable, replace the
+        current ones, so further change sets build on them. timeout and
+        max_nodes bound each neighbourhood search.
+        """
+        self.start_time = time.time()
+        previous = self.solution
+        problem = self.problem.apply_changes(changes)
+        
+        kept, displaced = self._split(problem)
+        free: Set[Course] = set(displaced)
+        nodes_explored = 0
+        rings = 0
+        full_resolve = False
+        result = None
+        
+        while True:
+            if free:
+                fixed = {c: v for c, v in kept.items() if c not in free}
+                solution, metrics = self._solve_subproblem(problem, fixed, free, timeout, max_nodes)
+                nodes_explored += metrics['nodes_explored']
+                if solution is not None:
+                    fixed.update(solution)
+                    result = fixed
+                    break
+                if metrics.get('budget_exhausted'):
+                    break
+            else:
+                result = dict(kept)
+                break
+            
+            blockers = self._blockers(problem, kept, free) if rings < self.max_rings else set()
+            if not blockers:
+                # Nothing left to free, or out of rings: start over on the whole problem
+                full_resolve = True
+                solver = self.solver_class(problem, **self.solver_options)
+                result, metrics = solver.solve(timeout=timeout, max_nodes=max_nodes)
+                nodes_explored += metrics['nodes_explored']
+                break
+            free |= blockers
+            rings += 1
+        
+        self.end_time = time.time()
+        
+        # The change happened even if repair failed: later change sets apply on top of it
+        self.problem = problem
+        if result is not None:
+            self.solution = result
+        
+        metrics = {
+            'nodes_explored': nodes_explored,
+            'time_taken': self.end_time - self.start_time,
+            'success': result is not None,
+            'kept': len(kept),
+            'displaced': len(displaced),
+            'freed': len(free),
+            'rings': rings,
+            'full_resolve': full_resolve,
+            'moved': (sum(1 for c, v in result.items() if c in previous and previous[c] != v)
+                      if result is not None else 0)
+        }
+        
+        return result, metrics
+    
+    def _split(self, problem: TimetableProblem) -> Tuple[Solution, List[Course]]:
+        """Partition the updated problem's courses into still-valid assignments and displaced ones"""
+        kept: Solution = {}
+        occupancy = OccupancyIndex()
+        displaced = []
+        for course in problem.courses:
+            placement = self.solution.get(course)
+            if placement is not None:
+                timeslot, room = placement
+                if (problem.allows(course, timeslot, room)
+                        and occupancy.is_room_free(timeslot, room)
+                        and occupancy.is_instructor_free(course.instructor, timeslot)):
+                    kept[course] = placement
+                    occupancy.assign(course, timeslot, room)
+                    continue
+            displaced.append(course)
+        return kept, displaced
+    
+    def _solve_subproblem(self, problem: TimetableProblem, fixed: Solution, free: Set[Course],
+                          timeout: Optional[float], max_nodes: Optional[int]) -> Tuple[Optional[Solution], Dict]:
+        """Search the free courses over the room and instructor slots fixed courses leave open"""
+        occupancy = OccupancyIndex(fixed)
+        courses = [c for c in problem.courses if c in free]
+        domains = {c: [placement for placement in problem.get_domain(c)
+                       if occupancy.is_room_free(*placement)
+                       and occupancy.is_instructor_free(c.instructor, placement[0])]
+                   for c in courses}
+        subproblem = TimetableProblem(courses, problem.timeslots, problem.rooms,
+                                      problem.instructor_constraints, problem.preferred_times,
+                                      domains=domains)
+        solver = self.solver_class(subproblem, **self.solver_options)
+        return solver.solve(timeout=timeout, max_nodes=max_nodes)
+    
+    def _blockers(self, problem: TimetableProblem, kept: Solution, free: Set[Course]) -> Set[Course]:
+        """Kept courses occupying the ring_width least-blocked values of each free course"""
+        by_room_slot = {}
+        by_instructor_slot = {}
+        for course, (timeslot, room) in kept.items():
+            if course not in free:
+                by_room_slot[(timeslot, room)] = course
+                by_instructor_slot[(course.instructor, timeslot)] = course
+        
+        blockers = set()
+        for course in free:
+            prefs = problem.preferred_times.get(course.id)
+            blocked = []
+            for timeslot, room in problem.get_domain(course):
+                if prefs is not None and (timeslot.day, timeslot.period) not in prefs:
+                    continue
+                holders = {by_room_slot.get((timeslot, room)),
+                           by_instructor_slot.get((course.instructor, timeslot))}
+                holders.discard(None)
+                if holders:
+                    blocked.append((len(holders), len(blocked), holders))
+            blocked.sort(key=lambda entry: entry[:2])
+            for _, _, holders in blocked[:self.ring_width]:
+                blockers |= holders
+        return blockers
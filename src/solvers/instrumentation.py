@@ -0,0 +1,126 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+class Instrumentation:
+    """Optional per-phase profiling for the backtracking solvers.
+    
+    Pass one to ``solve(instrumentation=...)``. The search core then wraps
+    its phases (compile, prepare, select_variable, order_values,
+    propagate) and the constraint primitives each solver relies on with
+    timers and call counters, and records how many nodes were opened at
+    each depth. Without one nothing is wrapped, so the only cost is a
+    None check per run and per STOP_CHECK_INTERVAL nodes.
+    
+    Every progress_interval seconds a progress event (nodes/sec since the
+    previous event, current and best depth) is appended to ``events`` and
+    passed to progress_callback if given. to_dict()/to_json() export
+    everything for dashboards.
+    """
+    
+    def __init__(self, progress_callback: Optional[Callable[[Dict], None]] = None,
+                 progress_interval: float = 1.0):
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.phase_seconds: Dict[str, float] = {}
+        self.phase_calls: Dict[str, int] = {}
+        self.constraint_calls: Dict[str, int] = {}
+        self.depth_histogram: List[int] = []
+        self.events: List[Dict] = []
+        self.depth = 0
+        self.start_time = time.perf_counter()
+        self._last_event_time = self.start_time
+        self._last_event_nodes = 0
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as one call of phase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, time.perf_counter() - start)
+    
+    def _add(self, name: str, seconds: float):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+        self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+    
+    def timed(self, name: str, function: Callable) -> Callable:
+        """function, timed and counted as phase name"""
+        clock = time.perf_counter
+        add = self._add
+        
+        def wrapper(*args):
+            start = clock()
+            try:
+                return function(*args)
+            finally:
+                add(name, clock() - start)
+        return wrapper
+    
+    def timed_select(self, function: Callable) -> Callable:
+        """The variable selection phase, also recording the depth of each node opened"""
+        histogram = self.depth_histogram
+        timed = self.timed('select_variable', function)
+        
+        def wrapper(assignment):
+            depth = self.depth = len(assignment)
+            while len(histogram) <= depth:
+                histogram.append(0)
+            histogram[depth] += 1
+            return timed(assignment)
+        return wrapper
+    
+    def counted(self, name: str, function: Callable) -> Callable:
+        """function, with its calls counted under constraint_calls[name]"""
+        calls = self.constraint_calls
+        calls.setdefault(name, 0)
+        
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return function(*args, **kwargs)
+        return wrapper
+    
+    def poll(self, solver):
+        """Emit a progress event if progress_interval has passed; called from the stop check"""
+        now = time.perf_counter()
+        if now - self._last_event_time >= self.progress_interval:
+            self.emit(solver, now)
+    
+    def emit(self, solver, now: Optional[float] = None):
+        """Record a progress event for solver's current state and pass it to the callback"""
+        now = time.perf_counter() if now is None else now
+        nodes = solver.nodes_explored
+        interval = now - self._last_event_time
+        event = {
+            'elapsed': now - self.start_time,
+            'nodes': nodes,
+            'nodes_per_sec': (nodes - self._last_event_nodes) / interval if interval > 0 else 0.0,
+            'depth': self.depth,
+            'best_depth': solver.best_depth,
+            'backtracks': solver.backtracks,
+            'restarts': solver.restart_count
+        }
+        self._last_event_time = now
+        self._last_event_nodes = nodes
+        self.events.append(event)
+        if self.progress_callback is not None:
+            self.progress_callback(event)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'phases': {name: {'seconds': self.phase_seconds[name], 'calls': self.phase_calls[name]}
+                       for name in self.phase_seconds},
+            'constraint_calls': dict(self.constraint_calls),
+            'depth_histogram': list(self.depth_histogram),
+            'events': list(self.events)
+        }
+    
+    def to_json(self, path: Optional[str] = None) -> str:
+        """JSON export; also written to path if given"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
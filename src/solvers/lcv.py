@@ -0,0 +1,53 @@
+from array import array
+from typing import List
+from ..models.compiled import CompiledProblem
+from .domains import iter_bits
+
+class ContentionCounters:
+    """Demand on each resource from the live domains of unassigned courses.
+    
+    ``value_demand[v]`` counts unassigned courses that can still take value
+    v (a slot-room pair); ``instructor_slot_demand[i * num_slots + s]``
+    counts live values at slot s across instructor i's unassigned courses.
+    Both are updated per changed bit, so scoring a value is O(1).
+    """
+    
+    def __init__(self, compiled: CompiledProblem, bits: List[int]):
+        self.compiled = compiled
+        self.value_demand = array('i', [0]) * compiled.num_values
+        self.instructor_slot_demand = array('i', [0]) * (compiled.num_instructors * compiled.num_slots)
+        for course, course_bits in enumerate(bits):
+            self.add(course, course_bits)
+    
+    def add(self, course: int, bits: int):
+        """Count bits as live values of course"""
+        self._update(course, bits, 1)
+    
+    def discard(self, course: int, bits: int):
+        """Stop counting bits as live values of course"""
+        self._update(course, bits, -1)
+    
+    def _update(self, course: int, bits: int, delta: int):
+        compiled = self.compiled
+        num_rooms = compiled.num_rooms
+        base = compiled.course_instructor[course] * compiled.num_slots
+        value_demand = self.value_demand
+        instructor_slot_demand = self.instructor_slot_demand
+        for value in iter_bits(bits):
+            value_demand[value] += delta
+            instructor_slot_demand[base + value // num_rooms] += delta
+    
+    def score(self, course: int, value: int) -> int:
+        """Approximate number of other courses' values that course := value removes.
+        
+        Counts other courses wanting this exact slot-room, plus the
+        instructor's other live values in the slot. A same-instructor course
+        that wants this exact room is counted twice. The selected course's
+        own values were discarded when search entered it, so the counters
+        hold only other courses' demand.
+        """
+        compiled = self.compiled
+        slot = value // compiled.num_rooms
+        instructor = compiled.course_instructor[course]
+        return (self.value_demand[value]
+                + self.instructor_slot_demand[instructor * compiled.num_slots + slot])
@@ -0,0 +1,268 @@
+import random
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from ..models.compiled import CompiledProblem, CompiledOccupancy
+
+class _IndexedSet:
+    """Set of course ids with O(1) add, discard and random choice"""
+    
+    def __init__(self, size: int):
+        self.items: List[int] = []
+        self.position = array('i', [-1]) * size
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def add(self, item: int):
+        if self.position[item] < 0:
+            self.position[item] = len(self.items)
+            self.items.append(item)
+    
+    def discard(self, item: int):
+        index = self.position[item]
+        if index >= 0:
+            last = self.items.pop()
+            if last != item:
+                self.items[index] = last
+                self.position[last] = index
+            self.position[item] = -1
+    
+    def choice(self, rng: random.Random) -> int:
+        return self.items[rng.randrange(len(self.items))]
+
+class LocalSearchSolver:
+    """Min-conflicts local search with a tabu list, for instances too large for backtracking.
+    
+    Every course holds a value from its compiled domain, so the unary
+    constraints ConstraintChecker enforces (availability, room type,
+    preferred times) always hold; only room and instructor clashes are
+    repaired. Clashes are counted per (slot, room) cell and per
+    (instructor, slot), so evaluating or making a move is O(1); domains
+    larger than sample_size are sampled rather than scanned.
+    
+    Each step moves a random conflicted course to its least-conflicting
+    non-tabu value (or, with probability noise, a random one). The value it
+    left is tabu for that course for tabu_tenure steps unless taking it
+    would beat the best assignment so far.
+    """
+    
+    CHECK_INTERVAL = 256
+    
+    def __init__(self, problem: TimetableProblem, seed: Optional[int] = 0,
+                 tabu_tenure: int = 10, noise: float = 0.02, sample_size: int = 64):
+        self.problem = problem
+        self.seed = seed
+        self.tabu_tenure = tabu_tenure
+        self.noise = noise
+        self.sample_size = sample_size
+        self.compiled = None
+        self.steps = 0
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, timeout: float = 10.0, max_steps: Optional[int] = None,
+              stop_event=None) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+        """Repair a greedy assignment until clash-free or out of budget.
+        
+        Returns the best assignment found with any remaining clashes
+        dropped, so the timetable is always valid but may be partial.
+        """
+        self.start_time = time.time()
+        deadline = self.start_time + timeout if timeout is not None else None
+        self.steps = 0
+        self.rng = random.Random(self.seed)
+        
+        self.compiled = compiled = CompiledProblem(self.problem)
+        self.values = array('i', [-1]) * compiled.num_courses
+        self.room_load = array('i', [0]) * compiled.num_values
+        self.instructor_load = array('i', [0]) * (compiled.num_instructors * compiled.num_slots)
+        self.room_occupants: Dict[int, List[int]] = {}
+        self.instructor_occupants: Dict[int, List[int]] = {}
+        self.conflicted = _IndexedSet(compiled.num_courses)
+        self.violations = 0
+        
+        self._greedy_init()
+        best = array('i', self.values)
+        best_violations = self.violations
+        
+        # (course * num_values + value) -> step until which the move is tabu
+        tabu: Dict[int, int] = {}
+        num_values = compiled.num_values
+        
+        while self.violations > 0:
+            if max_steps is not None and self.steps >= max_steps:
+                break
+            if self.steps % self.CHECK_INTERVAL == 0:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                if stop_event is not None and stop_event.is_set():
+                    break
+            self.steps += 1
+            
+            course = self.conflicted.choice(self.rng)
+            current = self.values[course]
+            value = self._choose_value(course, tabu, best_violations)
+            if value is None:
+                continue
+            
+            tabu[course * num_values + current] = self.steps + self.tabu_tenure
+            self._unplace(course)
+            self._place(course, value)
+            
+            if self.violations < best_violations:
+                best_violations = self.violations
+                best = array('i', self.values)
+        
+        result = self._clash_free(best)
+        self.end_time = time.time()
+        
+        num_courses = compiled.num_courses
+        metrics = {
+            'nodes_explored': self.steps,
+            'time_taken': self.end_time - self.start_time,
+            'success': len(result) == num_courses,
+            'violations': best_violations,
+            'assigned': len(result),
+            'progress': len(result) / num_courses if num_courses else 1.0
+        }
+        
+        return compiled.decode(result), metrics
+    
+    def _instructor_key(self, course: int, value: int) -> int:
+        compiled = self.compiled
+        return (compiled.course_instructor[course] * compiled.num_slots
+                + value // compiled.num_rooms)
+    
+    def _cost(self, course: int, value: int) -> int:
+        """Clashes course would have at value, not counting itself"""
+        cost = self.room_load[value] + self.instructor_load[self._instructor_key(course, value)]
+        current = self.values[course]
+        if current >= 0:
+            if current == value:
+                cost -= 2
+            elif current // self.compiled.num_rooms == value // self.compiled.num_rooms:
+                cost -= 1
+        return cost
+    
+    def _place(self, course: int, value: int):
+        key = self._instructor_key(course, value)
+        self.violations += self.room_load[value] + self.instructor_load[key]
+        self.room_load[value] += 1
+        self.instructor_load[key] += 1
+        self.values[course] = value
+        room_occupants = self.room_occupants.setdefault(value, [])
+        instructor_occupants = self.instructor_occupants.setdefault(key, [])
+        room_occupants.append(course)
+        instructor_occupants.append(course)
+        for other in room_occupants:
+            self._refresh(other)
+        for other in instructor_occupants:
+            self._refresh(other)
+    
+    def _unplace(self, course: int):
+        value = self.values[course]
+        key = self._instructor_key(course, value)
+        self.room_load[value] -= 1
+        self.instructor_load[key] -= 1
+        self.violations -= self.room_load[value] + self.instructor_load[key]
+        self.values[course] = -1
+        self.conflicted.discard(course)
+        room_occupants = self.room_occupants[value]
+        instructor_occupants = self.instructor_occupants[key]
+        room_occupants.remove(course)
+        instructor_occupants.remove(course)
+        for other in room_occupants:
+            self._refresh(other)
+        for other in instructor_occupants:
+            self._refresh(other)
+    
+    def _refresh(self, course: int):
+        """Re-file course as conflicted or not after a load it shares changed"""
+        value = self.values[course]
+        if (self.room_load[value] > 1
+                or self.instructor_load[self._instructor_key(course, value)] > 1):
+            self.conflicted.add(course)
+        else:
+            self.conflicted.discard(course)
+    
+    def _candidates(self, course: int):
+        domain = self.compiled.domains[course]
+        if len(domain) <= self.sample_size:
+            return domain
+        rng = self.rng
+        return [domain[rng.randrange(len(domain))] for _ in range(self.sample_size)]
+    
+    def _choose_value(self, course: int, tabu: Dict[int, int],
+                      best_violations: int) -> Optional[int]:
+        """Least-conflicting non-tabu value other than the current one"""
+        rng = self.rng
+        current = self.values[course]
+        domain = self.compiled.domains[course]
+        if len(domain) < 2:
+            return None
+        
+        # Random walk step to escape plateaus
+        if rng.random() < self.noise:
+            value = domain[rng.randrange(len(domain))]
+            return value if value != current else None
+        
+        current_cost = self._cost(course, current)
+        base = course * self.compiled.num_values
+        best_value = None
+        best_cost = None
+        ties = 0
+        for value in self._candidates(course):
+            if value == current:
+                continue
+            cost = self._cost(course, value)
+            # Aspiration: a tabu move is allowed if it beats the best so far
+            if (tabu.get(base + value, 0) > self.steps
+                    and self.violations - current_cost + cost >= best_violations):
+                continue
+            if best_cost is None or cost < best_cost:
+                best_value, best_cost, ties = value, cost, 1
+            elif cost == best_cost:
+                # Reservoir sampling: uniform choice among equally good values
+                ties += 1
+                if rng.randrange(ties) == 0:
+                    best_value = value
+        return best_value
+    
+    def _greedy_init(self):
+        """Place the most constrained courses first, each at a least-conflicting value"""
+        compiled = self.compiled
+        rng = self.rng
+        order = sorted(range(compiled.num_courses), key=lambda c: len(compiled.domains[c]))
+        for course in order:
+            domain = compiled.domains[course]
+            if not domain:
+                continue
+            
+            # A few random probes usually find a free value; otherwise scan
+            chosen = None
+            for _ in range(min(self.sample_size, len(domain))):
+                value = domain[rng.randrange(len(domain))]
+                if self._cost(course, value) == 0:
+                    chosen = value
+                    break
+            if chosen is None:
+                best_cost = None
+                for value in domain:
+                    cost = self._cost(course, value)
+                    if best_cost is None or cost < best_cost:
+                        chosen, best_cost = value, cost
+                        if cost == 0:
+                            break
+            self._place(course, chosen)
+    
+    def _clash_free(self, values: array) -> Dict[int, int]:
+        """Keep each course whose room and instructor are still free, in course order"""
+        occupancy = CompiledOccupancy(self.compiled)
+        result = {}
+        for course, value in enumerate(values):
+            if value >= 0 and occupancy.is_free(course, value):
+                occupancy.assign(course, value)
+                result[course] = value
+        return result
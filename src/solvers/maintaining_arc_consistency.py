@@ -0,0 +1,83 @@
+from typing import Dict, Tuple, Optional
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from .propagation import ac3
+from .search import BacktrackingSearch
+from .instrumentation import Instrumentation
+from .cache import SolutionCache
+import time
+
+class MaintainingArcConsistency(BacktrackingSearch):
+    def __init__(self, problem: TimetableProblem, seed: Optional[int] = None,
+                 restarts: Optional[str] = None, restart_base: int = 100,
+                 symmetry_breaking: bool = True, capacity_pruning: bool = True):
+        """
+        seed: if given, values and MRV ties are tried in a random (reproducible) order
+        restarts: 'luby' or 'geometric' restarts the search after a node
+        limit of restart_base times the next term of that schedule
+        symmetry_breaking: try one value per class of interchangeable rooms
+        (and of still-empty interchangeable slots) at each decision
+        capacity_pruning: reject pigeonhole-infeasible problems before search
+        and count rooms and instructor slots left at every node
+        """
+        self._set_restarts(restarts, restart_base)
+        self.problem = problem
+        self.seed = seed
+        self.symmetry_breaking = symmetry_breaking
+        self.capacity_pruning = capacity_pruning
+        # AC-3 prunes values through chains of constraints, so a removal has
+        # no single culprit assignment: backtrack chronologically
+        self.backjumping = False
+        self.instrumentation = None
+        self.compiled = None
+        self.domains = None
+        self.queue = None
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, stop_event=None, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None,
+              instrumentation: Optional[Instrumentation] = None,
+              cache: Optional[SolutionCache] = None) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+        """Solve using backtracking that maintains arc consistency (MAC)"""
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.instrumentation = instrumentation
+        self.start_time = time.time()
+        cached = self._cached(cache)
+        if cached is not None:
+            return cached
+        
+        result = self._run(self._compile(), stop_event, timeout, max_nodes)
+        
+        self.end_time = time.time()
+        
+        metrics = self._metrics(result is not None)
+        
+        solution = self.compiled.decode(result)
+        self._store(cache, solution, metrics)
+        return solution, metrics
+    
+    def _metrics(self, success: bool) -> Dict:
+        metrics = super()._metrics(success)
+        metrics['pruned_values'] = self.pruned_values
+        return metrics
+    
+    def _prepare(self) -> bool:
+        """Preprocessing: make the initial domains arc consistent"""
+        removed, wipeout = ac3(self.compiled, self.domains)
+        self.pruned_values += removed
+        return not wipeout
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Re-establish arc consistency after course := value; False on wipeout"""
+        domains = self.domains
+        
+        # Reduce the course to the chosen value and propagate from it
+        domains.remove(course, domains.bits[course] & ~(1 << value))
+        removed, wipeout = ac3(self.compiled, domains, [course])
+        self.pruned_values += removed
+        return not wipeout
@@ -0,0 +1,59 @@
+import heapq
+from typing import List, Optional, Tuple
+from ..models.compiled import CompiledProblem
+
+class MRVQueue:
+    """Priority queue of unassigned courses for MRV variable selection.
+    
+    A lazy-deletion heap keyed by (remaining values, -degree, tiebreak,
+    course), where degree is the number of other courses sharing the
+    instructor and tiebreak is 0 unless random keys are supplied. Size
+    changes push a fresh entry; stale entries are dropped when they reach
+    the top, so updates and selection are O(log n).
+    """
+    
+    def __init__(self, compiled: CompiledProblem, sizes: List[int],
+                 tiebreak: Optional[List[float]] = None):
+        self.sizes = sizes
+        self.degrees = compiled.course_degree
+        self.tiebreak = tiebreak or [0] * compiled.num_courses
+        self.assigned = bytearray(compiled.num_courses)
+        self.unassigned_count = compiled.num_courses
+        self.heap: List[Tuple[int, int, float, int]] = [
+            self._key(c) for c in range(compiled.num_courses)]
+        heapq.heapify(self.heap)
+    
+    def _key(self, course: int) -> Tuple[int, int, float, int]:
+        return (self.sizes[course], -self.degrees[course], self.tiebreak[course], course)
+    
+    def update(self, course: int):
+        """Re-key course after its domain size changed"""
+        if not self.assigned[course]:
+            heapq.heappush(self.heap, (self.sizes[course], -self.degrees[course],
+                                       self.tiebreak[course], course))
+            if len(self.heap) > 4 * len(self.sizes) + 64:
+                self._compact()
+    
+    def select(self) -> int:
+        """Unassigned course with fewest remaining values (ties: highest degree, then tiebreak)"""
+        heap = self.heap
+        while True:
+            size, _, _, course = heap[0]
+            if not self.assigned[course] and size == self.sizes[course]:
+                return course
+            heapq.heappop(heap)
+    
+    def remove(self, course: int):
+        """Take course out of selection once it is assigned"""
+        self.assigned[course] = 1
+        self.unassigned_count -= 1
+    
+    def restore(self, course: int):
+        """Put course back after its assignment is undone"""
+        self.assigned[course] = 0
+        self.unassigned_count += 1
+        heapq.heappush(self.heap, self._key(course))
+    
+    def _compact(self):
+        self.heap = [self._key(c) for c in range(len(self.sizes)) if not self.assigned[c]]
+        heapq.heapify(self.heap)
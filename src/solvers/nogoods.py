@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+Nogood = Tuple[Tuple[int, int], ...]
+
+class NogoodCache:
+    """Bounded LRU store of learned nogoods.
+    
+    A nogood is a set of (course, value) assignments that no solution
+    contains. Each is indexed under every one of its literals, so the check
+    made when course := value is tried only looks at nogoods mentioning
+    that pair. Nogoods longer than max_length are not stored: they rarely
+    match again and cost the most to check.
+    """
+    
+    def __init__(self, max_size: int = 10000, max_length: int = 8):
+        self.max_size = max_size
+        self.max_length = max_length
+        self.entries: OrderedDict = OrderedDict()
+        self.index: Dict[Tuple[int, int], List[Nogood]] = {}
+        self.learned = 0
+        self.hits = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def add(self, literals: Nogood) -> bool:
+        """Store a nogood (sorted (course, value) pairs); False if not kept"""
+        if len(literals) > self.max_length or literals in self.entries:
+            return False
+        if len(self.entries) >= self.max_size:
+            evicted, _ = self.entries.popitem(last=False)
+            for literal in evicted:
+                self.index[literal].remove(evicted)
+        self.entries[literals] = None
+        for literal in literals:
+            self.index.setdefault(literal, []).append(literals)
+        self.learned += 1
+        return True
+    
+    def find(self, course: int, value: int, assignment: Dict[int, int]) -> Optional[Nogood]:
+        """A stored nogood that course := value completes under assignment, if any"""
+        candidates = self.index.get((course, value))
+        if not candidates:
+            return None
+        for literals in candidates:
+            if all(other == course or assignment.get(other) == other_value
+                   for other, other_value in literals):
+                self.entries.move_to_end(literals)
+                self.hits += 1
+                return literals
+        return None
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from .backtracking_heuristics import BacktrackingWithHeuristics
+from .backtracking_forward_checking import BacktrackingWithForwardChecking
+from .maintaining_arc_consistency import MaintainingArcConsistency
+from .slot_matching import SlotMatchingSolver
+
+SOLVER_CLASSES = {
+    'heuristics': BacktrackingWithHeuristics,
+    'forward_checking': BacktrackingWithForwardChecking,
+    'mac': MaintainingArcConsistency,
+    'slot_matching': SlotMatchingSolver,
+}
+
+@dataclass
+class SolverConfig:
+    name: str
+    solver: str  # key in SOLVER_CLASSES
+    options: Dict = field(default_factory=dict)  # constructor kwargs, e.g. seed, lcv
+
+DEFAULT_PORTFOLIO = [
+    SolverConfig('mac', 'mac'),
+    SolverConfig('forward_checking', 'forward_checking'),
+    SolverConfig('heuristics_approx', 'heuristics', {'lcv': 'approx'}),
+    SolverConfig('heuristics_exact', 'heuristics'),
+    SolverConfig('mac_seed1', 'mac', {'seed': 1}),
+    SolverConfig('forward_checking_seed1', 'forward_checking', {'seed': 1}),
+    SolverConfig('heuristics_approx_seed1', 'heuristics', {'lcv': 'approx', 'seed': 1}),
+    SolverConfig('forward_checking_luby', 'forward_checking', {'seed': 2, 'restarts': 'luby'}),
+]
+
+def _run_worker(problem: TimetableProblem, config: SolverConfig,
+                stop_event) -> Tuple[str, Optional[List[Tuple[int, int, int]]], Dict]:
+    """Run one configuration in a worker process.
+    
+    The solution goes back as (course, timeslot, room) indices into the
+    problem's lists, so the parent can map it onto its own objects.
+    """
+    solver = SOLVER_CLASSES[config.solver](problem, **config.options)
+    solution, metrics = solver.solve(stop_event=stop_event)
+    metrics['cancelled'] = solver.stopped
+    
+    encoded = None
+    if solution is not None:
+        compiled = solver.compiled
+        encoded = [(compiled.course_index[course], compiled.slot_index[timeslot],
+                    compiled.room_index[room])
+                   for course, (timeslot, room) in solution.items()]
+    return config.name, encoded, metrics
+
+class PortfolioSolver:
+    """Race several solver configurations in parallel processes.
+    
+    The first configuration to find a timetable wins; the others are told
+    to stop through a shared event (polled by the search core) and their
+    metrics are still collected. An infeasible instance is reported once
+    every configuration has finished.
+    """
+    
+    def __init__(self, problem: TimetableProblem, configs: List[SolverConfig] = None,
+                 max_workers: Optional[int] = None):
+        self.problem = problem
+        self.configs = configs or DEFAULT_PORTFOLIO
+        self.max_workers = max_workers or min(len(self.configs), os.cpu_count() or 1)
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+        """Solve with the whole portfolio, returning the first solution found"""
+        self.start_time = time.time()
+        winner = None
+        encoded = None
+        worker_metrics = {}
+        
+        with multiprocessing.Manager() as manager:
+            stop_event = manager.Event()
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(_run_worker, self.problem, config, stop_event): config
+                           for config in self.configs}
+                pending = set(futures)
+                
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.cancelled():
+                            # Never started: a solution arrived while it was queued
+                            worker_metrics[futures[future].name] = {'cancelled': True, 'success': False}
+                            continue
+                        name, solution, metrics = future.result()
+                        worker_metrics[name] = metrics
+                        if solution is not None and winner is None:
+                            winner, encoded = name, solution
+                    
+                    if winner is not None and not stop_event.is_set():
+                        # First solution wins: stop running workers, drop queued ones
+                        stop_event.set()
+                        for future in pending:
+                            future.cancel()
+        
+        self.end_time = time.time()
+        
+        result = None
+        if encoded is not None:
+            courses, timeslots, rooms = self.problem.variables, self.problem.timeslots, self.problem.rooms
+            result = {courses[c]: (timeslots[s], rooms[r]) for c, s, r in encoded}
+        
+        # Top-level search counters are the winner's, as in the single-solver dicts
+        winner_metrics = worker_metrics.get(winner, {})
+        metrics = {
+            'winner': winner,
+            'nodes_explored': winner_metrics.get('nodes_explored', 0),
+            'backtracks': winner_metrics.get('backtracks', 0),
+            'pruned_values': winner_metrics.get('pruned_values', 0),
+            'time_taken': self.end_time - self.start_time,
+            'success': result is not None,
+            'workers': worker_metrics
+        }
+        
+        return result, metrics
@@ -0,0 +1,73 @@
+from collections import deque
+from typing import Iterable, Tuple
+from ..models.compiled import CompiledProblem
+from .domains import BitsetDomains
+
+def single_slot(compiled: CompiledProblem, bits: int) -> int:
+    """Slot all of bits fall in, or -1 if they span several slots (or none)"""
+    if not bits:
+        return -1
+    slot = ((bits & -bits).bit_length() - 1) // compiled.num_rooms
+    return slot if not bits & ~compiled.slot_masks[slot] else -1
+
+def ac3(compiled: CompiledProblem, domains: BitsetDomains,
+        changed: Iterable[int] = None) -> Tuple[int, bool]:
+    """
+    AC-3 over the pairwise room and instructor all-different constraints.
+    
+    Between any two courses x and y, (slot, room) values must differ, and
+    slots must differ if they share an instructor. A value of x therefore
+    loses its last support in y only when y's domain is down to that single
+    value, or (same instructor) to a single slot; revising every arc into
+    y reduces to two bitmask removals, applied whenever y's domain changes.
+    
+    Starts from the courses in changed (all courses if None). Assigned
+    courses are expected to hold singleton domains. Returns (values
+    removed, wipeout occurred); the caller undoes the trail either way.
+    """
+    bits = domains.bits
+    course_instructor = compiled.course_instructor
+    
+    if changed is None:
+        changed = range(compiled.num_courses)
+    queue = deque(changed)
+    queued = bytearray(compiled.num_courses)
+    for course in queue:
+        queued[course] = 1
+    
+    removed = 0
+    while queue:
+        y = queue.popleft()
+        queued[y] = 0
+        slot = single_slot(compiled, bits[y])
+        if slot < 0:
+            continue
+        
+        instructor = course_instructor[y]
+        y_bits = bits[y]
+        singleton = not y_bits & (y_bits - 1)
+        slot_mask = compiled.slot_masks[slot]
+        
+        # Revise every arc (x, y) that can lose support
+        if singleton:
+            targets = compiled.slot_courses[slot]
+        else:
+            targets = compiled.instructor_courses[instructor]
+        
+        for x in targets:
+            if x == y:
+                continue
+            if course_instructor[x] == instructor:
+                mask = slot_mask
+            else:
+                mask = y_bits
+            count = domains.remove(x, mask)
+            if count:
+                removed += count
+                if not bits[x]:
+                    return removed, True
+                if not queued[x]:
+                    queued[x] = 1
+                    queue.append(x)
+    
+    return removed, False
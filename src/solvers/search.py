@@ -0,0 +1,498 @@
+import random
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from ..models.compiled import CompiledProblem
+from .domains import BitsetDomains, iter_bits, popcount
+from .mrv import MRVQueue
+from .nogoods import NogoodCache
+from .capacity import CapacityPropagator, capacity_conflict
+
+RESTART_SCHEDULES = ('luby', 'geometric')
+GEOMETRIC_FACTOR = 1.5
+
+def luby(i: int) -> int:
+    """i-th term (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ..."""
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        # Inside a repeat of the previous block: recurse on the offset
+        i -= (1 << (k - 1)) - 1
+
+class BacktrackingSearch:
+    """Explicit-stack depth-first search shared by the backtracking solvers.
+    
+    Each stack frame holds [course, value iterator, trail mark], so search
+    depth is bounded by memory rather than the interpreter's recursion
+    limit. Subclasses supply _propagate() and may override the ordering
+    and bookkeeping hooks; the core maintains live BitsetDomains, the MRV
+    queue and the nodes_explored/backtracks counters.
+    
+    Subclasses set ``self.seed`` before searching; a non-None seed makes
+    value order and MRV ties random but reproducible. A stop_event
+    (anything with ``is_set()``, e.g. a multiprocessing Event) is polled
+    every STOP_CHECK_INTERVAL nodes, and search gives up with
+    ``self.stopped`` set once it fires.
+    
+    With ``self.restarts`` set to a schedule in RESTART_SCHEDULES, each run
+    is cut off after restart_base times the next schedule term in nodes and
+    search starts over with fresh random tie-breaks. An overall timeout or
+    max_nodes budget ends the search with ``self.budget_exhausted`` set;
+    best_depth records the most courses assigned at once in any run.
+    
+    Subclasses whose propagation only prunes values in direct conflict with
+    the assignment just made set ``self.backjumping`` to search with
+    conflict-directed backjumping and nogood learning instead.
+    
+    With ``self.symmetry_breaking`` set, values equivalent under the
+    compiled room and slot symmetry classes are tried once per node.
+    
+    With ``self.capacity_pruning`` set, capacity_conflict() rejects
+    pigeonhole-infeasible problems before search, and (unless
+    backjumping, whose conflict sets cannot explain counting failures, or
+    CAPACITY_PROPAGATION is off) a CapacityPropagator runs after each
+    assignment's own propagation.
+    
+    ``self.instrumentation`` (an Instrumentation, or None) profiles the
+    phases below; when None the search loop runs unwrapped.
+    
+    Solvers given a SolutionCache answer from it before compiling, and
+    store what they find: timetables always, infeasibility only when
+    search ran to completion.
+    """
+    
+    STOP_CHECK_INTERVAL = 256
+    
+    # Node-level capacity propagation needs domains that drop used rooms
+    CAPACITY_PROPAGATION = True
+    
+    def _set_restarts(self, restarts: Optional[str], restart_base: int):
+        """Validate and store the restart schedule"""
+        if restarts is not None and restarts not in RESTART_SCHEDULES:
+            raise ValueError(f"restarts must be one of {RESTART_SCHEDULES} or None, got {restarts!r}")
+        if restart_base < 1:
+            raise ValueError(f"restart_base must be positive, got {restart_base}")
+        self.restarts = restarts
+        self.restart_base = restart_base
+    
+    def _run(self, compiled: CompiledProblem, stop_event=None, timeout: Optional[float] = None,
+             max_nodes: Optional[int] = None) -> Optional[Dict[int, int]]:
+        """Search, restarting on schedule, until solved, refuted or out of budget"""
+        seed = self.seed
+        if seed is None and self.restarts is not None:
+            # Identical runs would repeat the same failure: restarts need randomness
+            seed = 0
+        self.rng = random.Random(seed) if seed is not None else None
+        self.stop_event = stop_event
+        self.deadline = time.time() + timeout if timeout is not None else None
+        self.max_nodes = max_nodes
+        self._reset_stats()
+        # Nogoods hold for the problem, not the run, so they survive restarts
+        self.nogoods = NogoodCache() if self.backjumping else None
+        search = self._search_backjumping if self.backjumping else self._search
+        
+        if self.capacity_pruning:
+            if self.instrumentation is None:
+                self.capacity_conflict = self._capacity_conflict(compiled)
+            else:
+                with self.instrumentation.phase('capacity_check'):
+                    self.capacity_conflict = self._capacity_conflict(compiled)
+            if self.capacity_conflict is not None:
+                # Refuted before search
+                self.compiled = compiled
+                return None
+            if self.CAPACITY_PROPAGATION and not self.backjumping:
+                self.capacity = CapacityPropagator(compiled, None)
+        
+        while True:
+            self._init_search(compiled)
+            self.run_node_limit = None
+            if self.restarts is not None:
+                self.run_node_limit = self.nodes_explored + self._restart_limit(self.restart_count)
+            self.restart_due = False
+            self._next_check = self.nodes_explored
+            
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                prepared = self._prepare()
+            else:
+                with instrumentation.phase('prepare'):
+                    prepared = self._prepare()
+                self._instrument(instrumentation)
+            
+            result = search({}) if prepared else None
+            if not self.restart_due:
+                # Solved, proved infeasible, cancelled or out of budget
+                if instrumentation is not None:
+                    instrumentation.emit(self)
+                return result
+            self.restart_count += 1
+    
+    def _compile(self) -> CompiledProblem:
+        """CompiledProblem for self.problem, timed as the compile phase if instrumented"""
+        if self.instrumentation is None:
+            return CompiledProblem(self.problem)
+        with self.instrumentation.phase('compile'):
+            return CompiledProblem(self.problem)
+    
+    def _cached(self, cache) -> Optional[Tuple[Optional[Dict], Dict]]:
+        """(solution, metrics) from cache for self.problem, or None on a miss.
+        
+        The metrics have the same keys as a search's, with every search
+        counter zero.
+        """
+        if cache is None:
+            return None
+        hit = cache.get(self.problem)
+        if hit is None:
+            return None
+        self._reset_stats()
+        if hit.feasible:
+            self.best_depth = len(self.problem.courses)
+        self.end_time = time.time()
+        metrics = self._metrics(hit.feasible)
+        metrics['cache_hit'] = True
+        return hit.solution, metrics
+    
+    def _store(self, cache, solution: Optional[Dict], metrics: Dict):
+        """Record a search outcome in cache; an unfinished search proves nothing"""
+        if cache is None:
+            return
+        metrics['cache_hit'] = False
+        if solution is not None or not (self.budget_exhausted or self.stopped):
+            cache.put(self.problem, solution)
+    
+    def _instrument(self, instrumentation):
+        """Count calls to the constraint primitives of this run's domains"""
+        domains = self.domains
+        domains.prune_conflicts = instrumentation.counted('prune_conflicts', domains.prune_conflicts)
+        domains.remove = instrumentation.counted('domain_remove', domains.remove)
+    
+    def _restart_limit(self, run: int) -> int:
+        """Node limit for the run-th run (0-based) under the restart schedule"""
+        if self.restarts == 'luby':
+            return self.restart_base * luby(run + 1)
+        return int(self.restart_base * GEOMETRIC_FACTOR ** run)
+    
+    def _init_search(self, compiled: CompiledProblem):
+        """Set up live domains and the MRV queue for a fresh run"""
+        self.compiled = compiled
+        self.domains = BitsetDomains(compiled)
+        tiebreak = None
+        if self.rng is not None:
+            tiebreak = [self.rng.random() for _ in range(compiled.num_courses)]
+        self.queue = MRVQueue(compiled, self.domains.sizes, tiebreak)
+        self.domains.on_change = self.queue.update
+        if self.capacity is not None:
+            self.capacity.domains = self.domains
+    
+    def _capacity_conflict(self, compiled: CompiledProblem) -> Optional[str]:
+        """Why compiled is pigeonhole-infeasible, or None; checked once before search"""
+        return capacity_conflict(compiled.problem)
+    
+    def _prepare(self) -> bool:
+        """Solver-specific setup before each run; False proves infeasibility"""
+        return True
+    
+    def _reset_stats(self):
+        """Zero what _search_stats reports, before a run or for a cache hit"""
+        self.stopped = False
+        self.budget_exhausted = False
+        self.restart_count = 0
+        self.best_depth = 0
+        self.backjumps = 0
+        self.levels_skipped = 0
+        self.symmetric_skips = 0
+        self.nogoods = None
+        self.capacity = None
+        self.capacity_conflict = None
+    
+    def _metrics(self, success: bool) -> Dict:
+        """Metrics of the last solve; solvers add their own counters"""
+        metrics = {
+            'nodes_explored': self.nodes_explored,
+            'backtracks': self.backtracks,
+            'time_taken': self.end_time - self.start_time,
+            'success': success
+        }
+        metrics.update(self._search_stats())
+        return metrics
+    
+    def _search_stats(self) -> Dict:
+        """Restart and budget metrics, merged into each solver's metrics"""
+        num_courses = len(self.problem.courses)
+        return {
+            'restarts': self.restart_count,
+            'budget_exhausted': self.budget_exhausted,
+            'best_depth': self.best_depth,
+            'progress': self.best_depth / num_courses if num_courses else 1.0,
+            'backjumps': self.backjumps,
+            'levels_skipped': self.levels_skipped,
+            'nogoods_learned': self.nogoods.learned if self.nogoods is not None else 0,
+            'nogood_prunes': self.nogoods.hits if self.nogoods is not None else 0,
+            'symmetric_skips': self.symmetric_skips,
+            'capacity_conflict': self.capacity_conflict,
+            'capacity_failures': self.capacity.failures if self.capacity is not None else 0,
+            'capacity_prunes': self.capacity.pruned if self.capacity is not None else 0
+        }
+    
+    def _search(self, assignment: Dict[int, int]) -> Optional[Dict[int, int]]:
+        """Iterative backtracking; returns the complete assignment or None"""
+        num_courses = self.compiled.num_courses
+        undo = self.domains.undo
+        mark_trail = self.domains.mark
+        enter, leave = self._enter, self._leave
+        select, order_values, propagate = self._phases()
+        stack = []
+        descend = True
+        
+        while True:
+            if descend:
+                depth = len(assignment)
+                if depth > self.best_depth:
+                    self.best_depth = depth
+                if depth == num_courses:
+                    return assignment
+                
+                if self.nodes_explored >= self._next_check and self._should_stop():
+                    return None
+                
+                course = select(assignment)
+                enter(course)
+                self.nodes_explored += 1
+                frame = [course, iter(order_values(course, assignment)), 0]
+                stack.append(frame)
+            else:
+                frame = stack[-1]
+                course = frame[0]
+                
+                # Undo the value this frame tried last
+                undo(frame[2])
+                del assignment[course]
+                self.backtracks += 1
+            
+            value = next(frame[1], None)
+            if value is None:
+                # Values exhausted: backtrack to the parent frame
+                stack.pop()
+                leave(course)
+                if not stack:
+                    return None
+                descend = False
+                continue
+            
+            frame[2] = mark_trail()
+            assignment[course] = value
+            descend = propagate(course, value, assignment)
+    
+    def _search_backjumping(self, assignment: Dict[int, int]) -> Optional[Dict[int, int]]:
+        """Iterative search with conflict-directed backjumping (FC-CBJ).
+        
+        Levels are stack positions. pruners[c] is a bitmask of the levels
+        whose assignments removed values from course c, and each frame
+        carries a fourth slot: the conflict set (a level bitmask) explaining
+        why its values so far failed. When a course runs out of values the
+        search jumps straight to the deepest level in its conflict set and
+        pruners, learning the assignments at those levels as a nogood.
+        """
+        num_courses = self.compiled.num_courses
+        domains = self.domains
+        trail = domains.trail
+        sizes = domains.sizes
+        undo = domains.undo
+        enter, leave = self._enter, self._leave
+        select, order_values, propagate = self._phases()
+        nogoods = self.nogoods
+        pruners = [0] * num_courses
+        level_of = [0] * num_courses
+        stack = []
+        descend = True
+        
+        def retract(frame, level):
+            """Undo the frame's current value and forget its prunings"""
+            keep = ~(1 << level)
+            for i in range(frame[2], len(trail)):
+                pruners[trail[i][0]] &= keep
+            undo(frame[2])
+            del assignment[frame[0]]
+        
+        while True:
+            if descend:
+                depth = len(assignment)
+                if depth > self.best_depth:
+                    self.best_depth = depth
+                if depth == num_courses:
+                    return assignment
+                
+                if self.nodes_explored >= self._next_check and self._should_stop():
+                    return None
+                
+                course = select(assignment)
+                enter(course)
+                self.nodes_explored += 1
+                level_of[course] = len(stack)
+                frame = [course, iter(order_values(course, assignment)), 0, 0]
+                stack.append(frame)
+            else:
+                frame = stack[-1]
+                course = frame[0]
+                retract(frame, len(stack) - 1)
+                self.backtracks += 1
+            
+            level = len(stack) - 1
+            value = next(frame[1], None)
+            if value is None:
+                # Dead end: every value failed, or was pruned, for a known reason
+                culprits = frame[3] | pruners[course]
+                stack.pop()
+                leave(course)
+                if not culprits:
+                    # The failure depends on no assignment: no solution exists
+                    return None
+                
+                target = culprits.bit_length() - 1
+                if popcount(culprits) <= nogoods.max_length:
+                    learned = []
+                    for culprit_level in iter_bits(culprits):
+                        culprit = stack[culprit_level][0]
+                        learned.append((culprit, assignment[culprit]))
+                    nogoods.add(tuple(sorted(learned)))
+                
+                # Unwind the levels between here and the culprit untried
+                if level - 1 > target:
+                    self.backjumps += 1
+                    self.levels_skipped += level - 1 - target
+                    while len(stack) - 1 > target:
+                        skipped = stack.pop()
+                        retract(skipped, len(stack))
+                        leave(skipped[0])
+                
+                stack[target][3] |= culprits & ~(1 << target)
+                descend = False
+                continue
+            
+            frame[2] = len(trail)
+            assignment[course] = value
+            
+            nogood = nogoods.find(course, value, assignment)
+            if nogood is not None:
+                for other, _ in nogood:
+                    if other != course:
+                        frame[3] |= 1 << level_of[other]
+                descend = False
+                continue
+            
+            descend = propagate(course, value, assignment)
+            
+            bit = 1 << level
+            for i in range(frame[2], len(trail)):
+                pruners[trail[i][0]] |= bit
+            if not descend:
+                # Wipeout: this value fails for the reasons the emptied course lost its others
+                for i in range(frame[2], len(trail)):
+                    wiped = trail[i][0]
+                    if sizes[wiped] == 0:
+                        frame[3] |= pruners[wiped] & ~bit
+                        break
+    
+    def _select_variable(self, assignment: Dict[int, int]) -> int:
+        """MRV: smallest live domain, ties broken by instructor degree"""
+        return self.queue.select()
+    
+    def _order_values(self, course: int, assignment: Dict[int, int]) -> Iterable[int]:
+        """Live values in ascending (timeslot, room) order, or shuffled if seeded"""
+        if self.rng is None:
+            return self.domains.values(course)
+        values = list(self.domains.values(course))
+        self.rng.shuffle(values)
+        return values
+    
+    def _phases(self):
+        """select, order_values and propagate as the search loop calls them.
+        
+        Timed when instrumented; a lazy value order is timed as it is
+        created, since its values are drawn inside the loop.
+        """
+        select, order_values, propagate = self._select_variable, self._order_values, self._propagate
+        if self.capacity is not None:
+            assign, mark, capacity = propagate, self.domains.mark, self.capacity.propagate
+            
+            def propagate(course, value, assignment):
+                start = mark()
+                return assign(course, value, assignment) and capacity(start, assignment)
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            select = instrumentation.timed_select(select)
+            order_values = instrumentation.timed('order_values', order_values)
+            propagate = instrumentation.timed('propagate', propagate)
+        if self.symmetry_breaking:
+            ordered = order_values
+            order_values = lambda course, assignment: self._distinct_values(ordered(course, assignment),
+                                                                            assignment)
+        return select, order_values, propagate
+    
+    def _distinct_values(self, values: Iterable[int], assignment: Dict[int, int]) -> Iterable[int]:
+        """values with only the first of each symmetry class under the current assignment.
+        
+        A live value's room is free at its slot, and rooms of one class are
+        interchangeable there. A slot nothing is assigned to yet can also
+        be swapped with any empty slot of its class. Either swap leaves the
+        assignment unchanged, so a value whose representative failed fails
+        too. The generator runs lazily, so the search always resumes it in
+        the state of the node that created it.
+        """
+        num_rooms = self.compiled.num_rooms
+        room_class, slot_class = self.compiled.room_class, self.compiled.slot_class
+        used_slots = {value // num_rooms for value in assignment.values()}
+        tried = set()
+        for value in values:
+            slot = value // num_rooms
+            room = room_class[value - slot * num_rooms]
+            # Keys >= 0: a room class at a used slot; < 0: a room class at an empty slot class
+            if slot in used_slots:
+                key = slot * num_rooms + room
+            else:
+                key = -1 - (slot_class[slot] * num_rooms + room)
+            if key in tried:
+                self.symmetric_skips += 1
+                continue
+            tried.add(key)
+            yield value
+    
+    def _enter(self, course: int):
+        """Course was selected and is about to be assigned"""
+        self.queue.remove(course)
+    
+    def _leave(self, course: int):
+        """All of course's values failed; it is unassigned again"""
+        self.queue.restore(course)
+    
+    def _should_stop(self) -> bool:
+        """Polled every STOP_CHECK_INTERVAL nodes and at node limits; True abandons the run"""
+        nodes = self.nodes_explored
+        self._next_check = nodes + self.STOP_CHECK_INTERVAL
+        
+        if self.instrumentation is not None:
+            self.instrumentation.poll(self)
+        if self.stop_event is not None and self.stop_event.is_set():
+            self.stopped = True
+            return True
+        if ((self.max_nodes is not None and nodes >= self.max_nodes)
+                or (self.deadline is not None and time.time() >= self.deadline)):
+            self.budget_exhausted = True
+            return True
+        if self.run_node_limit is not None and nodes >= self.run_node_limit:
+            self.restart_due = True
+            return True
+        
+        # Stop exactly at node limits rather than at the next polling interval
+        for limit in (self.max_nodes, self.run_node_limit):
+            if limit is not None and limit < self._next_check:
+                self._next_check = limit
+        return False
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Apply course := value to the live domains; False means dead end"""
+        raise NotImplementedError
@@ -0,0 +1,223 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from .domains import iter_bits
+from .search import BacktrackingSearch
+from .instrumentation import Instrumentation
+from .cache import SolutionCache
+import time
+
+class SlotMatchingSolver(BacktrackingSearch):
+    """Two-phase search: branch on timeslots only, keep rooms as a matching per slot.
+    
+    Each decision puts a course in a slot rather than a (slot, room)
+    pair, so the branching factor drops by up to the number of rooms. The
+    courses in each slot are kept matched to distinct compatible rooms by
+    augmenting paths, one per assignment; rooms are read off the matchings
+    once every course has a slot.
+    
+    Propagation is forward checking on slots: a course loses a slot when
+    its instructor already teaches there, or when no augmenting path
+    would fit it into that slot's matching, e.g. a slot whose labs are
+    all needed by the lab courses already in it. A matching prune depends
+    on every course in the slot, so search backtracks chronologically.
+    Capacity pruning runs its static check only: a slot's matched courses
+    do not take their rooms out of other domains, which the node-level
+    counting rules rely on.
+    """
+    
+    CAPACITY_PROPAGATION = False
+    
+    def __init__(self, problem: TimetableProblem, seed: Optional[int] = None,
+                 restarts: Optional[str] = None, restart_base: int = 100,
+                 symmetry_breaking: bool = True, capacity_pruning: bool = True):
+        """
+        seed: if given, slots and MRV ties are tried in a random (reproducible) order
+        restarts: 'luby' or 'geometric' restarts the search after a node
+        limit of restart_base times the next term of that schedule
+        symmetry_breaking: try one of each class of interchangeable slots
+        that are still empty at each decision
+        capacity_pruning: reject pigeonhole-infeasible problems before search
+        and count rooms and instructor slots left at every node
+        """
+        self._set_restarts(restarts, restart_base)
+        self.problem = problem
+        self.seed = seed
+        self.symmetry_breaking = symmetry_breaking
+        self.capacity_pruning = capacity_pruning
+        self.backjumping = False
+        self.instrumentation = None
+        self.compiled = None
+        self.domains = None
+        self.queue = None
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.matching_prunes = 0
+        self.start_time = 0
+        self.end_time = 0
+    
+    def solve(self, stop_event=None, timeout: Optional[float] = None,
+              max_nodes: Optional[int] = None,
+              instrumentation: Optional[Instrumentation] = None,
+              cache: Optional[SolutionCache] = None) -> Tuple[Optional[Dict[Course, Tuple[TimeSlot, Room]]], Dict]:
+        """Solve by searching over slots and matching rooms within each slot"""
+        self.nodes_explored = 0
+        self.backtracks = 0
+        self.pruned_values = 0
+        self.matching_prunes = 0
+        self.instrumentation = instrumentation
+        self.start_time = time.time()
+        cached = self._cached(cache)
+        if cached is not None:
+            return cached
+        
+        result = self._run(self._compile(), stop_event, timeout, max_nodes)
+        if result is not None:
+            result = self._with_rooms(result)
+        
+        self.end_time = time.time()
+        
+        metrics = self._metrics(result is not None)
+        
+        solution = self.compiled.decode(result)
+        self._store(cache, solution, metrics)
+        return solution, metrics
+    
+    def _metrics(self, success: bool) -> Dict:
+        metrics = super()._metrics(success)
+        metrics['pruned_values'] = self.pruned_values
+        metrics['matching_prunes'] = self.matching_prunes
+        return metrics
+    
+    def _prepare(self) -> bool:
+        # Per slot, the matching of courses placed there: course -> room and room -> course
+        num_slots = self.compiled.num_slots
+        self.course_room: List[Dict[int, int]] = [{} for _ in range(num_slots)]
+        self.room_course: List[Dict[int, int]] = [{} for _ in range(num_slots)]
+        self.room_mask = (1 << self.compiled.num_rooms) - 1
+        return True
+    
+    def _rooms(self, course: int, slot: int) -> int:
+        """Bitset of the rooms course may use at slot.
+        
+        Only whole slots are ever pruned, so the compiled domain is exact
+        for every slot still live.
+        """
+        return (self.compiled.domain_bits[course] >> (slot * self.compiled.num_rooms)) & self.room_mask
+    
+    def _order_values(self, course: int, assignment: Dict[int, int]) -> Iterable[int]:
+        """One value per live slot, standing for the whole slot; rooms come from the matching"""
+        slot_masks = self.compiled.slot_masks
+        num_rooms = self.compiled.num_rooms
+        bits = self.domains.bits[course]
+        values = []
+        while bits:
+            value = (bits & -bits).bit_length() - 1
+            values.append(value)
+            bits &= ~slot_masks[value // num_rooms]
+        if self.rng is not None:
+            self.rng.shuffle(values)
+        return values
+    
+    def _release_stale(self, slot: int, assignment: Dict[int, int]):
+        """Drop matched courses that search has since unassigned or moved to another slot.
+        
+        Removing a course from a matching leaves a matching of the rest,
+        so backtracking needs no undo here.
+        """
+        course_room = self.course_room[slot]
+        room_course = self.room_course[slot]
+        num_rooms = self.compiled.num_rooms
+        for course in [c for c in course_room if c not in assignment or assignment[c] // num_rooms != slot]:
+            del room_course[course_room.pop(course)]
+    
+    def _augment(self, slot: int, course: int) -> bool:
+        """Match course into slot along a shortest augmenting path; False if none exists"""
+        course_room = self.course_room[slot]
+        room_course = self.room_course[slot]
+        rooms = self._rooms
+        came_from = {}
+        visited = 0
+        frontier = [course]
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for room in iter_bits(rooms(current, slot) & ~visited):
+                    visited |= 1 << room
+                    came_from[room] = current
+                    holder = room_course.get(room)
+                    if holder is not None:
+                        next_frontier.append(holder)
+                        continue
+                    # Free room: shift every course on the path one room along
+                    while True:
+                        current = came_from[room]
+                        previous = course_room.get(current)
+                        course_room[current] = room
+                        room_course[room] = current
+                        if current == course:
+                            return True
+                        room = previous
+            frontier = next_frontier
+        return False
+    
+    def _open_rooms(self, slot: int) -> int:
+        """Rooms an augmenting path can end through: free ones, and ones whose course can move to one"""
+        course_room = self.course_room[slot]
+        rooms = self._rooms
+        open_rooms = self.room_mask
+        for room in course_room.values():
+            open_rooms &= ~(1 << room)
+        changed = open_rooms != 0
+        while changed:
+            changed = False
+            for course, room in course_room.items():
+                bit = 1 << room
+                if not open_rooms & bit and rooms(course, slot) & open_rooms:
+                    open_rooms |= bit
+                    changed = True
+        return open_rooms
+    
+    def _propagate(self, course: int, value: int, assignment: Dict[int, int]) -> bool:
+        """Match course into its slot, then forward check instructors and the slot's rooms"""
+        compiled = self.compiled
+        domains = self.domains
+        sizes = domains.sizes
+        slot = value // compiled.num_rooms
+        slot_mask = compiled.slot_masks[slot]
+        
+        self._release_stale(slot, assignment)
+        if course not in self.course_room[slot] and not self._augment(slot, course):
+            return False
+        
+        instructor = compiled.course_instructor[course]
+        for other in compiled.instructor_courses[instructor]:
+            if other not in assignment:
+                removed = domains.remove(other, slot_mask)
+                if removed:
+                    self.pruned_values += removed
+                    if sizes[other] == 0:
+                        return False
+        
+        open_rooms = self._open_rooms(slot)
+        if open_rooms == self.room_mask:
+            # Every room is reachable: any course with a room here still fits
+            return True
+        for other in compiled.slot_courses[slot]:
+            if other in assignment or not domains.bits[other] & slot_mask:
+                continue
+            if not self._rooms(other, slot) & open_rooms:
+                self.pruned_values += domains.remove(other, slot_mask)
+                self.matching_prunes += 1
+                if sizes[other] == 0:
+                    return False
+        return True
+    
+    def _with_rooms(self, assignment: Dict[int, int]) -> Dict[int, int]:
+        """The complete slot assignment with each course's matched room"""
+        num_rooms = self.compiled.num_rooms
+        result = {}
+        for course, value in assignment.items():
+            slot = value // num_rooms
+            result[course] = slot * num_rooms + self.course_room[slot][course]
+        return result
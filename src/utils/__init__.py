@@ -2,5 +2,7 @@
 """Utility functions"""
 from .generator import TimetableGenerator
 from .visualizer import TimetableVisualizer
+from .problem_io import read_records, write_records, load_problem, write_solution_jsonl, read_solution_jsonl
 
-__all__ = ['TimetableGenerator', 'TimetableVisualizer']
\ No newline at end of file
+__all__ = ['TimetableGenerator', 'TimetableVisualizer', 'read_records', 'write_records', 'load_problem',
+           'write_solution_jsonl', 'read_solution_jsonl']
\ No newline at end of file
@@ -1,5 +1,11 @@
-from typing import List, Dict
+import math
+import os
+import random
+from typing import Iterable, List, Dict, Iterator, Optional, Tuple
 from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+from .problem_io import write_records
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
 class TimetableGenerator:
     @staticmethod
@@ -78,4 +84,147 @@ class TimetableGenerator:
             num_rooms=3,
             num_days=5,
             periods_per_day=8
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def stream_courses(num_courses: int, num_instructors: int, lab_fraction: float = 0.1,
+                       seed: int = 0) -> Iterator[Course]:
+        """Yield num_courses synthetic courses one at a time (same seed, same courses)"""
+        rng = random.Random(f"{seed}-courses")
+        for i in range(num_courses):
+            is_lab = rng.random() < lab_fraction
+            yield Course(
+                id=f"C{i:05d}",
+                name=f"Course {i} Lab" if is_lab else f"Course {i}",
+                instructor=f"Instructor {rng.randrange(num_instructors)}",
+                duration=3
+            )
+    
+    @staticmethod
+    def generate_scaled_problem(num_courses: int,
+                                num_rooms: Optional[int] = None,
+                                num_instructors: Optional[int] = None,
+                                num_days: int = 5,
+                                periods_per_day: int = 8,
+                                tightness: float = 0.8,
+                                availability: float = 0.8,
+                                preference_density: float = 0.1,
+                                preferred_slots: int = 3,
+                                lab_fraction: float = 0.1,
+                                seed: int = 0) -> TimetableProblem:
+        """Generate a seeded synthetic problem of any size.
+        
+        tightness: courses per (timeslot, room) cell; sets num_rooms if not given
+        availability: expected fraction of days each instructor can teach
+        preference_density: fraction of courses restricted to preferred_slots
+        timeslots on their instructor's available days
+        lab_fraction: fraction of courses needing a lab, and of rooms that are labs
+        
+        Each aspect draws from its own seeded stream, so changing one
+        parameter leaves the others' choices unchanged. The problem is built
+        in memory; write_scaled_problem streams the same instance to files.
+        """
+        timeslots, rooms, instructor_constraints, available_days, num_instructors = \
+            TimetableGenerator._scaled_resources(num_courses, num_rooms, num_instructors, num_days,
+                                                 periods_per_day, tightness, availability, lab_fraction, seed)
+        courses = list(TimetableGenerator.stream_courses(num_courses, num_instructors,
+                                                         lab_fraction, seed))
+        preferred_times = {}
+        for course, prefs in TimetableGenerator._stream_preferences(courses, available_days, periods_per_day,
+                                                                    preference_density, preferred_slots, seed):
+            if prefs is not None:
+                preferred_times[course.id] = prefs
+        return TimetableProblem(courses, timeslots, rooms, instructor_constraints, preferred_times)
+    
+    @staticmethod
+    def write_scaled_problem(directory: str, num_courses: int,
+                             num_rooms: Optional[int] = None,
+                             num_instructors: Optional[int] = None,
+                             num_days: int = 5,
+                             periods_per_day: int = 8,
+                             tightness: float = 0.8,
+                             availability: float = 0.8,
+                             preference_density: float = 0.1,
+                             preferred_slots: int = 3,
+                             lab_fraction: float = 0.1,
+                             seed: int = 0) -> Dict[str, str]:
+        """Write the generate_scaled_problem instance as JSON Lines files, course by course.
+        
+        Courses and preferences go straight from the seeded streams to
+        disk, so no list of num_courses records is built. Returns the
+        paths as load_problem keyword arguments.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {name: os.path.join(directory, f"{name}.jsonl")
+                 for name in ('courses', 'rooms', 'timeslots', 'unavailable', 'preferences')}
+        timeslots, rooms, instructor_constraints, available_days, num_instructors = \
+            TimetableGenerator._scaled_resources(num_courses, num_rooms, num_instructors, num_days,
+                                                 periods_per_day, tightness, availability, lab_fraction, seed)
+        
+        write_records(({'id': room.id, 'capacity': room.capacity, 'type': room.type} for room in rooms),
+                      paths['rooms'])
+        write_records(({'day': ts.day, 'period': ts.period} for ts in timeslots), paths['timeslots'])
+        write_records(({'instructor': name, 'day': day}
+                       for name, days in instructor_constraints.items() for day in days), paths['unavailable'])
+        
+        # Two passes over the same seeded course stream rather than one held list
+        courses = TimetableGenerator.stream_courses(num_courses, num_instructors, lab_fraction, seed)
+        write_records(({'id': c.id, 'name': c.name, 'instructor': c.instructor, 'duration': c.duration}
+                       for c in courses), paths['courses'])
+        courses = TimetableGenerator.stream_courses(num_courses, num_instructors, lab_fraction, seed)
+        preferences = TimetableGenerator._stream_preferences(courses, available_days, periods_per_day,
+                                                             preference_density, preferred_slots, seed)
+        write_records(({'course_id': course.id, 'day': day, 'period': period}
+                       for course, prefs in preferences if prefs is not None for day, period in prefs),
+                      paths['preferences'])
+        return paths
+    
+    @staticmethod
+    def _scaled_resources(num_courses: int, num_rooms: Optional[int], num_instructors: Optional[int],
+                          num_days: int, periods_per_day: int, tightness: float, availability: float,
+                          lab_fraction: float, seed: int):
+        """Timeslots, rooms, instructor_constraints, available days and instructor count of a scaled problem"""
+        days = DAYS[:num_days]
+        timeslots = [TimeSlot(day=day, period=period)
+                     for day in days for period in range(1, periods_per_day + 1)]
+        if num_rooms is None:
+            num_rooms = max(1, math.ceil(num_courses / (tightness * len(timeslots))))
+        if num_instructors is None:
+            num_instructors = max(1, round(num_courses / 3))
+        
+        # Generate rooms: labs first, at least one if any course may need it
+        num_labs = min(num_rooms, math.ceil(num_rooms * lab_fraction))
+        rng = random.Random(f"{seed}-rooms")
+        rooms = [Room(id=f"R{i:04d}", capacity=rng.choice([30, 40, 60, 100, 200]),
+                      type='lab' if i < num_labs else 'classroom')
+                 for i in range(num_rooms)]
+        
+        # Instructor constraints: each day unavailable with probability
+        # 1 - availability, keeping at least one day free
+        rng = random.Random(f"{seed}-availability")
+        instructor_constraints = {}
+        available_days = {}
+        for i in range(num_instructors):
+            instructor = f"Instructor {i}"
+            unavailable = [day for day in days if rng.random() >= availability]
+            if len(unavailable) == len(days):
+                unavailable.remove(rng.choice(days))
+            if unavailable:
+                instructor_constraints[instructor] = unavailable
+            available_days[instructor] = [day for day in days if day not in unavailable]
+        
+        return timeslots, rooms, instructor_constraints, available_days, num_instructors
+    
+    @staticmethod
+    def _stream_preferences(courses: Iterable[Course], available_days: Dict[str, List[str]],
+                            periods_per_day: int, preference_density: float, preferred_slots: int,
+                            seed: int) -> Iterator[Tuple[Course, Optional[List[Tuple[str, int]]]]]:
+        """(course, preferred slots or None) per course; preferences only name slots the instructor is available for"""
+        rng = random.Random(f"{seed}-preferences")
+        for course in courses:
+            prefs = None
+            if rng.random() < preference_density:
+                options = [(day, period) for day in available_days[course.instructor]
+                           for period in range(1, periods_per_day + 1)]
+                prefs = rng.sample(options, min(preferred_slots, len(options)))
+            yield course, prefs
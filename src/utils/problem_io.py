@@ -0,0 +1,129 @@
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from ..models.timetable import Course, TimeSlot, Room, TimetableProblem
+
+Assignment = Dict[Course, Tuple[TimeSlot, Room]]
+
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Rows of a CSV file (with a header line) or a JSON Lines file, one at a time"""
+    if path.endswith(JSONL_SUFFIXES):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith('.csv'):
+        with open(path, newline='') as f:
+            yield from csv.DictReader(f)
+    else:
+        raise ValueError(f"expected a .csv or .jsonl file, got {path!r}")
+
+def iter_courses(path: str) -> Iterator[Course]:
+    """Courses from rows with id, name, instructor and duration"""
+    intern = sys.intern
+    for row in read_records(path):
+        yield Course(id=row['id'], name=row['name'], instructor=intern(row['instructor']),
+                     duration=int(row['duration']))
+
+def iter_rooms(path: str) -> Iterator[Room]:
+    """Rooms from rows with id, capacity and type"""
+    intern = sys.intern
+    for row in read_records(path):
+        yield Room(id=row['id'], capacity=int(row['capacity']), type=intern(row['type']))
+
+def iter_timeslots(path: str) -> Iterator[TimeSlot]:
+    """Timeslots from rows with day and period"""
+    intern = sys.intern
+    for row in read_records(path):
+        yield TimeSlot(day=intern(row['day']), period=int(row['period']))
+
+def write_records(records: Iterable[Dict], path: str) -> int:
+    """Write records to a CSV or JSON Lines file as they come; returns the number written.
+    
+    The inverse of read_records: a CSV header is taken from the first
+    record's keys, and records may come from a generator, which is never
+    held in memory as a whole.
+    """
+    count = 0
+    if path.endswith(JSONL_SUFFIXES):
+        with open(path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write('\n')
+                count += 1
+    elif path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = None
+            for record in records:
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(record))
+                    writer.writeheader()
+                writer.writerow(record)
+                count += 1
+    else:
+        raise ValueError(f"expected a .csv or .jsonl file, got {path!r}")
+    return count
+
+def load_problem(courses: str, rooms: str, timeslots: str, unavailable: Optional[str] = None,
+                 preferences: Optional[str] = None) -> TimetableProblem:
+    """Build a TimetableProblem from CSV or JSON Lines files, reading them row by row.
+    
+    unavailable: rows of instructor and day, one per day an instructor cannot teach
+    preferences: rows of course_id, day and period, one per preferred timeslot
+    Repeated strings (instructors, days, room types) are interned, so each
+    is held once however many rows name it.
+    """
+    instructor_constraints: Dict[str, List[str]] = {}
+    if unavailable is not None:
+        for row in read_records(unavailable):
+            days = instructor_constraints.setdefault(sys.intern(row['instructor']), [])
+            day = sys.intern(row['day'])
+            if day not in days:
+                days.append(day)
+    
+    preferred_times: Dict[str, List[Tuple[str, int]]] = {}
+    if preferences is not None:
+        for row in read_records(preferences):
+            preferred_times.setdefault(row['course_id'], []).append(
+                (sys.intern(row['day']), int(row['period'])))
+    
+    return TimetableProblem(list(iter_courses(courses)), list(iter_timeslots(timeslots)),
+                            list(iter_rooms(rooms)), instructor_constraints, preferred_times)
+
+def _solution_record(course: Course, timeslot: TimeSlot, room: Room) -> Dict:
+    return {
+        'course_id': course.id,
+        'course_name': course.name,
+        'instructor': course.instructor,
+        'day': timeslot.day,
+        'period': timeslot.period,
+        'room': room.id
+    }
+
+def write_solution_jsonl(assignment: Union[Assignment, Iterable[Tuple[Course, Tuple[TimeSlot, Room]]]],
+                         filename: str) -> int:
+    """Write one JSON line per placement, as they come; returns the number written.
+    
+    assignment: a solution dict, or any iterable of (course, (timeslot, room))
+    pairs, e.g. a generator, which is never held in memory as a whole.
+    Records have the fields of TimetableVisualizer.save_timetable_to_file.
+    """
+    items = assignment.items() if isinstance(assignment, dict) else assignment
+    count = 0
+    with open(filename, 'w') as f:
+        for course, (timeslot, room) in items:
+            f.write(json.dumps(_solution_record(course, timeslot, room)))
+            f.write('\n')
+            count += 1
+    return count
+
+def read_solution_jsonl(filename: str, problem: TimetableProblem) -> Assignment:
+    """Read a JSON Lines timetable back onto problem's courses, timeslots and rooms"""
+    courses = {c.id: c for c in problem.courses}
+    timeslots = {(ts.day, ts.period): ts for ts in problem.timeslots}
+    rooms = {room.id: room for room in problem.rooms}
+    return {courses[r['course_id']]: (timeslots[(r['day'], r['period'])], rooms[r['room']])
+            for r in read_records(filename)}
@@ -4,6 +4,7 @@ from typing import Dict, List, Tuple
 from ..models.timetable import Course, TimeSlot, Room
 import json
 from tabulate import tabulate
+from .problem_io import JSONL_SUFFIXES, write_solution_jsonl
 
 class TimetableVisualizer:
     @staticmethod
@@ -42,7 +43,12 @@ class TimetableVisualizer:
     @staticmethod
     def save_timetable_to_file(assignment: Dict[Course, Tuple[TimeSlot, Room]], 
                                filename: str):
-        """Save timetable to JSON file"""
+        """Save timetable to JSON file; a .jsonl filename streams JSON Lines instead"""
+        if filename.endswith(JSONL_SUFFIXES):
+            write_solution_jsonl(assignment, filename)
+            print(f"Timetable saved to {filename}")
+            return
+        
         data = []
         for course, (timeslot, room) in assignment.items():
             data.append({
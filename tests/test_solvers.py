@@ -7,10 +7,31 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.models.timetable import Course, TimeSlot, Room, TimetableProblem
+from src.models.timetable import Course, TimeSlot, Room, TimetableProblem, ChangeSet, SoftConstraints
+from src.models.constraints import ConstraintChecker
+from src.models.occupancy import OccupancyIndex
+from src.models.compiled import CompiledProblem
+from src.models.binary import save_binary, load_binary
+from src.models.blocks import CompiledBlocks, block_patterns
+from src.solvers.domains import BitsetDomains
+from src.solvers.mrv import MRVQueue
+from src.solvers.search import luby
+from src.solvers.nogoods import NogoodCache
 from src.solvers.backtracking_heuristics import BacktrackingWithHeuristics
 from src.solvers.backtracking_forward_checking import BacktrackingWithForwardChecking
+from src.solvers.maintaining_arc_consistency import MaintainingArcConsistency
+from src.solvers.slot_matching import SlotMatchingSolver
+from src.solvers.block_forward_checking import BlockForwardChecking
+from src.solvers.branch_and_bound import BranchAndBoundSolver
+from src.solvers.portfolio import PortfolioSolver, SolverConfig
+from src.solvers.local_search import LocalSearchSolver
+from src.solvers.incremental import IncrementalSolver
+from src.solvers.decomposition import DecomposedSolver, find_components
+from src.solvers.instrumentation import Instrumentation
+from src.solvers.cache import SolutionCache
+from src.solvers.capacity import capacity_conflict
 from src.utils.generator import TimetableGenerator
+from src.utils.problem_io import load_problem, write_solution_jsonl, read_solution_jsonl
 
 def test_small_problem_heuristics():
     """Test heuristics solver on small problem"""
@@ -70,6 +91,784 @@ def test_metrics_collected():
     assert 'nodes_explored' in metrics2
     assert 'pruned_values' in metrics2
 
+def test_occupancy_index_matches_scan():
+    """Test that indexed conflict checks agree with the linear scan"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=6, num_rooms=3)
+    solver = BacktrackingWithHeuristics(problem)
+    solution, _ = solver.solve()
+    assert solution is not None
+    
+    # Leave the last course unassigned so it has candidates to check
+    partial = dict(list(solution.items())[:-1])
+    occupancy = OccupancyIndex(partial)
+    for course in problem.variables:
+        for timeslot, room in problem.get_domain(course):
+            expected = ConstraintChecker.check_all_constraints(problem, partial, course,
+                                                               timeslot, room)
+            indexed = ConstraintChecker.check_all_constraints(problem, partial, course,
+                                                              timeslot, room, occupancy)
+            assert expected == indexed, f"Mismatch for {course} at {timeslot}/{room}"
+
+def test_compiled_problem_encoding():
+    """Test that compiled domains decode to valid, preference-filtered values"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=6, num_rooms=3)
+    compiled = CompiledProblem(problem)
+    
+    assert compiled.num_courses == len(problem.variables)
+    assert compiled.num_values == len(problem.timeslots) * len(problem.rooms)
+    for index, course in enumerate(compiled.courses):
+        decoded = [compiled.decode_value(v) for v in compiled.domains[index]]
+        assert all(value in problem.get_domain(course) for value in decoded)
+        assert all(ConstraintChecker.check_all_constraints(problem, {}, course, ts, r)
+                   for ts, r in decoded), "Compiled domain should satisfy unary constraints"
+        
+        # CS101 prefers only Monday P1
+        if course.id == "CS101":
+            assert {(ts.day, ts.period) for ts, _ in decoded} == {("Monday", 1)}
+
+def test_vectorized_domain_mask():
+    """Test that the vectorized masks agree with the per-triple checks"""
+    problem = TimetableGenerator.generate_scaled_problem(60, availability=0.6, preference_density=0.3,
+                                                         lab_fraction=0.3, seed=2)
+    unary, mask = problem.unary_mask, problem.domain_mask
+    assert mask.shape == (60, len(problem.timeslots), len(problem.rooms)) and mask.dtype == bool
+    for i, course in enumerate(problem.courses):
+        for s, timeslot in enumerate(problem.timeslots):
+            for r, room in enumerate(problem.rooms):
+                assert unary[i, s, r] == problem._is_valid_domain(course, timeslot, room)
+                assert mask[i, s, r] == problem.allows(course, timeslot, room)
+    
+    # Domains are read off the mask lazily; given domains override their rows
+    course = problem.courses[0]
+    assert problem.get_domain(course) == [(ts, room) for ts in problem.timeslots for room in problem.rooms
+                                          if problem._is_valid_domain(course, ts, room)]
+    given = problem.get_domain(course)[:3]
+    sub = TimetableProblem([course], problem.timeslots, problem.rooms, problem.instructor_constraints,
+                           domains={course: given})
+    assert sub.domains == {course: given} and sub.domain_mask.sum() == 3
+
+def test_bitset_domains_undo():
+    """Test that trail undo restores domains exactly and in order"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=4, num_rooms=3)
+    compiled = CompiledProblem(problem)
+    domains = BitsetDomains(compiled)
+    before = [list(domains.values(c)) for c in range(compiled.num_courses)]
+    
+    mark = domains.mark()
+    removed = domains.remove(2, compiled.slot_masks[0]) + domains.remove(3, 1 << before[3][0])
+    assert removed > 0
+    assert domains.sizes[3] == len(before[3]) - 1
+    
+    domains.undo(mark)
+    assert [list(domains.values(c)) for c in range(compiled.num_courses)] == before
+    assert domains.sizes == [len(values) for values in before]
+
+def test_mrv_queue_ordering():
+    """Test MRV selection by remaining values, then instructor degree"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=12, num_rooms=3)
+    compiled = CompiledProblem(problem)
+    domains = BitsetDomains(compiled)
+    queue = MRVQueue(compiled, domains.sizes)
+    domains.on_change = queue.update
+    
+    def expected():
+        unassigned = [c for c in range(compiled.num_courses) if not queue.assigned[c]]
+        return min(unassigned, key=lambda c: (domains.sizes[c], -compiled.course_degree[c], c))
+    
+    assert queue.select() == expected()
+    
+    # Shrink a large domain below everyone else's, then undo
+    mark = domains.mark()
+    domains.remove(11, domains.bits[11] & ~(1 << next(domains.values(11))))
+    assert queue.select() == 11
+    domains.undo(mark)
+    assert queue.select() == expected()
+    
+    first = queue.select()
+    queue.remove(first)
+    assert queue.select() != first
+    queue.restore(first)
+    assert queue.select() == first
+
+def test_lcv_modes():
+    """Test approximate LCV scores and solutions, and that bad modes are rejected"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=6, num_rooms=3)
+    solution, metrics = BacktrackingWithHeuristics(problem, lcv='approx').solve()
+    
+    assert solution is not None and metrics['success']
+    occupancy = OccupancyIndex()
+    for course, (timeslot, room) in solution.items():
+        assert ConstraintChecker.check_all_constraints(problem, {}, course, timeslot, room,
+                                                       occupancy)
+        occupancy.assign(course, timeslot, room)
+    
+    try:
+        BacktrackingWithHeuristics(problem, lcv='fastest')
+        assert False, "Unknown LCV mode should raise"
+    except ValueError:
+        pass
+    
+    # Approximate scores are the exact counts, plus same-instructor courses wanting the exact value again
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=3)
+    solver = BacktrackingWithHeuristics(problem, lcv='approx')
+    solver.rng = solver.capacity = None
+    solver._init_search(solver._compile())
+    solver._prepare()
+    compiled, bits = solver.compiled, solver.domains.bits
+    assignment = {}
+    while len(assignment) < 4:
+        course = solver._select_variable(assignment)
+        solver._enter(course)
+        siblings = [other for other in compiled.instructor_courses[compiled.course_instructor[course]]
+                    if other != course and other not in assignment]
+        for value in solver.domains.values(course):
+            twice = sum(bits[other] >> value & 1 for other in siblings)
+            assert solver.counters.score(course, value) == solver._count_constraints(course, value, assignment) + twice
+        value = next(solver.domains.values(course))
+        assignment[course] = value
+        solver._propagate(course, value, assignment)
+
+def test_mac_solver():
+    """Test MAC solves small problems and quickly proves conflicting preferences infeasible"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=4, num_rooms=3)
+    solution, metrics = MaintainingArcConsistency(problem).solve()
+    assert solution is not None, "Should find solution for small problem"
+    assert len(solution) == len(problem.variables)
+    
+    # CS101, CS102 and CS104 all need Monday P1 but there are only 2 rooms
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    solution, metrics = MaintainingArcConsistency(problem).solve()
+    assert solution is None
+    assert metrics['success'] == False
+    assert metrics['nodes_explored'] <= 3, "Propagation should fail within a few nodes"
+
+def test_symmetry_breaking():
+    """Test that interchangeable rooms and slots are detected and tried once per decision"""
+    problem = TimetableGenerator.generate_scaled_problem(30, num_rooms=6, lab_fraction=0.3,
+                                                         preference_density=0.2, seed=4)
+    compiled = CompiledProblem(problem)
+    labs = [r for r, room in enumerate(problem.rooms) if room.type == 'lab']
+    assert len({compiled.room_class[r] for r in labs}) == 1
+    assert all(compiled.room_class[r] != compiled.room_class[labs[0]]
+               for r in range(6) if r not in labs)
+    assert all(compiled.slot_class[s] <= s for s in range(compiled.num_slots))
+    
+    # Same first solution either way: skipped values would have failed
+    for solver_class in (BacktrackingWithForwardChecking, MaintainingArcConsistency):
+        plain, _ = solver_class(problem, symmetry_breaking=False).solve()
+        broken, _ = solver_class(problem).solve()
+        assert plain == broken
+    
+    # 7 courses for 2 slots x 3 identical rooms: pigeonhole refuted without permuting rooms
+    timeslots = [TimeSlot(day="Monday", period=p) for p in (1, 2)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(3)]
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor=f"Dr. {i}", duration=3)
+               for i in range(7)]
+    pigeonhole = TimetableProblem(courses, timeslots, rooms, {})
+    plain, plain_metrics = BacktrackingWithForwardChecking(pigeonhole, symmetry_breaking=False,
+                                                           capacity_pruning=False).solve()
+    broken, metrics = BacktrackingWithForwardChecking(pigeonhole, capacity_pruning=False).solve()
+    assert plain is None and broken is None and metrics['symmetric_skips'] > 0
+    assert metrics['nodes_explored'] * 10 < plain_metrics['nodes_explored']
+
+def test_search_deeper_than_recursion_limit():
+    """Test that search depth is not bounded by the interpreter recursion limit"""
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor=f"Dr. {i % 50}", duration=3)
+               for i in range(200)]
+    timeslots = [TimeSlot(day=day, period=p) for day in ["Monday", "Tuesday"] for p in range(1, 9)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(16)]
+    problem = TimetableProblem(courses, timeslots, rooms, {})
+    
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(150)
+    try:
+        for solver_class in (BacktrackingWithForwardChecking, MaintainingArcConsistency):
+            solution, metrics = solver_class(problem).solve()
+            assert solution is not None and len(solution) == len(courses)
+            assert 'pruned_values' in metrics
+    finally:
+        sys.setrecursionlimit(limit)
+
+def test_seeded_value_order():
+    """Test that seeded solvers are reproducible and still valid"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=12, num_rooms=4)
+    for solver_class in (BacktrackingWithHeuristics, BacktrackingWithForwardChecking,
+                         MaintainingArcConsistency):
+        first, _ = solver_class(problem, seed=7).solve()
+        second, _ = solver_class(problem, seed=7).solve()
+        assert first is not None and first == second, "Same seed should give same timetable"
+
+def test_restarts_and_budget():
+    """Test restart schedules and the node budget's partial-progress metrics"""
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+    
+    problem = TimetableGenerator.generate_sample_problem(num_courses=12, num_rooms=4)
+    solution, metrics = BacktrackingWithForwardChecking(problem).solve(max_nodes=3)
+    assert solution is None and metrics['budget_exhausted'], "Budget should stop the search"
+    assert metrics['nodes_explored'] == 3 and metrics['best_depth'] == 3
+    assert metrics['progress'] == 0.25
+    
+    for restarts in ('luby', 'geometric'):
+        solver = MaintainingArcConsistency(problem, restarts=restarts, restart_base=1)
+        solution, metrics = solver.solve()
+        assert solution is not None and metrics['progress'] == 1.0
+    
+    # Restarts still terminate, with growing run limits, on an infeasible instance
+    infeasible = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    solver = BacktrackingWithHeuristics(infeasible, restarts='luby', restart_base=1, capacity_pruning=False)
+    solution, metrics = solver.solve()
+    assert solution is None and metrics['restarts'] > 0 and not metrics['budget_exhausted']
+    
+    try:
+        BacktrackingWithForwardChecking(problem, restarts='linear')
+        assert False, "Unknown restart schedule should be rejected"
+    except ValueError:
+        pass
+
+def test_backjumping_and_nogoods():
+    """Test that backjumping agrees with chronological search and nogoods are bounded"""
+    for num_courses, num_rooms in [(4, 3), (8, 2), (10, 2), (12, 4)]:
+        problem = TimetableGenerator.generate_sample_problem(num_courses=num_courses,
+                                                             num_rooms=num_rooms)
+        for solver_class in (BacktrackingWithHeuristics, BacktrackingWithForwardChecking):
+            plain, _ = solver_class(problem).solve()
+            jumping, metrics = solver_class(problem, backjumping=True).solve()
+            assert plain == jumping, "Backjumping must not change the first solution"
+            assert metrics['backjumps'] <= metrics['backtracks'] + metrics['levels_skipped']
+    
+    cache = NogoodCache(max_size=2, max_length=2)
+    assert cache.add(((0, 5), (1, 7)))
+    assert not cache.add(((0, 1), (1, 2), (2, 3))), "Too long to store"
+    assert cache.find(1, 7, {0: 5}) == ((0, 5), (1, 7))
+    assert cache.find(1, 7, {0: 4}) is None
+    cache.add(((2, 1),))
+    cache.add(((3, 1),))  # evicts the least recently used nogood
+    assert len(cache) == 2 and cache.find(1, 7, {0: 5}) is None
+    assert cache.find(3, 1, {}) == ((3, 1),)
+
+def test_scaled_generator():
+    """Test that the scaled generator is reproducible and honours its parameters"""
+    first = TimetableGenerator.generate_scaled_problem(300, periods_per_day=6, tightness=0.5,
+                                                       preference_density=0.2, seed=3)
+    second = TimetableGenerator.generate_scaled_problem(300, periods_per_day=6, tightness=0.5,
+                                                        preference_density=0.2, seed=3)
+    assert len(first.courses) == 300 and first.courses == second.courses
+    assert first.preferred_times == second.preferred_times
+    assert first.instructor_constraints == second.instructor_constraints
+    assert len(first.rooms) == 20, "300 courses at 0.5 per cell over 30 slots need 20 rooms"
+    
+    for course_id, slots in first.preferred_times.items():
+        course = next(c for c in first.courses if c.id == course_id)
+        unavailable = first.instructor_constraints.get(course.instructor, [])
+        assert all(day not in unavailable for day, _ in slots)
+    
+    other = TimetableGenerator.generate_scaled_problem(300, periods_per_day=6, tightness=0.5,
+                                                       preference_density=0.0, seed=3)
+    assert other.courses == first.courses and not other.preferred_times
+    
+    streamed = TimetableGenerator.stream_courses(20000, 5000)
+    assert sum(1 for _ in streamed) == 20000
+    
+    # Streamed to files, course by course, the same instance loads back
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        paths = TimetableGenerator.write_scaled_problem(directory, 300, periods_per_day=6, tightness=0.5,
+                                                        preference_density=0.2, seed=3)
+        loaded = load_problem(**paths)
+    assert loaded.fingerprint() == first.fingerprint()
+    assert loaded.preferred_times == first.preferred_times and loaded.courses == first.courses
+
+def test_local_search():
+    """Test that local search returns valid, reproducible, possibly partial timetables"""
+    problem = TimetableGenerator.generate_scaled_problem(200, num_instructors=40,
+                                                         availability=0.6, seed=1)
+    solution, metrics = LocalSearchSolver(problem, seed=3).solve(timeout=5)
+    assert metrics['success'] and metrics['violations'] == 0
+    assert len(solution) == 200
+    
+    # Course i may only take period i or i + 1 (cyclically) of one room:
+    # the greedy start clashes and has to be repaired
+    timeslots = [TimeSlot(day=day, period=p) for day in ["Monday", "Tuesday"] for p in range(1, 6)]
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor=f"Dr. {i}", duration=3)
+               for i in range(10)]
+    preferred = {f"C{i}": [(ts.day, ts.period) for ts in (timeslots[i], timeslots[(i + 1) % 10])]
+                 for i in range(10)}
+    cycle = TimetableProblem(courses, timeslots, [Room(id="R1", capacity=40, type='classroom')],
+                             {}, preferred)
+    repaired, metrics = LocalSearchSolver(cycle, seed=1).solve(timeout=5)
+    assert metrics['success'] and metrics['nodes_explored'] > 0 and len(repaired) == 10
+    
+    assignment = {}
+    for course, (timeslot, room) in solution.items():
+        assert ConstraintChecker.check_all_constraints(problem, assignment, course, timeslot, room)
+        assignment[course] = (timeslot, room)
+    
+    again, _ = LocalSearchSolver(problem, seed=3).solve(timeout=5)
+    assert again == solution, "Same seed should give same timetable"
+    
+    # Infeasible: the best effort comes back clash-free but partial
+    infeasible = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    partial, metrics = LocalSearchSolver(infeasible).solve(timeout=1, max_steps=2000)
+    assert not metrics['success'] and 0 < metrics['assigned'] < 8
+    assert metrics['nodes_explored'] <= 2000
+    assignment = {}
+    for course, (timeslot, room) in partial.items():
+        assert ConstraintChecker.check_all_constraints(infeasible, assignment, course, timeslot, room)
+        assignment[course] = (timeslot, room)
+
+def test_incremental_resolve():
+    """Test that re-solving after a change keeps valid assignments and matches a fresh build"""
+    problem = TimetableGenerator.generate_scaled_problem(100, tightness=0.7, seed=1)
+    solution, _ = BacktrackingWithForwardChecking(problem).solve()
+    solver = IncrementalSolver(problem, solution)
+    
+    course = problem.courses[0]
+    day = solution[course][0].day
+    changes = ChangeSet(unavailable={course.instructor: [day]},
+                        remove_courses=[problem.courses[5].id],
+                        add_courses=[Course(id="NEW1", name="Extra", instructor=course.instructor, duration=3)])
+    updated, metrics = solver.resolve(changes)
+    assert metrics['success'] and metrics['displaced'] >= 2
+    assert solver.problem is not problem and len(updated) == len(problem.courses)
+    
+    # Only freed courses may move; every other kept course holds its slot and room
+    assert metrics['moved'] <= metrics['freed']
+    unchanged = sum(1 for c, v in updated.items() if solution.get(c) == v)
+    assert unchanged >= metrics['kept'] - (metrics['freed'] - metrics['displaced'])
+    assignment = {}
+    for c, (timeslot, room) in updated.items():
+        assert ConstraintChecker.check_all_constraints(solver.problem, assignment, c, timeslot, room)
+        assert timeslot.day != day or c.instructor != course.instructor
+        assignment[c] = (timeslot, room)
+    
+    # Domains updated in place of a rebuild match a rebuild
+    rebuilt = TimetableProblem(solver.problem.courses, solver.problem.timeslots, solver.problem.rooms,
+                               solver.problem.instructor_constraints, solver.problem.preferred_times)
+    assert rebuilt.domains == solver.problem.domains
+    
+    # Losing a room makes this instance infeasible: the change sticks, the timetable does not
+    room = problem.rooms[0].id
+    failed, metrics = solver.resolve(ChangeSet(remove_rooms=[room]))
+    assert failed is None and metrics['full_resolve']
+    assert room not in [r.id for r in solver.problem.rooms] and solver.solution == updated
+
+def test_apply_changes_keeps_given_domains():
+    """Test that explicit domains survive an availability change, filtered by it"""
+    timeslots = [TimeSlot(day=day, period=1) for day in ("Mon", "Tue")]
+    lab, room = Room(id="Lab", capacity=30, type='lab'), Room(id="R1", capacity=30, type='classroom')
+    course = Course(id="C1", name="Course 1", instructor="Dr A", duration=1)
+    other = Course(id="C2", name="Course 2", instructor="Dr B", duration=1)
+    problem = TimetableProblem([course, other], timeslots, [lab, room], {},
+                               domains={course: [(timeslots[0], lab), (timeslots[1], lab)]})
+    
+    updated = problem.apply_changes(ChangeSet(unavailable={"Dr A": ["Mon"]}))
+    assert updated.get_domain(course) == [(timeslots[1], lab)]
+    assert updated.get_domain(other) == problem.get_domain(other)
+    assert updated.domain_mask[0].sum() == 1
+    
+    # Available again: the restriction stays; removing its room empties it
+    restored = updated.apply_changes(ChangeSet(available={"Dr A": ["Mon"]}))
+    assert restored.get_domain(course) == [(timeslots[1], lab)]
+    assert problem.apply_changes(ChangeSet(unavailable={"Dr A": ["Tue"]}, remove_rooms=["Lab"])).get_domain(course) == []
+
+def test_decomposition():
+    """Test that independent departments are split, solved apart and merged"""
+    timeslots = [TimeSlot(day=day, period=p) for day in ["Monday", "Tuesday"] for p in range(1, 4)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(6)]
+    courses, domains = [], {}
+    for d in range(3):
+        # Each department teaches in its own two rooms; department 2 shares instructors with 1
+        for i in range(4):
+            course = Course(id=f"D{d}C{i}", name=f"Course {i}",
+                            instructor=f"Dr. {min(d, 1)}-{i % 2}", duration=3)
+            courses.append(course)
+            domains[course] = [(ts, room) for ts in timeslots for room in rooms[2 * d:2 * d + 2]]
+    problem = TimetableProblem(courses, timeslots, rooms, {}, domains=domains)
+    
+    components = find_components(problem)
+    assert [len(c) for c in components] == [8, 4]
+    assert {c.id[:2] for c in components[0]} == {"D1", "D2"}
+    
+    for options in ({}, {'max_workers': 2, 'parallel_min_courses': 1}):
+        solution, metrics = DecomposedSolver(problem, **options).solve()
+        assert metrics['success'] and metrics['components'] == 2 and len(solution) == 12
+        assert metrics['parallel_components'] == (2 if options else 0)
+        assignment = {}
+        for course, (timeslot, room) in solution.items():
+            assert ConstraintChecker.check_all_constraints(problem, assignment, course, timeslot, room)
+            assert (timeslot, room) in problem.get_domain(course)
+            assignment[course] = (timeslot, room)
+    
+    # Seven courses for one instructor with six slots: no timetable for the whole problem
+    busy = [Course(id=f"B{i}", name=f"Course {i}", instructor="Dr. Busy", duration=3) for i in range(7)]
+    domains.update((course, domains[courses[0]]) for course in busy)
+    solution, metrics = DecomposedSolver(TimetableProblem(courses + busy, timeslots, rooms, {},
+                                                          domains=domains)).solve()
+    assert solution is None and not metrics['success']
+
+def test_instrumentation():
+    """Test per-phase timings, constraint counters, depth histogram and progress events"""
+    import json
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=3)
+    for solver_class, options, primitive in (
+            (BacktrackingWithHeuristics, {}, 'count_constraints'),
+            (BacktrackingWithHeuristics, {'lcv': 'approx'}, 'contention_score'),
+            (BacktrackingWithForwardChecking, {}, 'prune_conflicts'),
+            (MaintainingArcConsistency, {}, 'domain_remove')):
+        events = []
+        instrumentation = Instrumentation(progress_callback=events.append, progress_interval=0)
+        solution, metrics = solver_class(problem, **options).solve(instrumentation=instrumentation)
+        plain, _ = solver_class(problem, **options).solve()
+        assert solution == plain
+        
+        report = json.loads(instrumentation.to_json())
+        assert {'compile', 'prepare', 'select_variable', 'order_values', 'propagate'} <= set(report['phases'])
+        assert report['phases']['select_variable']['calls'] == metrics['nodes_explored']
+        assert sum(report['depth_histogram']) == metrics['nodes_explored']
+        assert report['constraint_calls'][primitive] > 0
+        assert events and events[-1]['nodes'] == metrics['nodes_explored']
+        assert report['events'] == events
+
+def test_solution_cache():
+    """Test fingerprints under reordering, cache hits, infeasibility proofs and eviction"""
+    import tempfile
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=3)
+    reordered = TimetableProblem(problem.courses[::-1], problem.timeslots[::-1], problem.rooms[::-1],
+                                 problem.instructor_constraints, problem.preferred_times)
+    assert reordered.fingerprint() == problem.fingerprint()
+    changed = problem.apply_changes(ChangeSet(remove_rooms=[problem.rooms[0].id]))
+    assert changed.fingerprint() != problem.fingerprint()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SolutionCache(directory)
+        solution, metrics = BacktrackingWithForwardChecking(problem).solve(cache=cache)
+        assert metrics['cache_hit'] == False and metrics['nodes_explored'] > 0
+        searched = set(metrics)
+        
+        # Another solver, reordered inputs, a fresh process's view of the directory
+        cached, metrics = MaintainingArcConsistency(reordered).solve(cache=SolutionCache(directory))
+        assert metrics['cache_hit'] and metrics['nodes_explored'] == 0 and metrics['success']
+        assert cached == solution
+        # A hit reports every key a search does, with the counters zeroed
+        assert set(metrics) == searched and metrics['progress'] == 1.0
+        assert metrics['restarts'] == metrics['capacity_prunes'] == 0 and metrics['capacity_conflict'] is None
+        _, metrics = SlotMatchingSolver(reordered).solve(cache=cache)
+        assert metrics['cache_hit'] and metrics['matching_prunes'] == 0
+        
+        # Proved infeasible once, answered from the cache afterwards; a budgeted miss proves nothing
+        infeasible = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+        solution, metrics = BacktrackingWithHeuristics(infeasible, capacity_pruning=False).solve(
+            cache=cache, max_nodes=1)
+        assert solution is None and metrics['budget_exhausted'] and cache.get(infeasible) is None
+        _, searched = BacktrackingWithHeuristics(infeasible).solve(cache=cache)
+        solution, metrics = BacktrackingWithHeuristics(infeasible).solve(cache=cache)
+        assert solution is None and metrics['cache_hit'] and not metrics['success']
+        assert set(metrics) == set(searched) and metrics['progress'] == 0.0
+        
+        # Least recently used entries go first once the files outgrow max_bytes
+        small = SolutionCache(directory, max_bytes=2 * cache.sizes[problem.fingerprint()] + 32)
+        assert small.get(problem).feasible
+        first = problem.timeslots[0]
+        other = TimetableProblem(problem.courses, problem.timeslots, problem.rooms, problem.instructor_constraints,
+                                 {problem.courses[0].id: [(first.day, first.period)]})
+        BacktrackingWithForwardChecking(other).solve(cache=small)
+        assert small.evictions == 1 and small.get(infeasible) is None
+        assert small.get(problem) is not None and small.get(other) is not None
+        assert len(small) == len(os.listdir(directory)) == 2
+
+def test_problem_io():
+    """Test CSV/JSONL loading, JSONL solutions and the bit-packed binary format"""
+    import csv
+    import json
+    import pickle
+    import tempfile
+    import numpy as np
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=3)
+    solution, _ = BacktrackingWithForwardChecking(problem).solve()
+    tables = {
+        'courses': (['id', 'name', 'instructor', 'duration'],
+                    [[c.id, c.name, c.instructor, c.duration] for c in problem.courses]),
+        'rooms': (['id', 'capacity', 'type'], [[r.id, r.capacity, r.type] for r in problem.rooms]),
+        'timeslots': (['day', 'period'], [[ts.day, ts.period] for ts in problem.timeslots]),
+        'unavailable': (['instructor', 'day'],
+                        [[name, day] for name, days in problem.instructor_constraints.items() for day in days]),
+        'preferences': (['course_id', 'day', 'period'],
+                        [[cid, day, period] for cid, prefs in problem.preferred_times.items()
+                         for day, period in prefs])
+    }
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in ('.csv', '.jsonl'):
+            paths = {}
+            for name, (header, rows) in tables.items():
+                paths[name] = os.path.join(directory, name + suffix)
+                with open(paths[name], 'w', newline='') as f:
+                    if suffix == '.csv':
+                        writer = csv.writer(f)
+                        writer.writerow(header)
+                        writer.writerows(rows)
+                    else:
+                        f.writelines(json.dumps(dict(zip(header, row))) + '\n' for row in rows)
+            loaded = load_problem(**paths)
+            assert loaded.fingerprint() == problem.fingerprint()
+            assert BacktrackingWithForwardChecking(loaded).solve()[0] == solution
+        
+        path = os.path.join(directory, 'solution.jsonl')
+        assert write_solution_jsonl(iter(solution.items()), path) == len(solution)
+        assert read_solution_jsonl(path, problem) == solution
+        
+        # Explicit domains and masks survive; the reopened problem pickles as its path
+        first = problem.courses[0]
+        restricted = TimetableProblem(problem.courses, problem.timeslots, problem.rooms,
+                                      problem.instructor_constraints, problem.preferred_times,
+                                      domains={first: problem.get_domain(first)[-1:]})
+        save_binary(restricted, os.path.join(directory, 'problem'))
+        opened = load_binary(os.path.join(directory, 'problem'))
+        # The stored fingerprint, and the one the reopened problem recomputes
+        assert opened.fingerprint() == restricted.fingerprint()
+        opened._fingerprint = None
+        assert opened.fingerprint() == restricted.fingerprint()
+        expected, _ = BacktrackingWithForwardChecking(restricted).solve()
+        assert BacktrackingWithForwardChecking(opened).solve()[0] == expected
+        # Compiling and solving read the mapped packed rows, never the whole bool mask
+        assert isinstance(opened.domain_rows, np.memmap) and opened._domain_mask is None
+        assert (opened.domain_mask == restricted.domain_mask).all()
+        assert (opened.unary_mask == restricted.unary_mask).all()
+        assert opened.get_domain(first) == restricted.get_domain(first)
+        reference = pickle.dumps(opened)
+        assert len(reference) < 200
+        assert BacktrackingWithForwardChecking(pickle.loads(reference)).solve()[0] == expected
+
+def test_slot_matching():
+    """Test slot-only search with rooms matched per slot"""
+    timeslots = [TimeSlot(day="Monday", period=p) for p in (1, 2)]
+    rooms = [Room(id="R1", capacity=40, type='classroom'), Room(id="R2", capacity=40, type='classroom'),
+             Room(id="L1", capacity=30, type='lab')]
+    labs = [Course(id=f"L{i}", name=f"Chemistry Lab {i}", instructor=f"Dr. L{i}", duration=3) for i in range(3)]
+    lectures = [Course(id=f"C{i}", name=f"Lecture {i}", instructor=f"Dr. C{i}", duration=3) for i in range(4)]
+    
+    # Two labs and four lectures fill both slots exactly; a lecture must never hold the lab
+    problem = TimetableProblem(lectures + labs[:2], timeslots, rooms, {})
+    solution, metrics = SlotMatchingSolver(problem).solve()
+    assert metrics['success'] and len(solution) == 6
+    assignment = {}
+    for course, (timeslot, room) in solution.items():
+        assert ConstraintChecker.check_all_constraints(problem, assignment, course, timeslot, room)
+        assert (timeslot, room) in problem.get_domain(course)
+        assignment[course] = (timeslot, room)
+    
+    # Three labs for one lab room in two slots: refuted once a slot's lab is matched
+    problem = TimetableProblem(lectures[:1] + labs, timeslots, rooms, {})
+    solution, metrics = SlotMatchingSolver(problem).solve()
+    assert solution is None and not metrics['budget_exhausted']
+    assert metrics['matching_prunes'] > 0
+    
+    # Same answers as (slot, room) search on generated instances
+    for seed in range(1, 4):
+        problem = TimetableGenerator.generate_scaled_problem(40, tightness=0.9, num_instructors=5,
+                                                             availability=0.6, lab_fraction=0.3, seed=seed)
+        solution, _ = SlotMatchingSolver(problem).solve()
+        assert solution is not None and BacktrackingWithForwardChecking(problem).solve()[0] is not None
+        assignment = {}
+        for course, (timeslot, room) in solution.items():
+            assert ConstraintChecker.check_all_constraints(problem, assignment, course, timeslot, room)
+            assignment[course] = (timeslot, room)
+    
+    # Lab contention: refuted quickly, where (slot, room) search is still thrashing
+    problem = TimetableGenerator.generate_scaled_problem(40, tightness=0.9, num_instructors=5,
+                                                         availability=0.6, lab_fraction=0.3, seed=0)
+    solution, metrics = SlotMatchingSolver(problem).solve(max_nodes=5000)
+    assert solution is None and not metrics['budget_exhausted']
+    assert BacktrackingWithForwardChecking(problem, capacity_pruning=False).solve(
+        max_nodes=5000)[1]['budget_exhausted']
+
+def test_capacity_pruning():
+    """Test pigeonhole refutations before search and counting prunes during it"""
+    # CS101, CS102 and CS104 can only meet Monday period 1, which has 2 rooms
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    assert "Monday" in capacity_conflict(problem)
+    for solver_class in (BacktrackingWithHeuristics, BacktrackingWithForwardChecking,
+                         MaintainingArcConsistency, SlotMatchingSolver):
+        solution, metrics = solver_class(problem).solve()
+        assert solution is None and metrics['nodes_explored'] == 0
+        assert metrics['capacity_conflict'] and not metrics['budget_exhausted']
+    assert capacity_conflict(TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=3)) is None
+    
+    # One instructor, three courses, two slots: found by matching courses to slots
+    timeslots = [TimeSlot(day="Monday", period=p) for p in (1, 2)]
+    rooms = [Room(id=f"R{i}", capacity=40, type='classroom') for i in range(3)]
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor="Dr. Busy", duration=3) for i in range(3)]
+    assert "Dr. Busy" in capacity_conflict(TimetableProblem(courses, timeslots, rooms, {}))
+    assert capacity_conflict(TimetableProblem(courses[:2], timeslots, rooms, {})) is None
+    
+    # Same answers with and without it; counting refutes what search alone cannot within budget
+    pruned = 0
+    for seed in range(6):
+        problem = TimetableGenerator.generate_scaled_problem(30, tightness=0.95, num_instructors=4,
+                                                             availability=0.6, lab_fraction=0.3, seed=seed)
+        for solver_class in (BacktrackingWithForwardChecking, MaintainingArcConsistency):
+            plain, plain_metrics = solver_class(problem, capacity_pruning=False).solve(max_nodes=3000)
+            solution, metrics = solver_class(problem).solve(max_nodes=3000)
+            assert not metrics['budget_exhausted']
+            assert plain_metrics['budget_exhausted'] or (plain is None) == (solution is None)
+            assert metrics['nodes_explored'] <= plain_metrics['nodes_explored']
+            pruned += metrics['capacity_failures'] + metrics['capacity_prunes']
+    assert pruned > 0
+
+def test_block_scheduling():
+    """Test multi-period courses as one block variable each"""
+    timeslots = [TimeSlot(day=day, period=p) for day in ("Monday", "Tuesday", "Wednesday") for p in range(1, 5)]
+    rooms = [Room(id="R1", capacity=40, type='classroom'), Room(id="R2", capacity=40, type='classroom')]
+    assert len(block_patterns(timeslots, 1, 2)) == 9   # double periods: 3 starts a day
+    assert len(block_patterns(timeslots, 3, 1)) == 4   # one period on all three days
+    assert len(block_patterns(timeslots, 2, 2)) == 9   # doubles on 2 of 3 days
+    
+    # Three-session courses plus double periods; the solution passes the block checks
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor=f"Dr. {i % 3}", duration=3) for i in range(5)]
+    courses += [Course(id=f"D{i}", name=f"Double {i}", instructor=f"Dr. {i}", duration=2) for i in range(2)]
+    problem = TimetableProblem(courses, timeslots, rooms, {})
+    solver = BlockForwardChecking(problem, session_lengths={"D0": None, "D1": None})
+    solution, metrics = solver.solve()
+    assert metrics['success'] and len(solution) == len(courses) and metrics['block_patterns'] == 4 + 9
+    assignment = {}
+    for course, sessions in solution.items():
+        assert ConstraintChecker.check_block_constraints(problem, assignment, course, sessions)
+        assert len(sessions) == course.duration and len({room for _, room in sessions}) == 1
+        if course.id.startswith("D"):
+            (first, _), (second, _) = sessions
+            assert first.day == second.day and second.period == first.period + 1
+        else:
+            assert len({ts.day for ts, _ in sessions}) == 3 and len({ts.period for ts, _ in sessions}) == 1
+        assignment[course] = sessions
+    clash = assignment.pop(courses[0])
+    assert not ConstraintChecker.check_block_constraints(problem, assignment, courses[0], clash + clash[:1])
+    assert not ConstraintChecker.check_block_constraints(problem, assignment, courses[0],
+                                                         next(iter(assignment.values())))
+    
+    # Five 3-session courses, one instructor, four periods: refuted before search
+    busy = [Course(id=f"B{i}", name=f"Busy {i}", instructor="Dr. Busy", duration=3) for i in range(5)]
+    problem = TimetableProblem(busy, timeslots, rooms, {})
+    solution, metrics = BlockForwardChecking(problem).solve()
+    assert solution is None and metrics['nodes_explored'] == 0 and "Dr. Busy" in metrics['capacity_conflict']
+    solution, metrics = BlockForwardChecking(problem, capacity_pruning=False).solve()
+    assert solution is None and metrics['nodes_explored'] > 0 and not metrics['budget_exhausted']
+    try:
+        CompiledBlocks(problem, session_length=2)
+        assert False, "3 hours cannot be split into 2-period sessions"
+    except ValueError:
+        pass
+    
+    # One-period courses: the same timetable as plain forward checking
+    problem = TimetableGenerator.generate_scaled_problem(30, tightness=0.9, num_instructors=5,
+                                                         preference_density=0.2, seed=2)
+    single = TimetableProblem([Course(c.id, c.name, c.instructor, 1) for c in problem.courses], problem.timeslots,
+                              problem.rooms, problem.instructor_constraints, problem.preferred_times)
+    expected, _ = BacktrackingWithForwardChecking(single).solve()
+    solution, _ = BlockForwardChecking(single).solve()
+    assert solution == {course: [placement] for course, placement in expected.items()}
+
+def test_branch_and_bound():
+    """Test soft constraints and branch and bound against exhaustive enumeration"""
+    # Hard preferences make the 2-room sample infeasible; soft ones only cost
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    soft = TimetableProblem(problem.courses, problem.timeslots, problem.rooms, problem.instructor_constraints,
+                            problem.preferred_times, soft_constraints=SoftConstraints(day_spread=0.5))
+    assert soft.fingerprint() != problem.fingerprint()
+    assert BacktrackingWithForwardChecking(problem, capacity_pruning=False).solve()[0] is None
+    solution, metrics = BranchAndBoundSolver(soft).solve()
+    assert metrics['success'] and metrics['optimal'] and len(solution) == len(problem.variables)
+    assert metrics['cost'] == sum(metrics['penalties'].values()) == 1.0
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        save_binary(soft, directory)
+        opened = load_binary(directory)
+        assert opened.soft_constraints == soft.soft_constraints and opened.fingerprint() == soft.fingerprint()
+    
+    # Optimal cost matches enumerating every timetable
+    timeslots = [TimeSlot(day=day, period=p) for day in ("Monday", "Tuesday", "Wednesday") for p in (1, 2)]
+    rooms = [Room(id="S", capacity=20, type='classroom'), Room(id="M", capacity=40, type='classroom'),
+             Room(id="L", capacity=60, type='classroom')]
+    courses = [Course(id=f"C{i}", name=f"Course {i}", instructor=f"Dr. {i % 2}", duration=3) for i in range(5)]
+    prefs = {"C0": [("Monday", 1)], "C1": [("Monday", 1), ("Tuesday", 2)], "C3": [("Wednesday", 2)]}
+    weights = SoftConstraints(preference=2.0, day_spread=1.0, capacity_fit=0.05,
+                              enrollment={"C0": 15, "C2": 55, "C4": 30})
+    problem = TimetableProblem(courses, timeslots, rooms, {"Dr. 1": ["Monday"]}, prefs, soft_constraints=weights)
+    best = float('inf')
+    placements = [(ts, room) for ts in timeslots for room in rooms]
+    def enumerate_costs(assignment, remaining):
+        nonlocal best
+        if not remaining:
+            best = min(best, sum(ConstraintChecker.soft_penalties(problem, assignment).values()))
+            return
+        course = remaining[0]
+        for ts, room in placements:
+            if ConstraintChecker.check_all_constraints(problem, assignment, course, ts, room):
+                assignment[course] = (ts, room)
+                enumerate_costs(assignment, remaining[1:])
+                del assignment[course]
+    enumerate_costs({}, courses)
+    costs = []
+    solution, metrics = BranchAndBoundSolver(problem, seed=1).solve(on_solution=lambda s, cost: costs.append(cost))
+    assert metrics['optimal'] and abs(metrics['cost'] - best) < 1e-9
+    assert abs(sum(ConstraintChecker.soft_penalties(problem, solution).values()) - best) < 1e-9
+    assert costs == sorted(costs, reverse=True) and len(costs) == metrics['solutions_found']
+    
+    # Out of budget: the best timetable so far, not proved optimal
+    problem = TimetableGenerator.generate_scaled_problem(40, tightness=0.8, num_instructors=8,
+                                                         preference_density=0.5, seed=1)
+    problem = TimetableProblem(problem.courses, problem.timeslots, problem.rooms, problem.instructor_constraints,
+                               problem.preferred_times, soft_constraints=SoftConstraints(day_spread=0.5))
+    solution, metrics = BranchAndBoundSolver(problem, restarts='luby').solve(max_nodes=2000)
+    assert metrics['success'] and metrics['budget_exhausted'] and not metrics['optimal']
+    assert abs(sum(metrics['penalties'].values()) - metrics['cost']) < 1e-9
+
+def test_interned_model_objects():
+    """Test slotted, frozen model classes, interning and shared domain tuples"""
+    import dataclasses
+    import pickle
+    timeslot = TimeSlot(day="Monday", period=1)
+    assert TimeSlot("Monday", 1) is timeslot and TimeSlot("Monday", 2) != timeslot
+    assert timeslot != ("Monday", 1) and Room("R1", 40, 'lab') is Room(id="R1", capacity=40, type='lab')
+    course = Course(id="C1", name="Course 1", instructor="Dr. 1", duration=3)
+    for obj in (course, timeslot, Room("R1", 40, 'lab')):
+        assert not hasattr(obj, '__dict__')
+        try:
+            setattr(obj, dataclasses.fields(obj)[0].name, None)
+            assert False, "model objects are frozen"
+        except AttributeError:
+            pass
+    assert pickle.loads(pickle.dumps(timeslot)) is timeslot and pickle.loads(pickle.dumps(course)) == course
+    
+    # Domains, subproblems and decoded solutions reference the problem's placement tuples
+    problem = TimetableGenerator.generate_scaled_problem(40, seed=1)
+    placements = {id(placement) for placement in problem.placements}
+    assert len(problem.placements) == len(problem.timeslots) * len(problem.rooms)
+    assert all(id(placement) in placements for domain in problem.domains.values() for placement in domain)
+    sub = problem.subproblem(problem.courses[:5])
+    assert sub.get_domain(problem.courses[0]) is problem.get_domain(problem.courses[0])
+    solution, _ = BacktrackingWithForwardChecking(problem).solve()
+    assert all(id(placement) in placements for placement in solution.values())
+    copied = pickle.loads(pickle.dumps(problem))
+    assert copied.timeslots == problem.timeslots and copied.rooms[0] is problem.rooms[0]
+
+def test_portfolio_first_solution_wins():
+    """Test that the portfolio returns a winner and every worker's metrics"""
+    problem = TimetableGenerator.generate_sample_problem(num_courses=6, num_rooms=3)
+    configs = [SolverConfig('mac', 'mac'),
+               SolverConfig('fc_seed3', 'forward_checking', {'seed': 3})]
+    solution, metrics = PortfolioSolver(problem, configs, max_workers=2).solve()
+    
+    assert solution is not None and len(solution) == len(problem.variables)
+    assert metrics['winner'] in ('mac', 'fc_seed3')
+    assert set(metrics['workers']) == {'mac', 'fc_seed3'}
+    assert metrics['workers'][metrics['winner']]['success'] == True
+    
+    # Infeasible: every configuration runs to completion
+    problem = TimetableGenerator.generate_sample_problem(num_courses=8, num_rooms=2)
+    solution, metrics = PortfolioSolver(problem, configs, max_workers=2).solve()
+    assert solution is None and metrics['winner'] is None
+    assert not any(m['cancelled'] for m in metrics['workers'].values())
+
 if __name__ == "__main__":
     print("Running tests...")
     test_small_problem_heuristics()
@@ -84,4 +883,82 @@ if __name__ == "__main__":
     test_metrics_collected()
     print("✓ Metrics collection test passed")
     
+    test_occupancy_index_matches_scan()
+    print("✓ Occupancy index test passed")
+    
+    test_compiled_problem_encoding()
+    print("✓ Compiled problem test passed")
+    
+    test_vectorized_domain_mask()
+    print("✓ Vectorized domain mask test passed")
+    
+    test_bitset_domains_undo()
+    print("✓ Bitset domain undo test passed")
+    
+    test_mrv_queue_ordering()
+    print("✓ MRV queue test passed")
+    
+    test_lcv_modes()
+    print("✓ LCV modes test passed")
+    
+    test_mac_solver()
+    print("✓ MAC solver test passed")
+    
+    test_symmetry_breaking()
+    print("✓ Symmetry breaking test passed")
+    
+    test_search_deeper_than_recursion_limit()
+    print("✓ Deep search test passed")
+    
+    test_seeded_value_order()
+    print("✓ Seeded value order test passed")
+    
+    test_restarts_and_budget()
+    print("✓ Restarts and budget test passed")
+    
+    test_backjumping_and_nogoods()
+    print("✓ Backjumping and nogoods test passed")
+    
+    test_scaled_generator()
+    print("✓ Scaled generator test passed")
+    
+    test_local_search()
+    print("✓ Local search test passed")
+    
+    test_incremental_resolve()
+    print("✓ Incremental re-solve test passed")
+    
+    test_apply_changes_keeps_given_domains()
+    print("✓ Given domains across changes test passed")
+    
+    test_decomposition()
+    print("✓ Decomposition test passed")
+    
+    test_instrumentation()
+    print("✓ Instrumentation test passed")
+    
+    test_solution_cache()
+    print("✓ Solution cache test passed")
+    
+    test_problem_io()
+    print("✓ Problem I/O test passed")
+    
+    test_slot_matching()
+    print("✓ Slot matching test passed")
+    
+    test_capacity_pruning()
+    print("✓ Capacity pruning test passed")
+    
+    test_block_scheduling()
+    print("✓ Block scheduling test passed")
+    
+    test_branch_and_bound()
+    print("✓ Branch and bound test passed")
+    
+    test_interned_model_objects()
+    print("✓ Interned model objects test passed")
+    
+    test_portfolio_first_solution_wins()
+    print("✓ Portfolio test passed")
+    
     print("\nAll tests passed!")
\ No newline at end of file